@@ -6,6 +6,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
 
+from apps.accounts.claims import revoke_claims_for_users_on_commit
 from apps.accounts.models import Profile, LoginAttempt, Organization, AddressPermission, LookupRecord, OrganizationMembership
 
 
@@ -137,15 +138,22 @@ class OrganizationMembershipAdmin(admin.ModelAdmin):
         }),
     )
     
+    def _set_active(self, queryset, is_active):
+        # update() sends no post_save, so revoke the members' token claims here
+        user_ids = set(queryset.values_list('user_id', flat=True))
+        updated = queryset.update(is_active=is_active)
+        revoke_claims_for_users_on_commit(user_ids)
+        return updated
+    
     def activate_memberships(self, request, queryset):
         """Activate selected memberships."""
-        updated = queryset.update(is_active=True)
+        updated = self._set_active(queryset, True)
         self.message_user(request, f'{updated} memberships activated successfully.')
     activate_memberships.short_description = "Activate selected memberships"
     
     def deactivate_memberships(self, request, queryset):
         """Deactivate selected memberships."""
-        updated = queryset.update(is_active=False)
+        updated = self._set_active(queryset, False)
         self.message_user(request, f'{updated} memberships deactivated successfully.')
     deactivate_memberships.short_description = "Deactivate selected memberships"
 
@@ -0,0 +1,228 @@
+"""
+Buffered audit writes for address lookups.
+
+Lookup records are appended to a Redis stream instead of being inserted
+inside the request. The ``flush_lookup_records`` Celery task reads them
+through a consumer group, writes them with ``bulk_create`` and only then
+acknowledges them, so records read by a worker that crashes stay pending
+and are reclaimed by the next flush. Every record carries its primary key
+from the moment it is buffered, which makes redelivery idempotent.
+
+When Redis is unavailable (or buffering is disabled) records are written
+synchronously, exactly as before.
+"""
+
+import json
+import logging
+import os
+import socket
+import uuid
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from redis.exceptions import RedisError, ResponseError
+
+from apps.accounts.models import LookupRecord
+
+logger = logging.getLogger(__name__)
+
+AUDIT_STREAM = 'audit:lookup_records'
+AUDIT_GROUP = 'lookup-record-writers'
+
+# Records read from the stream per flush batch
+FLUSH_BATCH_SIZE = 500
+
+# Pending records idle for longer than this (ms) are assumed to belong to a
+# crashed worker and are claimed by the next flush
+RECLAIM_IDLE_MS = 60 * 1000
+
+# Longest user agent string stored with a lookup
+USER_AGENT_MAX_LENGTH = 512
+
+
+def _get_redis():
+    """Return the raw Redis client behind the default cache, or None."""
+    if not getattr(settings, 'LOOKUP_AUDIT_BUFFERED', True):
+        return None
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+    except Exception:
+        return None
+
+
+def _consumer_name() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def build_lookup_entry(organization_id, user_id, address_id, lookup_successful: bool,
+                       ip_address: Optional[str] = None, user_agent: str = '',
+                       notes: str = '') -> Dict[str, Any]:
+    """Build a serializable lookup record entry, timestamped now."""
+    return {
+        'id': str(uuid.uuid4()),
+        'organization_id': str(organization_id),
+        'user_id': user_id,
+        'address_id': str(address_id),
+        'lookup_successful': bool(lookup_successful),
+        'ip_address': ip_address,
+        'user_agent': (user_agent or '')[:USER_AGENT_MAX_LENGTH],
+        'notes': notes,
+        'created_at': timezone.now().isoformat(),
+    }
+
+
+def _to_record(entry: Dict[str, Any]) -> LookupRecord:
+    return LookupRecord(
+        id=uuid.UUID(entry['id']),
+        organization_id=entry['organization_id'],
+        user_id=entry['user_id'],
+        address_id=entry['address_id'],
+        lookup_successful=entry['lookup_successful'],
+        ip_address=entry['ip_address'],
+        user_agent=entry['user_agent'],
+        notes=entry['notes'],
+        created_at=parse_datetime(entry['created_at']),
+    )
+
+
+def write_lookup_records(entries: Iterable[Dict[str, Any]]) -> int:
+    """
+    Insert lookup entries into the database.
+
+    Entries that were already written (redelivered after a crash) are skipped.
+    If the batch violates a constraint (e.g. the address was hard-deleted
+    meanwhile), entries are retried one by one and the failing ones dropped.
+
+    Returns:
+        Number of entries processed
+    """
+    records = [_to_record(entry) for entry in entries]
+    if not records:
+        return 0
+
+    try:
+        with transaction.atomic():
+            LookupRecord.objects.bulk_create(records, ignore_conflicts=True)
+    except IntegrityError:
+        for record in records:
+            try:
+                with transaction.atomic():
+                    LookupRecord.objects.bulk_create([record], ignore_conflicts=True)
+            except IntegrityError as e:
+                logger.error('Dropping lookup record %s: %s', record.id, e)
+    return len(records)
+
+
+def record_lookups(entries: List[Dict[str, Any]]) -> None:
+    """
+    Buffer lookup entries for a later bulk insert.
+
+    Falls back to a synchronous insert if the buffer is unavailable.
+    """
+    if not entries:
+        return
+
+    client = _get_redis()
+    if client is not None:
+        try:
+            pipe = client.pipeline(transaction=False)
+            for entry in entries:
+                pipe.xadd(AUDIT_STREAM, {'record': json.dumps(entry)})
+            pipe.execute()
+            return
+        except RedisError as e:
+            logger.warning('Lookup audit buffer unavailable, writing synchronously: %s', e)
+
+    write_lookup_records(entries)
+
+
+def record_lookup(organization_id, user_id, address_id, lookup_successful: bool,
+                  ip_address: Optional[str] = None, user_agent: str = '',
+                  notes: str = '') -> None:
+    """Buffer a single lookup record. See ``record_lookups``."""
+    record_lookups([build_lookup_entry(
+        organization_id, user_id, address_id, lookup_successful,
+        ip_address=ip_address, user_agent=user_agent, notes=notes
+    )])
+
+
+def _ensure_group(client) -> None:
+    try:
+        client.xgroup_create(AUDIT_STREAM, AUDIT_GROUP, id='0', mkstream=True)
+    except ResponseError as e:
+        if 'BUSYGROUP' not in str(e):
+            raise
+
+
+def _write_and_ack(client, messages) -> int:
+    """
+    Write a batch of stream messages to the database, then acknowledge them.
+
+    Malformed messages are logged and acknowledged with the rest, so they
+    cannot hold the batch pending forever.
+    """
+    if not messages:
+        return 0
+
+    message_ids = [message_id for message_id, _ in messages]
+    entries = []
+    for message_id, fields in messages:
+        try:
+            entry = json.loads(fields[b'record'])
+            _to_record(entry)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.error('Dropping malformed lookup record message %s: %s', message_id, e)
+            continue
+        entries.append(entry)
+    written = write_lookup_records(entries)
+
+    pipe = client.pipeline()
+    pipe.xack(AUDIT_STREAM, AUDIT_GROUP, *message_ids)
+    pipe.xdel(AUDIT_STREAM, *message_ids)
+    pipe.execute()
+    return written
+
+
+def flush_lookup_records(batch_size: int = FLUSH_BATCH_SIZE, max_batches: int = 20) -> int:
+    """
+    Drain buffered lookup records into the database.
+
+    Records left pending by crashed workers are reclaimed first.
+
+    Returns:
+        Number of records written
+    """
+    client = _get_redis()
+    if client is None:
+        return 0
+
+    consumer = _consumer_name()
+    _ensure_group(client)
+    written = 0
+
+    # Reclaim records read by workers that died before acknowledging them
+    start_id = '0-0'
+    while True:
+        result = client.xautoclaim(
+            AUDIT_STREAM, AUDIT_GROUP, consumer,
+            min_idle_time=RECLAIM_IDLE_MS, start_id=start_id, count=batch_size
+        )
+        start_id, claimed = result[0], result[1]
+        written += _write_and_ack(client, claimed)
+        if not claimed or start_id in (b'0-0', '0-0'):
+            break
+
+    for _ in range(max_batches):
+        response = client.xreadgroup(AUDIT_GROUP, consumer, {AUDIT_STREAM: '>'}, count=batch_size)
+        if not response:
+            break
+        messages = response[0][1]
+        written += _write_and_ack(client, messages)
+        if len(messages) < batch_size:
+            break
+
+    return written
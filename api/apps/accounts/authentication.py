@@ -0,0 +1,104 @@
+"""
+Authentication classes for the accounts app.
+"""
+
+from django.contrib.auth.models import User
+from django.db.models import OuterRef, Subquery
+from django.utils.translation import gettext_lazy as _
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from apps.accounts.claims import claims_are_current, user_from_claims
+from apps.accounts.models import OrganizationMembership, Profile
+
+
+def user_context_queryset():
+    """
+    Users with their profile, organization and active organization role,
+    loaded in a single query.
+    """
+    active_role = OrganizationMembership.objects.filter(
+        user=OuterRef('pk'),
+        organization=OuterRef('profile__organization'),
+        is_active=True
+    ).values('role')[:1]
+
+    return User.objects.select_related('profile', 'profile__organization').annotate(
+        active_organization_role=Subquery(active_role)
+    )
+
+
+def attach_organization_role(user):
+    """Cache the annotated organization role on the user's profile."""
+    try:
+        profile = user.profile
+    except Profile.DoesNotExist:
+        return user
+    profile._organization_role = user.active_organization_role
+    return user
+
+
+class ProfileJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that loads the user together with their profile,
+    organization and organization role, so later role checks during the
+    request do not query the database.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            user = user_context_queryset().get(**{api_settings.USER_ID_FIELD: user_id})
+        except User.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return attach_organization_role(user)
+
+
+class ClaimsJWTAuthentication(ProfileJWTAuthentication):
+    """
+    JWT authentication with a database-free path for read requests.
+
+    Safe-method requests whose token claims are at the user's current claims
+    version get a user built from the claims alone. Other requests, and
+    tokens with stale or missing claims, load the user from the database.
+    Only enable it on views that use nothing but the user's identity,
+    profile type, organization and role.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        if request.method in SAFE_METHODS and claims_are_current(validated_token):
+            return user_from_claims(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+
+# Authentication for read endpoints that can trust token claims
+CLAIMS_AUTHENTICATION_CLASSES = [ClaimsJWTAuthentication, SessionAuthentication]
@@ -0,0 +1,192 @@
+"""
+Authorization claims carried in JWTs.
+
+Access tokens carry the user's type, organization and organization role,
+stamped with the user's current claims version. The version is a random
+token kept in Redis and replaced whenever the user, their profile, their
+membership or their organization changes, so claims issued before the change no longer match and
+are not trusted. When Redis is unavailable no token matches and every
+request takes the database path.
+"""
+
+import logging
+import uuid
+from typing import Iterable, Optional, Set
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from redis.exceptions import RedisError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.models import Organization, OrganizationMembership, Profile
+
+logger = logging.getLogger(__name__)
+
+CLAIMS_VERSION_CLAIM = 'claims_version'
+
+
+def _version_key(user_id) -> str:
+    return f"auth:claims_version:{user_id}"
+
+
+def _version_timeout() -> int:
+    # Outlive every token that could carry the version
+    return int(settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME'].total_seconds()) + 60
+
+
+def _get_redis():
+    """Return the raw Redis client behind the default cache, or None."""
+    if not getattr(settings, 'JWT_CLAIMS_FAST_PATH', True):
+        return None
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+    except Exception:
+        return None
+
+
+def get_claims_version(user_id, create: bool = True) -> Optional[str]:
+    """
+    Return the user's current claims version.
+
+    Args:
+        user_id: User whose version is returned
+        create: Create a version if the user has none yet
+    """
+    client = _get_redis()
+    if client is None:
+        return None
+
+    key = _version_key(user_id)
+    try:
+        version = client.get(key)
+        if version is None and create:
+            client.set(key, uuid.uuid4().hex, ex=_version_timeout(), nx=True)
+            version = client.get(key)
+    except RedisError as e:
+        logger.warning('Claims version store unavailable: %s', e)
+        return None
+
+    if version is None:
+        return None
+    return version.decode() if isinstance(version, bytes) else version
+
+
+def revoke_claims(user_id) -> None:
+    """Invalidate the claims of every token issued to a user so far."""
+    revoke_claims_for_users([user_id])
+
+
+def revoke_claims_for_users(user_ids: Iterable) -> None:
+    """Invalidate the token claims of several users in one round trip."""
+    user_ids = list(user_ids)
+    client = _get_redis()
+    if client is None or not user_ids:
+        return
+
+    try:
+        pipe = client.pipeline(transaction=False)
+        for user_id in user_ids:
+            pipe.set(_version_key(user_id), uuid.uuid4().hex, ex=_version_timeout())
+        pipe.execute()
+    except RedisError as e:
+        logger.error('Failed to revoke token claims for users %s: %s', user_ids, e)
+
+
+def revoke_claims_on_commit(user_id) -> None:
+    """Invalidate a user's token claims once the current transaction commits."""
+    transaction.on_commit(lambda: revoke_claims(user_id))
+
+
+def revoke_claims_for_users_on_commit(user_ids: Iterable) -> None:
+    """Invalidate several users' token claims once the current transaction commits."""
+    user_ids = list(user_ids)
+    transaction.on_commit(lambda: revoke_claims_for_users(user_ids))
+
+
+def organization_member_ids(organization_id) -> Set:
+    """Return the users whose claims name an organization: its profiles and members."""
+    user_ids = set(Profile.objects.filter(organization_id=organization_id).values_list('user_id', flat=True))
+    user_ids.update(
+        OrganizationMembership.objects.filter(organization_id=organization_id).values_list('user_id', flat=True)
+    )
+    return user_ids
+
+
+def add_user_claims(token, user) -> None:
+    """Set the profile, organization and role claims of a user on a token."""
+    profile = getattr(user, 'profile', None)
+    if profile is None:
+        return
+
+    token['user_type'] = profile.user_type
+    if profile.organization_id:
+        token['organization_id'] = str(profile.organization_id)
+        token['organization_name'] = profile.organization.name
+        token['organization_role'] = profile.organization_role
+    else:
+        for claim in ('organization_id', 'organization_name', 'organization_role'):
+            if claim in token:
+                del token[claim]
+
+    version = get_claims_version(user.pk)
+    if version is not None:
+        token[CLAIMS_VERSION_CLAIM] = version
+    elif CLAIMS_VERSION_CLAIM in token:
+        del token[CLAIMS_VERSION_CLAIM]
+
+
+def claims_are_current(token) -> bool:
+    """Check whether a token's claims were issued at the user's current version."""
+    version = token.get(CLAIMS_VERSION_CLAIM)
+    if not version or api_settings.USER_ID_CLAIM not in token:
+        return False
+    return version == get_claims_version(token[api_settings.USER_ID_CLAIM], create=False)
+
+
+def user_from_claims(token) -> User:
+    """
+    Build the user, profile and organization from a token's claims without
+    touching the database. The instances are read-only views of the claims
+    and must never be saved.
+    """
+    user = User(
+        id=token[api_settings.USER_ID_CLAIM],
+        username=token.get('username', ''),
+        email=token.get('email', ''),
+        first_name=token.get('first_name', ''),
+        last_name=token.get('last_name', ''),
+        is_staff=token.get('is_staff', False),
+        is_active=True,
+    )
+    user._state.adding = False
+
+    organization = None
+    if token.get('organization_id'):
+        organization = Organization(id=token['organization_id'], name=token.get('organization_name', ''))
+        organization._state.adding = False
+
+    profile = Profile(user=user, user_type=token.get('user_type', 'individual'), organization=organization)
+    profile._state.adding = False
+    profile._organization_role = token.get('organization_role')
+    user.profile = profile
+    return user
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """
+    Refresh token that reloads the authorization claims from the database
+    when they are stale, before issuing an access token.
+    """
+
+    @property
+    def access_token(self):
+        if not claims_are_current(self):
+            from apps.accounts.authentication import attach_organization_role, user_context_queryset
+
+            user = user_context_queryset().filter(pk=self[api_settings.USER_ID_CLAIM]).first()
+            if user is not None:
+                add_user_claims(self, attach_organization_role(user))
+        return super().access_token
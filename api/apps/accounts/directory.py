@@ -0,0 +1,145 @@
+"""
+Cached, versioned directory of active organizations.
+
+Directory pages and search results are cached under a version token that
+is replaced whenever an organization is saved or deleted, so a change is
+visible on the next request and stale pages simply expire. Browsing is
+keyset-paginated by name; search ranks name-prefix matches first, then
+fuzzy (trigram) matches on PostgreSQL, and is keyset-paginated by that rank.
+"""
+
+import hashlib
+import json
+import re
+import uuid
+from typing import Any, Dict
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import BooleanField, Case, FloatField, Q, Value, When
+from django.db.models.functions import Cast
+
+from apps.accounts.models import Organization
+from apps.core.pagination import KeysetPagination, parse_cursor_bool, parse_cursor_uuid
+
+VERSION_KEY = 'org_directory:version'
+
+# How long a cached directory page is kept (seconds)
+DIRECTORY_CACHE_TIMEOUT = 60 * 10
+
+# Longest search string considered
+MAX_QUERY_LENGTH = 100
+
+DIRECTORY_FIELDS = ('id', 'name', 'description')
+
+
+class OrganizationDirectoryPagination(KeysetPagination):
+    """
+    Keyset pagination over ``(name, id)``, ascending.
+    Backed by the ``org_active_name_idx`` index.
+    """
+    ordering = ('name', 'id')
+    cursor_parsers = (str, parse_cursor_uuid)
+
+
+class OrganizationSearchPagination(KeysetPagination):
+    """
+    Keyset pagination over the ranking of ``search_queryset``: prefix
+    matches first, then by trigram similarity (PostgreSQL only), name and id.
+    """
+    ordering = ('-is_prefix', '-similarity', 'name', 'id')
+    cursor_parsers = (parse_cursor_bool, float, str, parse_cursor_uuid)
+
+    def __init__(self):
+        if connection.vendor != 'postgresql':
+            self.ordering = ('-is_prefix', 'name', 'id')
+            self.cursor_parsers = (parse_cursor_bool, str, parse_cursor_uuid)
+
+
+def _current_version() -> str:
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate_directory() -> None:
+    """Discard every cached directory page."""
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def invalidate_directory_on_commit() -> None:
+    """Discard the cached directory once the current transaction commits."""
+    transaction.on_commit(invalidate_directory)
+
+
+def _serialize(organization) -> Dict[str, Any]:
+    return {
+        'id': str(organization.id),
+        'name': organization.name,
+        'description': organization.description,
+    }
+
+
+def search_queryset(query: str):
+    """
+    Active organizations matching ``query``, best first: names starting with
+    it, then similar names (PostgreSQL) or names containing it (other
+    databases). Ordered as ``OrganizationSearchPagination`` pages it.
+    """
+    if connection.vendor == 'postgresql':
+        # A case-insensitive regex on the bare column, unlike istartswith's
+        # UPPER(name) LIKE ..., can be answered from the trigram index
+        prefix = Q(name__iregex=f'^{re.escape(query)}')
+    else:
+        prefix = Q(name__istartswith=query)
+    organizations = Organization.objects.filter(is_active=True).annotate(
+        is_prefix=Case(When(prefix, then=Value(True)), default=Value(False), output_field=BooleanField())
+    ).only(*DIRECTORY_FIELDS)
+
+    if connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        # similarity() returns a real; as a double precision it round-trips
+        # through the cursor exactly, so ties compare equal on the next page
+        return organizations.filter(prefix | Q(name__trigram_similar=query)).annotate(
+            similarity=Cast(TrigramSimilarity('name', query), FloatField())
+        ).order_by(*OrganizationSearchPagination.ordering)
+    return organizations.filter(name__icontains=query).order_by('-is_prefix', 'name', 'id')
+
+
+def get_directory_page(request) -> Dict[str, Any]:
+    """
+    Return one page of the organization directory for a request.
+
+    Query parameters:
+        q: search string; results are the best matches first
+        cursor / page_size: keyset pagination, when browsing or searching
+    """
+    query = request.query_params.get('q', '').strip()[:MAX_QUERY_LENGTH]
+    paginator = OrganizationSearchPagination() if query else OrganizationDirectoryPagination()
+    page_size = paginator.get_page_size(request)
+
+    request_key = json.dumps([
+        query.lower(),
+        request.query_params.get(paginator.cursor_query_param, ''),
+        page_size,
+        request.get_host(),
+    ])
+    cache_key = f"org_directory:{_current_version()}:{hashlib.sha256(request_key.encode()).hexdigest()}"
+    page = cache.get(cache_key)
+    if page is not None:
+        return page
+
+    if query:
+        organizations = paginator.paginate_queryset(search_queryset(query), request)
+    else:
+        organizations = paginator.paginate_queryset(
+            Organization.objects.filter(is_active=True).only(*DIRECTORY_FIELDS), request
+        )
+    data = [_serialize(organization) for organization in organizations]
+    page = {'data': data, 'count': len(data), **paginator.to_page_metadata()}
+
+    cache.set(cache_key, page, DIRECTORY_CACHE_TIMEOUT)
+    return page
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.10 on 2026-10-19 01:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0006_simplify_organization_management"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="lookuprecord",
+            index=models.Index(
+                fields=["organization", "-created_at", "-id"],
+                name="lookup_org_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,206 @@
+# Generated by Django 4.2.10 on 2026-10-19 01:23
+
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.db import migrations, models, transaction
+import django.utils.timezone
+
+TABLE = "accounts_lookuprecord"
+STAGING_TABLE = "accounts_lookuprecord_staging"
+
+# Monthly partitions created after the current one; later months are
+# created by the maintain_lookup_record_partitions task
+PARTITIONS_AHEAD = 3
+
+
+def _add_months(month_start, months):
+    month_index = month_start.year * 12 + month_start.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _month_start(month):
+    return datetime(month.year, month.month, 1, tzinfo=dt_timezone.utc)
+
+
+def _table_definitions(cursor, table):
+    """Return the secondary index and foreign key definitions of a table."""
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes "
+        "WHERE schemaname = current_schema() AND tablename = %s "
+        "AND indexname NOT IN ("
+        "  SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype IN ('p', 'u')"
+        ")",
+        [table, table],
+    )
+    # Indexes of a partitioned table are reported as "ON ONLY"
+    indexes = [row[0].replace(" ON ONLY ", " ON ") for row in cursor.fetchall()]
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype = 'f'",
+        [table],
+    )
+    return indexes, cursor.fetchall()
+
+
+def _restore_definitions(cursor, indexes, foreign_keys):
+    for indexdef in indexes:
+        cursor.execute(indexdef)
+    for name, definition in foreign_keys:
+        cursor.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {name} {definition}")
+
+
+def _set_aside_old_table(cursor):
+    """
+    Rename the table to the staging name and free the names of its indexes
+    and constraints, so the new table can be created with them up front.
+    """
+    indexes, foreign_keys = _table_definitions(cursor, TABLE)
+    cursor.execute(
+        "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'f')",
+        [TABLE],
+    )
+    constraints = [row[0] for row in cursor.fetchall()]
+    cursor.execute(
+        "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = %s",
+        [TABLE],
+    )
+    index_names = [row[0] for row in cursor.fetchall()]
+
+    cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {STAGING_TABLE}")
+    # The staging table is only drained by created_at ranges (see _move_rows),
+    # so it needs none of them
+    for name in constraints:
+        cursor.execute(f"ALTER TABLE {STAGING_TABLE} DROP CONSTRAINT IF EXISTS {name}")
+    for name in index_names:
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+    return indexes, foreign_keys
+
+
+def _move_rows(connection):
+    """
+    Move rows from the staging table into the new table one calendar month
+    of created_at at a time (matching the partitions), each month in its own
+    transaction, then drop the staging table.
+
+    Writes go to the new table throughout, and neither table stays locked
+    for the whole copy. Each batch is an index range scan of the staging
+    table, so the copy is linear in its size. An interrupted run leaves the
+    remaining months in the staging table, and running the migration again
+    finishes the move from the oldest of them.
+    """
+    # Nothing else uses the staging table, so building the index locks no one out
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {STAGING_TABLE}_created_at ON {STAGING_TABLE} (created_at)"
+        )
+    while True:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(f"SELECT min(created_at) FROM {STAGING_TABLE}")
+            oldest = cursor.fetchone()[0]
+            if oldest is None:
+                break
+            oldest = oldest.astimezone(dt_timezone.utc)
+            month = date(oldest.year, oldest.month, 1)
+            cursor.execute(
+                f"WITH moved AS ("
+                f"  DELETE FROM {STAGING_TABLE} WHERE created_at >= %s AND created_at < %s"
+                f"  RETURNING *"
+                f") INSERT INTO {TABLE} SELECT * FROM moved",
+                [_month_start(month), _month_start(_add_months(month, 1))],
+            )
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP TABLE {STAGING_TABLE}")
+
+
+def _interrupted(connection):
+    """Whether an earlier run stopped during the row copy."""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s)", [STAGING_TABLE])
+        return cursor.fetchone()[0] is not None
+
+
+def partition_lookup_records(apps, schema_editor):
+    """
+    Rebuild the lookup record table as a table range-partitioned by month on
+    created_at. The primary key becomes (id, created_at) because PostgreSQL
+    requires unique constraints to include the partition key.
+
+    The new table, with its keys and indexes, replaces the old one in one
+    short transaction; existing rows are then moved across in batches (see
+    ``_move_rows``). Lookup history is incomplete until the move finishes.
+    """
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    if _interrupted(connection):
+        _move_rows(connection)
+        return
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f"SELECT min(created_at) FROM {TABLE}")
+        oldest = cursor.fetchone()[0]
+        indexes, foreign_keys = _set_aside_old_table(cursor)
+
+        cursor.execute(
+            f"CREATE TABLE {TABLE} (LIKE {STAGING_TABLE} INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE (created_at)"
+        )
+
+        today = django.utils.timezone.now().date()
+        month = date((oldest or today).year, (oldest or today).month, 1)
+        last = _add_months(date(today.year, today.month, 1), PARTITIONS_AHEAD)
+        while month <= last:
+            end = _add_months(month, 1)
+            cursor.execute(
+                f"CREATE TABLE {TABLE}_p{month.year:04d}_{month.month:02d} PARTITION OF {TABLE} "
+                f"FOR VALUES FROM (%s) TO (%s)",
+                [_month_start(month), _month_start(end)],
+            )
+            month = end
+        # Catches rows outside the created months instead of rejecting them
+        cursor.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+
+        cursor.execute(f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id, created_at)")
+        _restore_definitions(cursor, indexes, foreign_keys)
+
+    _move_rows(connection)
+
+
+def unpartition_lookup_records(apps, schema_editor):
+    """Rebuild the lookup record table as a regular table keyed on id."""
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    if _interrupted(connection):
+        _move_rows(connection)
+        return
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        indexes, foreign_keys = _set_aside_old_table(cursor)
+        cursor.execute(f"CREATE TABLE {TABLE} (LIKE {STAGING_TABLE} INCLUDING DEFAULTS)")
+        cursor.execute(f"ALTER TABLE {TABLE} ADD PRIMARY KEY (id)")
+        _restore_definitions(cursor, indexes, foreign_keys)
+
+    # Dropping the staging table drops its partitions as well
+    _move_rows(connection)
+
+
+class Migration(migrations.Migration):
+
+    # Each step of the rebuild commits on its own; see partition_lookup_records
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0007_lookuprecord_org_created_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="lookuprecord",
+            name="created_at",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, editable=False
+            ),
+        ),
+        migrations.RunPython(partition_lookup_records, unpartition_lookup_records),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.10 on 2026-10-19 01:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_lookuprecord_partitioning"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="addresspermission",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["organization", "address"],
+                name="perm_org_active_addr_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="organizationmembership",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["organization", "-created_at"],
+                name="membership_org_active_idx",
+            ),
+        ),
+    ]
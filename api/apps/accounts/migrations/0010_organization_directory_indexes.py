@@ -0,0 +1,43 @@
+# Generated by Django 4.2.10 on 2026-10-19 01:31
+
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+TRIGRAM_INDEX = "org_active_name_trgm_idx"
+
+
+def create_trigram_index(apps, schema_editor):
+    """Trigram index on active organization names, for prefix and fuzzy search."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} ON accounts_organization "
+        f"USING gin (name gin_trgm_ops) WHERE is_active"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {TRIGRAM_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0009_hot_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="organization",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["name", "id"],
+                name="org_active_name_idx",
+            ),
+        ),
+        # No-op on databases other than PostgreSQL
+        TrigramExtension(),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -4,7 +4,7 @@ Models for the accounts app.
 
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 from django.utils import timezone
 
@@ -19,6 +19,17 @@ class Organization(UUIDModel, TimeStampedModel):
     description = models.TextField(blank=True)
     is_active = models.BooleanField(default=True)
     
+    class Meta:
+        indexes = [
+            # Backs keyset pagination of the organization directory; name
+            # search uses the trigram index created in migration 0010
+            models.Index(
+                fields=['name', 'id'],
+                condition=models.Q(is_active=True),
+                name='org_active_name_idx'
+            ),
+        ]
+    
     def __str__(self):
         return self.name
 
@@ -52,25 +63,32 @@ class Profile(UUIDModel, TimeStampedModel):
     
     @property
     def organization_role(self):
-        """Get the user's role in their organization."""
-        if not self.is_organization_user or not self.organization:
+        """
+        Get the user's role in their organization.
+        
+        The role is loaded once per instance; the JWT authentication class
+        preloads it together with the user and profile.
+        """
+        if not self.is_organization_user or not self.organization_id:
             return None
         
-        try:
-            membership = OrganizationMembership.objects.get(
-                organization=self.organization,
-                user=self.user,
+        if not hasattr(self, '_organization_role'):
+            self._organization_role = OrganizationMembership.objects.filter(
+                organization_id=self.organization_id,
+                user_id=self.user_id,
                 is_active=True
-            )
-            return membership.role
-        except OrganizationMembership.DoesNotExist:
-            return None
+            ).values_list('role', flat=True).first()
+        return self._organization_role
     
     @property
     def can_manage_organization_users(self):
         """Check if user can manage other users in their organization."""
-        role = self.organization_role
-        return role in ['owner', 'admin', 'manager']
+        return self.organization_role in OrganizationMembership.MANAGER_ROLES
+    
+    @property
+    def is_organization_owner(self):
+        """Check if user is an owner of their organization."""
+        return self.organization_role == 'owner'
     
     @classmethod
     def get_or_create_for_user(cls, user):
@@ -137,6 +155,14 @@ class AddressPermission(UUIDModel, TimeStampedModel):
     
     class Meta:
         unique_together = ['address', 'organization']
+        indexes = [
+            # Permission checks and permitted address listings of an organization
+            models.Index(
+                fields=['organization', 'address'],
+                condition=models.Q(is_active=True),
+                name='perm_org_active_addr_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.organization.name} -> {self.address.address_name}"
@@ -153,6 +179,9 @@ class OrganizationMembership(UUIDModel, TimeStampedModel):
         ('member', 'Member'),
     ]
     
+    # Roles allowed to manage other users of the organization
+    MANAGER_ROLES = ['owner', 'admin', 'manager']
+    
     organization = models.ForeignKey(Organization, on_delete=models.CASCADE, related_name='memberships')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='organization_memberships')
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='member')
@@ -162,6 +191,15 @@ class OrganizationMembership(UUIDModel, TimeStampedModel):
     class Meta:
         unique_together = ['organization', 'user']
         ordering = ['-created_at']
+        indexes = [
+            # Active members of an organization, newest first; single
+            # (organization, user) lookups use the unique constraint
+            models.Index(
+                fields=['organization', '-created_at'],
+                condition=models.Q(is_active=True),
+                name='membership_org_active_idx'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.user.username} - {self.organization.name} ({self.role})"
@@ -169,7 +207,7 @@ class OrganizationMembership(UUIDModel, TimeStampedModel):
     @property
     def can_manage_users(self):
         """Check if user can manage other users in the organization."""
-        return self.role in ['owner', 'admin', 'manager']
+        return self.role in self.MANAGER_ROLES
     
     @property
     def can_manage_organization(self):
@@ -188,10 +226,71 @@ class LookupRecord(UUIDModel, TimeStampedModel):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
     notes = models.TextField(blank=True)
+    # Set explicitly (not auto_now_add) so buffered records keep the time of
+    # the lookup; it is also the partition key on PostgreSQL
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Backs keyset pagination of an organization's lookup history
+            models.Index(
+                fields=['organization', '-created_at', '-id'],
+                name='lookup_org_created_idx'
+            ),
+        ]
     
     def __str__(self):
         status = "SUCCESS" if self.lookup_successful else "FAILED"
-        return f"{self.organization.name} - {self.address.address_name} ({status})" 
\ No newline at end of file
+        return f"{self.organization.name} - {self.address.address_name} ({status})" 
+
+
+@receiver(post_save, sender=AddressPermission)
+@receiver(post_delete, sender=AddressPermission)
+def invalidate_address_permission_cache(sender, instance, **kwargs):
+    """
+    Signal handler to discard the organization's cached address permissions
+    once a grant, revoke or deletion commits.
+    """
+    from apps.accounts.permission_cache import invalidate_organization_permissions_on_commit
+    invalidate_organization_permissions_on_commit(instance.organization_id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+@receiver(post_save, sender=OrganizationMembership)
+@receiver(post_delete, sender=OrganizationMembership)
+def revoke_token_claims(sender, instance, **kwargs):
+    """
+    Signal handler to invalidate the claims in a user's tokens once a change
+    to the user, their profile or their membership commits.
+    """
+    from apps.accounts.claims import revoke_claims_on_commit
+    user_id = instance.pk if sender is User else instance.user_id
+    revoke_claims_on_commit(user_id)
+
+
+@receiver(post_save, sender=Organization)
+@receiver(pre_delete, sender=Organization)
+def revoke_organization_token_claims(sender, instance, created=False, **kwargs):
+    """
+    Signal handler to invalidate the claims in the tokens of an organization's
+    users and members once a change to, or the deletion of, the organization
+    commits. Runs before a deletion, while the members can still be found.
+    """
+    if created:
+        return
+    from apps.accounts.claims import organization_member_ids, revoke_claims_for_users_on_commit
+    revoke_claims_for_users_on_commit(organization_member_ids(instance.pk))
+
+
+@receiver(post_save, sender=Organization)
+@receiver(post_delete, sender=Organization)
+def invalidate_organization_directory(sender, instance, **kwargs):
+    """
+    Signal handler to discard the cached organization directory once an
+    organization change commits.
+    """
+    from apps.accounts.directory import invalidate_directory_on_commit
+    invalidate_directory_on_commit()
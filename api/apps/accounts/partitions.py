@@ -0,0 +1,193 @@
+"""
+Monthly range partitions for the lookup record table (PostgreSQL only).
+
+Migration 0008 turns ``accounts_lookuprecord`` into a table partitioned by
+month on ``created_at``. This module creates partitions ahead of time and
+applies retention by archiving and dropping whole partitions instead of
+deleting rows.
+"""
+
+import gzip
+import logging
+import os
+import re
+import shutil
+import tempfile
+from datetime import date, datetime, timezone as dt_timezone
+from typing import List, NamedTuple, Optional
+
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from apps.accounts.models import LookupRecord
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_DIR = 'archives/lookup_records'
+
+_PARTITION_NAME_RE = re.compile(r'_p(\d{4})_(\d{2})$')
+
+
+class Partition(NamedTuple):
+    name: str
+    start: date
+    end: date
+
+
+def _table() -> str:
+    return LookupRecord._meta.db_table
+
+
+def _add_months(month_start: date, months: int) -> date:
+    month_index = month_start.year * 12 + month_start.month - 1 + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+def _month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+
+def partition_name(month_start: date) -> str:
+    """Return the partition table name for the month starting at ``month_start``."""
+    return f"{_table()}_p{month_start.year:04d}_{month_start.month:02d}"
+
+
+def is_partitioned() -> bool:
+    """Check whether the lookup record table is a partitioned PostgreSQL table."""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = %s",
+            [_table()]
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions() -> List[Partition]:
+    """Return the monthly partitions attached to the lookup record table, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = %s",
+            [_table()]
+        )
+        names = [row[0] for row in cursor.fetchall()]
+
+    partitions = []
+    for name in names:
+        match = _PARTITION_NAME_RE.search(name)
+        if not match:
+            continue  # e.g. the default partition
+        start = date(int(match.group(1)), int(match.group(2)), 1)
+        partitions.append(Partition(name, start, _add_months(start, 1)))
+    return sorted(partitions, key=lambda partition: partition.start)
+
+
+def ensure_partitions(months_ahead: int = 3, today: Optional[date] = None) -> List[str]:
+    """
+    Create the partitions for the current month and ``months_ahead`` months
+    after it, if they do not exist yet.
+
+    Returns:
+        Names of the partitions that were created
+    """
+    quote = connection.ops.quote_name
+    current = _month_start(today or timezone.now().date())
+    existing = {partition.name for partition in list_partitions()}
+    created = []
+
+    for offset in range(months_ahead + 1):
+        start = _add_months(current, offset)
+        name = partition_name(start)
+        if name in existing:
+            continue
+        end = _add_months(start, 1)
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {quote(name)} PARTITION OF {quote(_table())} "
+                    f"FOR VALUES FROM (%s) TO (%s)",
+                    [
+                        datetime(start.year, start.month, 1, tzinfo=dt_timezone.utc),
+                        datetime(end.year, end.month, 1, tzinfo=dt_timezone.utc),
+                    ]
+                )
+        except DatabaseError as e:
+            # Typically rows for this month already landed in the default partition
+            logger.error('Failed to create lookup record partition %s: %s', name, e)
+            continue
+        created.append(name)
+    return created
+
+
+def _copy_to_file(sql: str, file_obj) -> None:
+    """Run a ``COPY ... TO STDOUT`` statement into a binary file object."""
+    with connection.cursor() as cursor:
+        if hasattr(cursor, 'copy_expert'):
+            # psycopg2
+            cursor.copy_expert(sql, file_obj)
+        else:
+            # psycopg 3
+            with cursor.copy(sql) as copy:
+                for block in copy:
+                    file_obj.write(block)
+
+
+def archive_partition(name: str) -> str:
+    """
+    Export a partition to a gzip-compressed CSV file in default storage.
+
+    Returns:
+        Storage path of the archive
+    """
+    quote = connection.ops.quote_name
+    with tempfile.NamedTemporaryFile(suffix='.csv') as raw_file, \
+            tempfile.NamedTemporaryFile(suffix='.csv.gz') as gz_file:
+        _copy_to_file(f"COPY {quote(name)} TO STDOUT WITH (FORMAT csv, HEADER true)", raw_file)
+        raw_file.flush()
+        raw_file.seek(0)
+
+        with gzip.GzipFile(fileobj=gz_file, mode='wb') as compressed:
+            shutil.copyfileobj(raw_file, compressed)
+        gz_file.flush()
+        gz_file.seek(0)
+
+        return default_storage.save(os.path.join(ARCHIVE_DIR, f"{name}.csv.gz"), File(gz_file))
+
+
+def apply_retention(retention_months: int, archive: bool = True, today: Optional[date] = None) -> List[str]:
+    """
+    Detach and drop partitions older than ``retention_months`` full months.
+
+    Each partition is archived first when ``archive`` is set; a partition
+    whose archive fails is left attached.
+
+    Returns:
+        Names of the partitions that were dropped
+    """
+    quote = connection.ops.quote_name
+    cutoff = _add_months(_month_start(today or timezone.now().date()), -retention_months)
+    dropped = []
+
+    for partition in list_partitions():
+        if partition.end > cutoff:
+            continue
+        if archive:
+            try:
+                path = archive_partition(partition.name)
+                logger.info('Archived lookup record partition %s to %s', partition.name, path)
+            except Exception as e:
+                logger.error('Failed to archive lookup record partition %s: %s', partition.name, e)
+                continue
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {quote(_table())} DETACH PARTITION {quote(partition.name)}")
+            cursor.execute(f"DROP TABLE {quote(partition.name)}")
+        dropped.append(partition.name)
+    return dropped
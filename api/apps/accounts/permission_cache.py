@@ -0,0 +1,183 @@
+"""
+Redis-backed cache of the addresses each organization may access.
+
+Each organization has a Redis set of granted address IDs, stored under a
+version token. Granting or revoking a permission replaces the version token
+once the transaction commits, so the next check rebuilds the set from the
+database and any set built from stale data is never consulted again.
+
+Until then the change is pending: it is recorded in the organization's
+pending set as soon as the permission is written, and checks go to the
+database while anything is pending. If the change cannot be recorded the
+write fails, and if the version cannot be replaced after the commit the
+change stays pending until the pending set expires, so a revocation is
+never answered from a stale set. When Redis is unavailable every check falls
+back to the database.
+"""
+
+import logging
+import uuid
+
+from django.db import transaction
+from redis.exceptions import RedisError
+
+from apps.accounts.models import AddressPermission
+
+logger = logging.getLogger(__name__)
+
+# How long a built permission set is kept (seconds)
+PERMISSION_SET_TIMEOUT = 60 * 60
+
+# Address IDs added per SADD when (re)building a set
+PERMISSION_SET_BATCH_SIZE = 1000
+
+# Member stored in every set so that organizations without grants still
+# have a (non-empty) cached set
+LOADED_MARKER = '__loaded__'
+
+
+def _version_key(organization_id) -> str:
+    return f"address_permissions:{organization_id}:version"
+
+
+def _members_key(organization_id, version: str) -> str:
+    return f"address_permissions:{organization_id}:{version}"
+
+
+def _pending_key(organization_id) -> str:
+    return f"address_permissions:{organization_id}:pending"
+
+
+def _get_redis():
+    """Return the raw Redis client behind the default cache, or None."""
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+    except Exception:
+        return None
+
+
+def _current_version(client, organization_id) -> str:
+    """Return the organization's version token, creating one if missing."""
+    key = _version_key(organization_id)
+    version = client.get(key)
+    if version is None:
+        client.set(key, uuid.uuid4().hex, nx=True)
+        version = client.get(key)
+    return version.decode() if isinstance(version, bytes) else version
+
+
+def _has_permission_in_db(organization_id, address_id) -> bool:
+    return AddressPermission.objects.filter(
+        address_id=address_id,
+        organization_id=organization_id,
+        is_active=True
+    ).exists()
+
+
+def _build_permission_set(client, organization_id, members_key: str) -> set:
+    """Load an organization's granted address IDs from the database into Redis."""
+    address_ids = {
+        str(address_id) for address_id in AddressPermission.objects.filter(
+            organization_id=organization_id,
+            is_active=True
+        ).values_list('address_id', flat=True).iterator()
+    }
+
+    members = [LOADED_MARKER, *address_ids]
+    pipe = client.pipeline()
+    for start in range(0, len(members), PERMISSION_SET_BATCH_SIZE):
+        pipe.sadd(members_key, *members[start:start + PERMISSION_SET_BATCH_SIZE])
+    pipe.expire(members_key, PERMISSION_SET_TIMEOUT)
+    pipe.execute()
+    return address_ids
+
+
+def has_address_permission(organization_id, address_id) -> bool:
+    """
+    Check whether an organization has an active permission for an address.
+
+    Answers from the organization's cached set with a single SISMEMBER when
+    possible, and from the database otherwise.
+    """
+    client = _get_redis()
+    if client is None:
+        return _has_permission_in_db(organization_id, address_id)
+
+    try:
+        pipe = client.pipeline()
+        pipe.exists(_pending_key(organization_id))
+        pipe.get(_version_key(organization_id))
+        pending, version = pipe.execute()
+        if pending:
+            return _has_permission_in_db(organization_id, address_id)
+
+        if version is None:
+            version = _current_version(client, organization_id)
+        elif isinstance(version, bytes):
+            version = version.decode()
+        members_key = _members_key(organization_id, version)
+
+        pipe = client.pipeline()
+        pipe.sismember(members_key, str(address_id))
+        pipe.exists(members_key)
+        is_member, exists = pipe.execute()
+        if exists:
+            return bool(is_member)
+
+        return str(address_id) in _build_permission_set(client, organization_id, members_key)
+    except RedisError as e:
+        logger.warning('Address permission cache unavailable: %s', e)
+        return _has_permission_in_db(organization_id, address_id)
+
+
+def invalidate_organization_permissions(organization_id, change: str = None) -> None:
+    """
+    Discard an organization's cached permission set immediately.
+
+    Args:
+        organization_id: Organization whose set is discarded
+        change: Pending change recorded by
+            ``invalidate_organization_permissions_on_commit``, cleared once
+            the new version is in place
+    """
+    client = _get_redis()
+    if client is None:
+        return
+
+    try:
+        pipe = client.pipeline()
+        pipe.set(_version_key(organization_id), uuid.uuid4().hex)
+        if change is not None:
+            pipe.srem(_pending_key(organization_id), change)
+        pipe.execute()
+    except RedisError as e:
+        logger.error('Failed to invalidate address permission cache for %s: %s', organization_id, e)
+
+
+def invalidate_organization_permissions_on_commit(organization_id) -> None:
+    """
+    Invalidate an organization's cached permissions once the current
+    transaction commits.
+
+    Records the change as pending right away, so checks bypass the cache
+    until the new version is in place. Raises ``RedisError`` when the change
+    cannot be recorded, failing the write instead of leaving a stale set in
+    use; a change that is rolled back stays pending until the pending set
+    expires.
+    """
+    client = _get_redis()
+    if client is None:
+        return
+
+    change = uuid.uuid4().hex
+    pending_key = _pending_key(organization_id)
+    try:
+        pipe = client.pipeline()
+        pipe.sadd(pending_key, change)
+        pipe.expire(pending_key, PERMISSION_SET_TIMEOUT)
+        pipe.execute()
+    except RedisError as e:
+        logger.error('Failed to record address permission change for %s: %s', organization_id, e)
+        raise
+    transaction.on_commit(lambda: invalidate_organization_permissions(organization_id, change))
@@ -6,9 +6,10 @@ from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
 from rest_framework.validators import UniqueValidator
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
 from django.contrib.auth import get_user_model
 
+from apps.accounts.claims import ClaimsRefreshToken, add_user_claims
 from apps.accounts.models import Profile, Organization, AddressPermission, OrganizationMembership
 
 User = get_user_model()
@@ -136,16 +137,19 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         token['last_name'] = user.last_name
         token['is_staff'] = user.is_staff
         
-        # Add profile information
-        if hasattr(user, 'profile'):
-            token['user_type'] = user.profile.user_type
-            if user.profile.organization:
-                token['organization_id'] = str(user.profile.organization.id)
-                token['organization_name'] = user.profile.organization.name
+        # Add profile, organization and role claims
+        add_user_claims(token, user)
 
         return token
 
 
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Token refresh serializer that reissues stale authorization claims.
+    """
+    token_class = ClaimsRefreshToken
+
+
 class ChangePasswordSerializer(serializers.Serializer):
     """
     Serializer for password change endpoint.
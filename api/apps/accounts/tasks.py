@@ -44,4 +44,34 @@ def send_password_reset_email(user_id, token, uid):
         
         return True
     except User.DoesNotExist:
-        return False 
\ No newline at end of file
+        return False 
+
+
+@shared_task(ignore_result=True)
+def flush_lookup_records():
+    """
+    Write buffered lookup records to the database in bulk.
+    Scheduled by Celery Beat every few seconds.
+    """
+    from apps.accounts.audit import flush_lookup_records as flush
+    
+    return flush()
+
+
+@shared_task
+def maintain_lookup_record_partitions():
+    """
+    Create upcoming monthly lookup record partitions and archive and drop
+    the ones past the retention period. No-op unless the table is partitioned.
+    """
+    from apps.accounts import partitions
+    
+    if not partitions.is_partitioned():
+        return {'created': [], 'dropped': []}
+    
+    created = partitions.ensure_partitions(months_ahead=settings.LOOKUP_RECORD_PARTITIONS_AHEAD)
+    dropped = partitions.apply_retention(
+        settings.LOOKUP_RECORD_RETENTION_MONTHS,
+        archive=settings.LOOKUP_RECORD_ARCHIVE_PARTITIONS
+    )
+    return {'created': created, 'dropped': dropped}
@@ -3,7 +3,6 @@ URL configuration for the accounts app.
 """
 
 from django.urls import path
-from rest_framework_simplejwt.views import TokenRefreshView
 
 from apps.accounts.views import (
     RegisterView,
@@ -11,6 +10,7 @@ from apps.accounts.views import (
     ResetPasswordEmailView,
     ResetPasswordView,
     CustomTokenObtainPairView,
+    CustomTokenRefreshView,
     UserProfileView,
     ProfileUpdateView,
     OrganizationUsersListView,
@@ -24,7 +24,7 @@ urlpatterns = [
     # Authentication endpoints
     path('register/', RegisterView.as_view(), name='register'),
     path('login/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/refresh/', CustomTokenRefreshView.as_view(), name='token_refresh'),
     path('change-password/', ChangePasswordView.as_view(), name='change_password'),
     path('reset-password-email/', ResetPasswordEmailView.as_view(), name='reset_password_email'),
     path('reset-password/', ResetPasswordView.as_view(), name='reset_password'),
@@ -3,9 +3,10 @@ Views for the accounts app.
 """
 
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from django.utils import timezone
 from datetime import timedelta
 
@@ -19,6 +20,7 @@ from django.template.loader import render_to_string
 from apps.accounts.serializers import (
     UserSerializer, 
     CustomTokenObtainPairSerializer,
+    CustomTokenRefreshSerializer,
     ChangePasswordSerializer,
     ResetPasswordEmailSerializer,
     ResetPasswordSerializer,
@@ -49,6 +51,13 @@ class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
 
+class CustomTokenRefreshView(TokenRefreshView):
+    """
+    Token refresh view that reissues stale authorization claims.
+    """
+    serializer_class = CustomTokenRefreshSerializer
+
+
 class ChangePasswordView(generics.UpdateAPIView):
     """
     API endpoint for changing password.
@@ -65,11 +74,11 @@ class ChangePasswordView(generics.UpdateAPIView):
         
         if serializer.is_valid():
             # Check old password
-            if not user.check_password(serializer.data.get("old_password")):
+            if not user.check_password(serializer.validated_data["old_password"]):
                 return Response({"old_password": ["Wrong password."]}, status=status.HTTP_400_BAD_REQUEST)
             
             # Set new password
-            user.set_password(serializer.data.get("new_password"))
+            user.set_password(serializer.validated_data["new_password"])
             user.save()
             
             return Response({"detail": "Password updated successfully."}, status=status.HTTP_200_OK)
@@ -200,7 +209,7 @@ class OrganizationUsersListView(generics.ListAPIView):
             return OrganizationMembership.objects.filter(
                 organization=user.profile.organization,
                 is_active=True
-            ).select_related('user', 'created_by')
+            ).select_related('user', 'created_by', 'organization')
         return OrganizationMembership.objects.none()
 
 
@@ -226,21 +235,16 @@ class OrganizationUserCreateView(generics.CreateAPIView):
         
         # Check if user has permission to create users
         if not hasattr(user, 'profile') or not user.profile.organization:
-            raise permissions.PermissionDenied("You are not a member of any organization.")
+            raise PermissionDenied("You are not a member of any organization.")
         
-        # Get user's membership
-        try:
-            membership = OrganizationMembership.objects.get(
-                organization=user.profile.organization,
-                user=user,
-                is_active=True
-            )
-        except OrganizationMembership.DoesNotExist:
-            raise permissions.PermissionDenied("You are not a member of this organization.")
+        # Caller's role, loaded with the user at authentication
+        current_role = user.profile.organization_role
+        if current_role is None:
+            raise PermissionDenied("You are not a member of this organization.")
         
         # Check if user can manage users
-        if not membership.can_manage_users:
-            raise permissions.PermissionDenied("You don't have permission to create users.")
+        if current_role not in OrganizationMembership.MANAGER_ROLES:
+            raise PermissionDenied("You don't have permission to create users.")
         
         # Create the user
         serializer.save()
@@ -272,29 +276,24 @@ class OrganizationUserUpdateView(generics.UpdateAPIView):
         
         # Check if current user has permission to manage users
         if not hasattr(current_user, 'profile') or not current_user.profile.organization:
-            raise permissions.PermissionDenied("You are not a member of any organization.")
+            raise PermissionDenied("You are not a member of any organization.")
         
-        # Get current user's membership
-        try:
-            current_membership = OrganizationMembership.objects.get(
-                organization=current_user.profile.organization,
-                user=current_user,
-                is_active=True
-            )
-        except OrganizationMembership.DoesNotExist:
-            raise permissions.PermissionDenied("You are not a member of this organization.")
+        # Caller's role, loaded with the user at authentication
+        current_role = current_user.profile.organization_role
+        if current_role is None:
+            raise PermissionDenied("You are not a member of this organization.")
         
         # Check if current user can manage users
-        if not current_membership.can_manage_users:
-            raise permissions.PermissionDenied("You don't have permission to manage users.")
+        if current_role not in OrganizationMembership.MANAGER_ROLES:
+            raise PermissionDenied("You don't have permission to manage users.")
         
         # Prevent users from updating themselves
         if target_user == current_user:
-            raise permissions.PermissionDenied("You cannot update your own account through this endpoint.")
+            raise PermissionDenied("You cannot update your own account through this endpoint.")
         
         # Check if target user is in the same organization
-        if not hasattr(target_user, 'profile') or target_user.profile.organization != current_user.profile.organization:
-            raise permissions.PermissionDenied("You can only manage users in your organization.")
+        if not hasattr(target_user, 'profile') or target_user.profile.organization_id != current_user.profile.organization_id:
+            raise PermissionDenied("You can only manage users in your organization.")
         
         serializer.save()
 
@@ -313,7 +312,7 @@ class OrganizationUserDeleteView(generics.UpdateAPIView):
             return OrganizationMembership.objects.filter(
                 organization=user.profile.organization,
                 is_active=True
-            )
+            ).select_related('user', 'created_by', 'organization')
         return OrganizationMembership.objects.none()
     
     def perform_update(self, serializer):
@@ -323,29 +322,24 @@ class OrganizationUserDeleteView(generics.UpdateAPIView):
         
         # Check if current user has permission to manage users
         if not hasattr(current_user, 'profile') or not current_user.profile.organization:
-            raise permissions.PermissionDenied("You are not a member of any organization.")
+            raise PermissionDenied("You are not a member of any organization.")
         
-        # Get current user's membership
-        try:
-            current_membership = OrganizationMembership.objects.get(
-                organization=current_user.profile.organization,
-                user=current_user,
-                is_active=True
-            )
-        except OrganizationMembership.DoesNotExist:
-            raise permissions.PermissionDenied("You are not a member of this organization.")
+        # Caller's role, loaded with the user at authentication
+        current_role = current_user.profile.organization_role
+        if current_role is None:
+            raise PermissionDenied("You are not a member of this organization.")
         
         # Check if current user can manage users
-        if not current_membership.can_manage_users:
-            raise permissions.PermissionDenied("You don't have permission to manage users.")
+        if current_role not in OrganizationMembership.MANAGER_ROLES:
+            raise PermissionDenied("You don't have permission to manage users.")
         
         # Prevent users from deactivating themselves
-        if membership.user == current_user:
-            raise permissions.PermissionDenied("You cannot deactivate your own account.")
+        if membership.user_id == current_user.id:
+            raise PermissionDenied("You cannot deactivate your own account.")
         
         # Prevent non-owners from deactivating owners
-        if membership.role == 'owner' and current_membership.role != 'owner':
-            raise permissions.PermissionDenied("Only owners can deactivate other owners.")
+        if membership.role == 'owner' and current_role != 'owner':
+            raise PermissionDenied("Only owners can deactivate other owners.")
         
         serializer.save(is_active=False)
 
@@ -364,7 +358,7 @@ class OrganizationUserRoleUpdateView(generics.UpdateAPIView):
             return OrganizationMembership.objects.filter(
                 organization=user.profile.organization,
                 is_active=True
-            )
+            ).select_related('user', 'created_by', 'organization')
         return OrganizationMembership.objects.none()
     
     def perform_update(self, serializer):
@@ -374,28 +368,23 @@ class OrganizationUserRoleUpdateView(generics.UpdateAPIView):
         
         # Check if current user has permission to manage users
         if not hasattr(current_user, 'profile') or not current_user.profile.organization:
-            raise permissions.PermissionDenied("You are not a member of any organization.")
+            raise PermissionDenied("You are not a member of any organization.")
         
-        # Get current user's membership
-        try:
-            current_membership = OrganizationMembership.objects.get(
-                organization=current_user.profile.organization,
-                user=current_user,
-                is_active=True
-            )
-        except OrganizationMembership.DoesNotExist:
-            raise permissions.PermissionDenied("You are not a member of this organization.")
+        # Caller's role, loaded with the user at authentication
+        current_role = current_user.profile.organization_role
+        if current_role is None:
+            raise PermissionDenied("You are not a member of this organization.")
         
         # Check if current user can manage users
-        if not current_membership.can_manage_users:
-            raise permissions.PermissionDenied("You don't have permission to manage users.")
+        if current_role not in OrganizationMembership.MANAGER_ROLES:
+            raise PermissionDenied("You don't have permission to manage users.")
         
         # Prevent users from changing their own role
-        if membership.user == current_user:
-            raise permissions.PermissionDenied("You cannot change your own role.")
+        if membership.user_id == current_user.id:
+            raise PermissionDenied("You cannot change your own role.")
         
         # Prevent non-owners from changing owner roles
-        if membership.role == 'owner' and current_membership.role != 'owner':
-            raise permissions.PermissionDenied("Only owners can change owner roles.")
+        if membership.role == 'owner' and current_role != 'owner':
+            raise PermissionDenied("Only owners can change owner roles.")
         
         serializer.save() 
\ No newline at end of file
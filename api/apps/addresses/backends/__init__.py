@@ -0,0 +1,27 @@
+"""
+Storage backends for ``blockchain_manager``.
+
+``BLOCKCHAIN_BACKEND`` names the backend class and ``BLOCKCHAIN_BACKEND_OPTIONS``
+its keyword arguments:
+
+- ``apps.addresses.backends.web3.Web3Backend``: the AddressHub contract and
+  an IPFS daemon (default)
+- ``apps.addresses.backends.memory.InMemoryBackend``: process memory with a
+  fixed latency per call, for tests and benchmarks
+- ``apps.addresses.backends.null.NullBackend``: no chain at all
+"""
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from .base import BaseChainBackend
+
+DEFAULT_BACKEND = 'apps.addresses.backends.web3.Web3Backend'
+
+
+def load_backend(path=None, options=None) -> BaseChainBackend:
+    """Create the backend named by ``path``, or by the settings when omitted."""
+    if path is None:
+        path = getattr(settings, 'BLOCKCHAIN_BACKEND', DEFAULT_BACKEND)
+        options = getattr(settings, 'BLOCKCHAIN_BACKEND_OPTIONS', {})
+    return import_string(path)(**(options or {}))
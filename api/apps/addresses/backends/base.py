@@ -0,0 +1,64 @@
+"""
+Interface of the storage backends behind ``blockchain_manager``.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+
+class BaseChainBackend(ABC):
+    """
+    Where address records and their IPFS metadata are stored.
+
+    Reads return None when a record is missing or cannot be fetched; writes
+    raise ``ValidationError`` when they fail. Callers check
+    ``is_connected()`` before using the chain at all.
+    """
+
+    # False for backends that stand in for a disabled chain
+    enabled = True
+
+    # Shown by the status views
+    contract_address: Optional[str] = None
+    rpc_url: Optional[str] = None
+
+    @abstractmethod
+    def is_connected(self) -> bool:
+        """Whether the chain can be reached."""
+
+    @abstractmethod
+    def ipfs_available(self) -> bool:
+        """Whether an IPFS node is configured."""
+
+    @abstractmethod
+    def store_address(self, address_data: Dict[str, Any], user_wallet: str) -> Dict[str, Any]:
+        """
+        Store an address record.
+
+        Returns:
+            Dict with ``success``, ``transaction_hash``, ``block_number`` and ``message``
+        """
+
+    @abstractmethod
+    def get_address(self, address_id: str, user_wallet: str) -> Optional[Dict[str, Any]]:
+        """Return the stored record of an address, or None if there is none."""
+
+    @abstractmethod
+    def delete_address(self, address_id: str, user_wallet: str) -> Dict[str, Any]:
+        """Delete an address record; returns the same shape as ``store_address``."""
+
+    @abstractmethod
+    def store_on_ipfs(self, data: Dict[str, Any]) -> Optional[str]:
+        """Store a JSON document; returns its hash, or None if it could not be stored."""
+
+    @abstractmethod
+    def get_from_ipfs(self, ipfs_hash: str) -> Optional[Dict[str, Any]]:
+        """Return a document stored by ``store_on_ipfs``, or None if it cannot be read."""
+
+    @abstractmethod
+    def block_number(self) -> int:
+        """Latest block number; raises if the chain cannot be reached."""
+
+    @abstractmethod
+    def ipfs_version(self) -> Dict[str, Any]:
+        """Version of the IPFS node; raises if it cannot be reached."""
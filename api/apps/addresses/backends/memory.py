@@ -0,0 +1,147 @@
+"""
+In-memory backend with a fixed latency per call.
+
+Keeps address records and IPFS documents in dictionaries of the current
+process, so it suits tests, benchmarks and local development; records do
+not survive a restart and are not shared with Celery workers. Every call
+sleeps for the configured latency and is counted, which makes timings
+reproducible and lets tools check how many calls a request makes.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from django.core.exceptions import ValidationError
+
+from .base import BaseChainBackend
+
+
+class CallCounter:
+    """Thread-safe call counts by method."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls: Dict[str, int] = {}
+
+    def add(self, method: str) -> None:
+        with self.lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+
+    @property
+    def total(self) -> int:
+        with self.lock:
+            return sum(self.calls.values())
+
+    def reset(self) -> None:
+        with self.lock:
+            self.calls = {}
+
+
+class InMemoryBackend(BaseChainBackend):
+    """
+    Stores addresses and IPFS documents in process memory.
+
+    Args:
+        rpc_latency: Seconds each chain call takes
+        ipfs_latency: Seconds each IPFS call takes
+    """
+
+    contract_address = 'memory'
+    rpc_url = 'memory://'
+
+    def __init__(self, rpc_latency: float = 0.0, ipfs_latency: float = 0.0):
+        self.rpc_latency = rpc_latency
+        self.ipfs_latency = ipfs_latency
+        self.rpc_calls = CallCounter()
+        self.ipfs_calls = CallCounter()
+        self.lock = threading.Lock()
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.documents: Dict[str, str] = {}
+        self.block = 0
+
+    def _rpc(self, method: str) -> None:
+        self.rpc_calls.add(method)
+        if self.rpc_latency:
+            time.sleep(self.rpc_latency)
+
+    def _ipfs(self, method: str) -> None:
+        self.ipfs_calls.add(method)
+        if self.ipfs_latency:
+            time.sleep(self.ipfs_latency)
+
+    def _write(self, transaction: str) -> Dict[str, Any]:
+        # The caller holds the lock; every write is mined in a block of its own
+        self.block += 1
+        return {
+            'success': True,
+            'transaction_hash': '0x' + hashlib.sha256(f"{self.block}:{transaction}".encode()).hexdigest(),
+            'block_number': self.block,
+            'message': f"Address {transaction} in memory",
+        }
+
+    def is_connected(self) -> bool:
+        self._rpc('is_connected')
+        return True
+
+    def ipfs_available(self) -> bool:
+        return True
+
+    def store_address(self, address_data: Dict[str, Any], user_wallet: str) -> Dict[str, Any]:
+        self._rpc('store_address')
+        now = int(time.time())
+        with self.lock:
+            created_at = self.records.get(address_data['id'], {}).get('created_at', now)
+            self.records[address_data['id']] = {
+                'id': address_data['id'],
+                'address_name': str(address_data.get('address_name', '')),
+                # The contract stores the joined address in its address field
+                'address': f"{address_data.get('address', '')}, {address_data.get('street', '')}, {address_data.get('suburb', '')}, {address_data.get('state', '')} {address_data.get('postcode', '')}",
+                'street': str(address_data.get('street', '')),
+                'suburb': str(address_data.get('suburb', '')),
+                'state': str(address_data.get('state', '')),
+                'postcode': str(address_data.get('postcode', '')),
+                'is_default': bool(address_data.get('is_default', False)),
+                'is_active': bool(address_data.get('is_active', True)),
+                'created_at': created_at,
+                'updated_at': now,
+            }
+            return self._write('stored')
+
+    def get_address(self, address_id: str, user_wallet: str) -> Optional[Dict[str, Any]]:
+        self._rpc('get_address')
+        with self.lock:
+            record = self.records.get(address_id)
+            return dict(record) if record else None
+
+    def delete_address(self, address_id: str, user_wallet: str) -> Dict[str, Any]:
+        self._rpc('delete_address')
+        with self.lock:
+            if self.records.pop(address_id, None) is None:
+                raise ValidationError(f"Address {address_id} is not stored")
+            return self._write('deleted')
+
+    def store_on_ipfs(self, data: Dict[str, Any]) -> Optional[str]:
+        self._ipfs('add')
+        document = json.dumps(data, default=str, sort_keys=True)
+        ipfs_hash = 'Qm' + hashlib.sha256(document.encode()).hexdigest()[:44]
+        with self.lock:
+            self.documents[ipfs_hash] = document
+        return ipfs_hash
+
+    def get_from_ipfs(self, ipfs_hash: str) -> Optional[Dict[str, Any]]:
+        self._ipfs('get')
+        with self.lock:
+            document = self.documents.get(ipfs_hash)
+        return json.loads(document) if document is not None else None
+
+    def block_number(self) -> int:
+        self._rpc('block_number')
+        with self.lock:
+            return self.block
+
+    def ipfs_version(self) -> Dict[str, Any]:
+        self._ipfs('version')
+        return {'Version': 'memory'}
@@ -0,0 +1,46 @@
+"""
+Backend for deployments without a chain.
+
+Reports itself disconnected, so the app skips every blockchain and IPFS
+step and keeps addresses in the database only, without opening an RPC or
+IPFS client.
+"""
+
+from typing import Any, Dict, Optional
+
+from django.core.exceptions import ValidationError
+
+from .base import BaseChainBackend
+
+
+class NullBackend(BaseChainBackend):
+    """Stores nothing and reads nothing."""
+
+    enabled = False
+
+    def is_connected(self) -> bool:
+        return False
+
+    def ipfs_available(self) -> bool:
+        return False
+
+    def store_address(self, address_data: Dict[str, Any], user_wallet: str) -> Dict[str, Any]:
+        raise ValidationError("Blockchain storage is disabled")
+
+    def get_address(self, address_id: str, user_wallet: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def delete_address(self, address_id: str, user_wallet: str) -> Dict[str, Any]:
+        raise ValidationError("Blockchain storage is disabled")
+
+    def store_on_ipfs(self, data: Dict[str, Any]) -> Optional[str]:
+        return None
+
+    def get_from_ipfs(self, ipfs_hash: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def block_number(self) -> int:
+        raise ConnectionError("Blockchain storage is disabled")
+
+    def ipfs_version(self) -> Dict[str, Any]:
+        raise ConnectionError("IPFS is disabled")
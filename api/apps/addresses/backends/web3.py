@@ -0,0 +1,272 @@
+"""
+Web3 backend: the AddressHub contract over JSON-RPC and an IPFS daemon.
+"""
+
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+import ipfshttpclient
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from web3 import Web3
+
+from apps.core import metrics, tracing
+
+from .base import BaseChainBackend
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedHTTPProvider(Web3.HTTPProvider):
+    """HTTP provider that records every JSON-RPC call in metrics and traces."""
+
+    def make_request(self, method, params):
+        start = time.perf_counter()
+        ok = False
+        rpc_span = tracing.span(f'rpc {method}', kind=tracing.CLIENT, **{'rpc.method': method})
+        with rpc_span:
+            try:
+                response = super().make_request(method, params)
+                ok = 'error' not in response
+                if not ok:
+                    rpc_span.set_error(str(response['error']))
+                return response
+            finally:
+                metrics.record_rpc(method, time.perf_counter() - start, ok=ok)
+
+
+def load_contract_abi() -> Optional[list]:
+    """Load contract ABI from file."""
+    try:
+        # Try multiple possible locations for the contract ABI
+        possible_paths = [
+            os.path.join(settings.BASE_DIR, 'contracts', 'artifacts', 'contracts', 'AddressHub.sol', 'AddressHub.json'),
+            os.path.join(settings.BASE_DIR, '..', 'contracts', 'artifacts', 'contracts', 'AddressHub.sol', 'AddressHub.json'),
+            os.path.join(settings.BASE_DIR, 'contracts', 'AddressHub.json'),
+            os.path.join(settings.BASE_DIR, '..', 'contracts', 'AddressHub.json'),
+        ]
+
+        for abi_path in possible_paths:
+            if os.path.exists(abi_path):
+                with open(abi_path, 'r') as f:
+                    contract_data = json.load(f)
+                    if 'abi' in contract_data:
+                        return contract_data['abi']
+                    else:
+                        logger.warning("No ABI found in %s", abi_path)
+
+        logger.warning("Contract ABI file not found in any expected location")
+        return None
+
+    except Exception as e:
+        logger.warning("Error loading contract ABI: %s", e)
+        return None
+
+
+class Web3Backend(BaseChainBackend):
+    """
+    Stores addresses in the AddressHub contract and metadata on IPFS.
+
+    Args:
+        rpc_url: JSON-RPC endpoint (default: ``POLYGON_RPC_URL``)
+        ipfs_api_url: IPFS API address (default: ``IPFS_API_URL``)
+        contract_address: Deployed contract (default: ``ADDRESS_HUB_CONTRACT_ADDRESS``)
+        provider: Web3 provider to use instead of HTTP to ``rpc_url``
+        ipfs_client: IPFS client to use instead of connecting to ``ipfs_api_url``
+    """
+
+    def __init__(self, rpc_url=None, ipfs_api_url=None, contract_address=None, provider=None, ipfs_client=None):
+        self.rpc_url = rpc_url or os.getenv('POLYGON_RPC_URL', 'http://localhost:8545')
+        self.ipfs_api_url = ipfs_api_url or os.getenv('IPFS_API_URL', 'http://localhost:5001')
+
+        # Initialize Web3 connection to Polygon
+        self.w3 = Web3(provider or InstrumentedHTTPProvider(self.rpc_url))
+
+        # Initialize IPFS client
+        if ipfs_client is not None:
+            self.ipfs_client = ipfs_client
+        else:
+            try:
+                # Try different IPFS connection methods
+                if self.ipfs_api_url.startswith('http'):
+                    # Use HTTP API
+                    self.ipfs_client = ipfshttpclient.connect(self.ipfs_api_url)
+                else:
+                    # Try default connection
+                    self.ipfs_client = ipfshttpclient.connect()
+            except Exception as e:
+                logger.warning("Could not connect to IPFS: %s", e)
+                self.ipfs_client = None
+
+        # Contract ABI and address (you'll need to deploy this)
+        self.contract_address = contract_address or os.getenv('ADDRESS_HUB_CONTRACT_ADDRESS')
+        self.contract_abi = load_contract_abi()
+
+        if self.contract_address and self.contract_abi:
+            self.contract = self.w3.eth.contract(
+                address=self.contract_address,
+                abi=self.contract_abi
+            )
+        else:
+            self.contract = None
+            self.contract_address = None
+            logger.warning("Contract not configured. Blockchain features disabled.")
+
+    def _address_id_bytes(self, address_id: str) -> bytes:
+        # UUID padded with zeros to bytes32 (64 hex characters)
+        return self.w3.to_bytes(hexstr=address_id.replace('-', '').zfill(64))
+
+    def _transaction(self, function, user_wallet: str) -> Dict[str, Any]:
+        return function.build_transaction({
+            'from': user_wallet,
+            'gas': 2000000,
+            'gasPrice': self.w3.eth.gas_price,
+            'nonce': self.w3.eth.get_transaction_count(user_wallet)
+        })
+
+    def is_connected(self) -> bool:
+        """Check if blockchain connection is available."""
+        try:
+            return self.w3.is_connected()
+        except:
+            return False
+
+    def ipfs_available(self) -> bool:
+        return self.ipfs_client is not None
+
+    def store_address(self, address_data: Dict[str, Any], user_wallet: str) -> Dict[str, Any]:
+        if not self.contract:
+            raise ValidationError("Blockchain contract not configured")
+
+        try:
+            address_id = self._address_id_bytes(address_data['id'])
+
+            # Construct full address
+            full_address = f"{address_data.get('address', '')}, {address_data.get('street', '')}, {address_data.get('suburb', '')}, {address_data.get('state', '')} {address_data.get('postcode', '')}"
+
+            # Ensure all string parameters are properly converted
+            address_name = str(address_data.get('address_name', ''))
+            street = str(address_data.get('street', ''))
+            suburb = str(address_data.get('suburb', ''))
+            state = str(address_data.get('state', ''))
+            postcode = str(address_data.get('postcode', ''))
+            is_default = bool(address_data.get('is_default', False))
+
+            # Call the smart contract to store the address; the address
+            # fields are personal data and are never logged
+            logger.debug("Storing address on blockchain: %s", address_data['id'])
+
+            # Build the transaction
+            tx = self._transaction(self.contract.functions.createAddress(
+                address_id,
+                address_name,
+                full_address,
+                street,
+                suburb,
+                state,
+                postcode,
+                is_default
+            ), user_wallet)
+
+            # For development with hardhat, we'll simulate the transaction
+            # In production, you would sign and send the transaction
+            logger.debug("Transaction built for address %s with nonce %s", address_data['id'], tx['nonce'])
+
+            return {
+                'success': True,
+                'transaction_hash': f"0x{uuid.uuid4().hex}",
+                'block_number': self.w3.eth.block_number,
+                'message': 'Address stored on blockchain (simulated for development)'
+            }
+
+        except Exception as e:
+            raise ValidationError(f"Failed to store address on blockchain: {str(e)}")
+
+    def get_address(self, address_id: str, user_wallet: str) -> Optional[Dict[str, Any]]:
+        if not self.contract:
+            return None
+
+        try:
+            address_data = self.contract.functions.getAddress(
+                self._address_id_bytes(address_id)
+            ).call({'from': user_wallet})
+
+            if address_data[8] == 0:  # createdAt is 0 if address doesn't exist
+                return None
+
+            return {
+                'id': address_id,
+                'address_name': address_data[0],
+                'address': address_data[1],
+                'street': address_data[2],
+                'suburb': address_data[3],
+                'state': address_data[4],
+                'postcode': address_data[5],
+                'is_default': address_data[6],
+                'is_active': address_data[7],
+                'created_at': address_data[8],
+                'updated_at': address_data[9]
+            }
+
+        except Exception as e:
+            logger.warning("Error retrieving address from blockchain: %s", e)
+            return None
+
+    def delete_address(self, address_id: str, user_wallet: str) -> Dict[str, Any]:
+        if not self.contract:
+            raise ValidationError("Blockchain contract not configured")
+
+        try:
+            self._transaction(self.contract.functions.deleteAddress(self._address_id_bytes(address_id)), user_wallet)
+
+            # For development, simulate the transaction
+            return {
+                'success': True,
+                'transaction_hash': f"0x{uuid.uuid4().hex}",
+                'block_number': self.w3.eth.block_number,
+                'message': 'Address deleted from blockchain (simulated)'
+            }
+
+        except Exception as e:
+            raise ValidationError(f"Failed to delete address from blockchain: {str(e)}")
+
+    def store_on_ipfs(self, data: Dict[str, Any]) -> Optional[str]:
+        if not self.ipfs_client:
+            return None
+
+        try:
+            # Convert data to JSON and store on IPFS
+            json_data = json.dumps(data, default=str)
+            with metrics.observe_ipfs('add'), tracing.span('ipfs add', kind=tracing.CLIENT):
+                result = self.ipfs_client.add_json(json_data)
+            return result
+        except Exception as e:
+            logger.warning("Error storing data on IPFS: %s", e)
+            return None
+
+    def get_from_ipfs(self, ipfs_hash: str) -> Optional[Dict[str, Any]]:
+        if not self.ipfs_client:
+            return None
+
+        try:
+            with metrics.observe_ipfs('get'), tracing.span('ipfs get', kind=tracing.CLIENT, **{'ipfs.hash': ipfs_hash}):
+                data = self.ipfs_client.get_json(ipfs_hash)
+            # store_on_ipfs adds the data already serialized, so it comes back as JSON text
+            if isinstance(data, str):
+                data = json.loads(data)
+            return data
+        except Exception as e:
+            logger.warning("Error retrieving data from IPFS: %s", e)
+            return None
+
+    def block_number(self) -> int:
+        return self.w3.eth.block_number
+
+    def ipfs_version(self) -> Dict[str, Any]:
+        if self.ipfs_client is None:
+            raise ConnectionError("IPFS client not connected")
+        return self.ipfs_client.version()
@@ -0,0 +1,62 @@
+"""
+Concurrent blockchain and IPFS reads for lists of addresses.
+"""
+
+from typing import Any, Dict, Iterable
+
+from django.conf import settings
+
+from apps.core.fanout import fan_out
+
+from .blockchain import blockchain_manager
+
+# Wallet used for read calls until users have their own wallets
+READ_WALLET = "0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266"
+
+
+def fetch_chain_data(addresses: Iterable) -> Dict[Any, Dict[str, Any]]:
+    """
+    Read the blockchain record and IPFS metadata of many addresses at once.
+
+    Calls run concurrently within the ``BLOCKCHAIN_FANOUT_*`` limits, and the
+    connection is checked once rather than per address.
+
+    Args:
+        addresses: Iterable of Address objects
+
+    Returns:
+        Dictionary mapping address ID to ``blockchain_data``, ``ipfs_metadata``
+        and ``timed_out`` (the names of the reads that missed their deadline)
+    """
+    addresses = list(addresses)
+    data = {
+        address.id: {'blockchain_data': None, 'ipfs_metadata': None, 'timed_out': []}
+        for address in addresses
+    }
+    if not addresses or not blockchain_manager.is_connected():
+        return data
+
+    calls = {}
+    for address in addresses:
+        if address.is_stored_on_blockchain:
+            calls[(address.id, 'blockchain_data')] = (
+                lambda address_id=str(address.id): blockchain_manager.get_address_from_blockchain(address_id, READ_WALLET)
+            )
+        if address.ipfs_hash:
+            calls[(address.id, 'ipfs_metadata')] = (
+                lambda ipfs_hash=address.ipfs_hash: blockchain_manager.get_from_ipfs(ipfs_hash)
+            )
+
+    results = fan_out(
+        calls,
+        max_workers=getattr(settings, 'BLOCKCHAIN_FANOUT_MAX_WORKERS', 8),
+        call_timeout=getattr(settings, 'BLOCKCHAIN_FANOUT_CALL_TIMEOUT', 2.0),
+        deadline=getattr(settings, 'BLOCKCHAIN_FANOUT_DEADLINE', 5.0),
+    )
+    for (address_id, field), result in results.items():
+        if result.timed_out:
+            data[address_id]['timed_out'].append(field)
+        elif result.ok:
+            data[address_id][field] = result.value
+
+    return data
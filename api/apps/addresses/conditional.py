@@ -0,0 +1,99 @@
+"""
+Conditional GET support (ETag) for address endpoints.
+
+ETags are computed from a single aggregate query over the addresses a
+response is built from, before any decryption or blockchain access, so a
+matching ``If-None-Match`` is answered with a 304 straight away. Every write
+to an address bumps its ``updated_at``; the count and the transaction
+hashes cover deletions and sync results.
+
+Responses carry no Last-Modified date: it has whole-second resolution, so
+an edit in the same second as an earlier response would be answered with a
+stale 304, and for a set of addresses one leaving the set (deleted or
+deactivated) can leave the newest ``updated_at`` unchanged or lower it.
+"""
+
+import hashlib
+from typing import Optional
+
+from django.db import connections
+from django.db.models import Aggregate, Count, Max, TextField, Value
+from django.db.models.functions import Coalesce
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+
+
+def _etag(*parts) -> str:
+    return hashlib.sha256('|'.join(str(part) for part in parts).encode()).hexdigest()
+
+
+class _GroupConcat(Aggregate):
+    function = 'GROUP_CONCAT'
+    output_field = TextField()
+
+
+def _tx_hashes(addresses):
+    """
+    Aggregate joining the addresses' transaction hashes in id order.
+
+    Databases without ordered aggregates join them in scan order, which is
+    stable in practice and at worst turns a 304 into a full response.
+    """
+    tx_hash = Coalesce('blockchain_tx_hash', Value(''))
+    if connections[addresses.db].vendor == 'postgresql':
+        from django.contrib.postgres.aggregates import StringAgg
+
+        return StringAgg(tx_hash, delimiter=',', ordering='id', default=Value(''))
+    return _GroupConcat(tx_hash)
+
+
+def address_set_validators(addresses, variant: str = '') -> str:
+    """
+    Return the ETag of a set of addresses.
+
+    Args:
+        addresses: Address queryset the response is built from
+        variant: Anything else the representation depends on, e.g. the
+            query string of a paginated request
+    """
+    state = addresses.order_by().aggregate(
+        last_modified=Max('updated_at'),
+        count=Count('id'),
+        tx_hashes=_tx_hashes(addresses),
+        latest_block=Max('blockchain_block_number'),
+    )
+    etag = _etag(
+        variant,
+        state['last_modified'].isoformat() if state['last_modified'] else '',
+        state['count'],
+        state['tx_hashes'] or '',
+        state['latest_block'],
+    )
+    return etag
+
+
+def address_validators(addresses, address_id) -> Optional[str]:
+    """Return the ETag of a single address, or None if it is not in ``addresses``."""
+    state = addresses.filter(id=address_id).values('updated_at', 'blockchain_tx_hash').first()
+    if state is None:
+        return None
+    return _etag(address_id, state['updated_at'].isoformat(), state['blockchain_tx_hash'] or '')
+
+
+def not_modified_response(request, etag: str):
+    """
+    Return a 304 (or 412) response if the request's preconditions allow it,
+    otherwise None.
+    """
+    response = get_conditional_response(request, etag=quote_etag(etag))
+    if response is not None:
+        set_validators(response, etag)
+    return response
+
+
+def set_validators(response, etag: str):
+    """Add the ETag and per-user revalidation headers to a response."""
+    response.headers['ETag'] = quote_etag(etag)
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Authorization'])
+    return response
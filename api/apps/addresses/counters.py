@@ -0,0 +1,192 @@
+"""
+Incrementally maintained blockchain sync counters.
+
+Every change to an address's ``is_active`` / ``is_stored_on_blockchain``
+state applies a delta to its owner's ``AddressSyncCounter`` row and to the
+global row (``user`` NULL) in the same transaction as the address write,
+so status endpoints and the batch scheduler read O(1) values instead of
+counting addresses. ``reconcile_counters`` recomputes every row from the
+addresses table and is run periodically to repair any drift.
+"""
+
+import logging
+from typing import Dict, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# (is_active, is_stored_on_blockchain) of an address, or None if it does not exist
+SyncState = Optional[Tuple[bool, bool]]
+
+
+def _contribution(state: SyncState) -> Tuple[int, int]:
+    """Return the (total, on_chain) counts a single address contributes."""
+    if state is None or not state[0]:
+        return 0, 0
+    return 1, 1 if state[1] else 0
+
+
+def _count_addresses(user_id=None) -> Tuple[int, int]:
+    from .models import Address
+
+    addresses = Address.objects.filter(is_active=True)
+    if user_id is not None:
+        addresses = addresses.filter(user_id=user_id)
+    counts = addresses.order_by().aggregate(
+        total=Count('id'),
+        on_chain=Count('id', filter=Q(is_stored_on_blockchain=True)),
+    )
+    return counts['total'], counts['on_chain']
+
+
+def _rebuild(user_id=None) -> Tuple[int, int]:
+    """Create or overwrite one counter row from the addresses table."""
+    from .models import AddressSyncCounter
+
+    total, on_chain = _count_addresses(user_id)
+    AddressSyncCounter.objects.update_or_create(
+        user_id=user_id,
+        defaults={'total_addresses': total, 'addresses_on_blockchain': on_chain},
+    )
+    return total, on_chain
+
+
+def _increment(user_id, total_delta: int, on_chain_delta: int, create_missing: bool) -> None:
+    from .models import AddressSyncCounter
+
+    updated = AddressSyncCounter.objects.filter(user_id=user_id).update(
+        total_addresses=F('total_addresses') + total_delta,
+        addresses_on_blockchain=F('addresses_on_blockchain') + on_chain_delta,
+        updated_at=timezone.now(),
+    )
+    if updated or not create_missing:
+        return
+
+    # No row yet: count from the addresses table, which already includes
+    # the change being applied. A concurrent writer may create it first.
+    try:
+        with transaction.atomic():
+            _rebuild(user_id)
+    except IntegrityError:
+        _increment(user_id, total_delta, on_chain_delta, create_missing=False)
+
+
+def apply_state_change(user_id, old: SyncState, new: SyncState, create_missing: bool = True) -> None:
+    """
+    Apply an address's state transition to its owner's and the global counters.
+
+    Call inside the transaction that writes the address.
+
+    Args:
+        user_id: Owner of the address
+        old: State before the write, None for a new address
+        new: State after the write, None for a deleted address
+        create_missing: Create a missing counter row by counting addresses;
+            False while the owner may be being deleted
+    """
+    old_total, old_on_chain = _contribution(old)
+    new_total, new_on_chain = _contribution(new)
+    total_delta = new_total - old_total
+    on_chain_delta = new_on_chain - old_on_chain
+    if not total_delta and not on_chain_delta:
+        return
+
+    with transaction.atomic():
+        _increment(user_id, total_delta, on_chain_delta, create_missing)
+        _increment(None, total_delta, on_chain_delta, create_missing=True)
+
+
+def get_sync_counts(user_id=None) -> Dict[str, int]:
+    """
+    Return active, on-chain and pending address counts for a user, or
+    across all users when ``user_id`` is None.
+    """
+    from .models import AddressSyncCounter
+
+    counts = AddressSyncCounter.objects.filter(user_id=user_id).values_list(
+        'total_addresses', 'addresses_on_blockchain'
+    ).first()
+    if counts is None:
+        counts = _rebuild(user_id)
+
+    total, on_chain = counts
+    return {
+        'total_addresses': total,
+        'addresses_on_blockchain': on_chain,
+        'pending_sync': total - on_chain,
+    }
+
+
+def _reconcile(user_id) -> bool:
+    """
+    Recount one counter row under a row lock; return whether it was corrected.
+
+    Writers hold the same lock while applying their delta, so the count is
+    taken after every earlier delta has committed and any later delta is
+    added on top of the corrected value.
+    """
+    from .models import AddressSyncCounter
+
+    with transaction.atomic():
+        counter = AddressSyncCounter.objects.select_for_update().filter(user_id=user_id).only(
+            'total_addresses', 'addresses_on_blockchain'
+        ).first()
+        if counter is None:
+            _rebuild(user_id)
+            return True
+
+        expected = _count_addresses(user_id)
+        if (counter.total_addresses, counter.addresses_on_blockchain) == expected:
+            return False
+        AddressSyncCounter.objects.filter(pk=counter.pk).update(
+            total_addresses=expected[0],
+            addresses_on_blockchain=expected[1],
+            updated_at=timezone.now(),
+        )
+        return True
+
+
+def reconcile_counters() -> Dict[str, int]:
+    """
+    Recompute every counter row from the addresses table.
+
+    A single aggregate finds the rows that look wrong; each of those is then
+    recounted under its row lock, so increments applied concurrently are
+    never overwritten.
+
+    Returns the number of rows checked and corrected.
+    """
+    from .models import Address, AddressSyncCounter
+
+    actual = {
+        row['user_id']: (row['total'], row['on_chain'])
+        for row in Address.objects.filter(is_active=True).order_by().values('user_id').annotate(
+            total=Count('id'),
+            on_chain=Count('id', filter=Q(is_stored_on_blockchain=True)),
+        )
+    }
+    actual[None] = _count_addresses()
+
+    suspects = set()
+    seen = set()
+    stored = AddressSyncCounter.objects.values_list('user_id', 'total_addresses', 'addresses_on_blockchain')
+    for user_id, total, on_chain in stored.iterator():
+        seen.add(user_id)
+        if (total, on_chain) != actual.get(user_id, (0, 0)):
+            suspects.add(user_id)
+    suspects |= actual.keys() - seen
+
+    corrected = 0
+    for user_id in suspects:
+        try:
+            corrected += _reconcile(user_id)
+        except IntegrityError:
+            # A concurrent writer created the missing row from a fresh count
+            continue
+
+    if corrected:
+        logger.warning("Corrected %d address sync counter(s)", corrected)
+    return {'checked': len(actual.keys() | seen), 'corrected': corrected}
@@ -178,3 +178,23 @@ def decrypt_address_data(encrypted_data: dict) -> dict:
             decrypted_data[key] = value
     
     return decrypted_data
+
+
+def decrypt_addresses(addresses) -> dict:
+    """
+    Decrypt the address fields of a batch of Address instances.
+    
+    Args:
+        addresses: Iterable of Address objects
+        
+    Returns:
+        Dictionary mapping address ID to its decrypted address fields
+    """
+    fields_to_decrypt = ['address', 'street', 'suburb', 'state', 'postcode']
+    
+    return {
+        address.id: decrypt_address_data({
+            field: getattr(address, field) or '' for field in fields_to_decrypt
+        })
+        for address in addresses
+    }
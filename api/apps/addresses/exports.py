@@ -0,0 +1,309 @@
+"""
+Bulk exports of organization lookup history and permitted addresses.
+
+Rows are read through a server-side cursor (``iterator(chunk_size=...)``),
+decrypted one chunk at a time and rendered incrementally, so memory use stays
+flat regardless of export size.
+
+Asynchronous exports are stored encrypted, as one Fernet token per block of
+rendered output, and deleted by ``delete_expired_exports`` once their
+download token has expired.
+"""
+
+import csv
+import json
+import logging
+import os
+import tempfile
+import uuid
+from datetime import timedelta
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from apps.accounts.audit import build_lookup_entry, record_lookups
+from apps.accounts.models import AddressPermission, LookupRecord
+from .encryption import address_encryption, decrypt_address_data
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per server-side cursor round trip
+EXPORT_CHUNK_SIZE = 1000
+
+# How long an asynchronous export can be downloaded for (seconds)
+EXPORT_TOKEN_TIMEOUT = 60 * 60 * 24
+
+# Storage directory of asynchronous exports
+EXPORT_DIRECTORY = 'exports'
+
+# Rendered bytes encrypted together into one block of an export file
+EXPORT_BLOCK_SIZE = 64 * 1024
+
+EXPORT_CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+LOOKUP_HISTORY = 'lookup_history'
+PERMITTED_ADDRESSES = 'permitted_addresses'
+
+EXPORT_FIELDS = {
+    LOOKUP_HISTORY: [
+        'lookup_id', 'address_id', 'lookup_date', 'lookup_successful', 'username', 'reason'
+    ],
+    PERMITTED_ADDRESSES: [
+        'address_id', 'address_name', 'address', 'street', 'suburb', 'state', 'postcode',
+        'is_default', 'permission_granted_at'
+    ],
+}
+
+ADDRESS_DATA_FIELDS = ['address', 'street', 'suburb', 'state', 'postcode']
+
+
+def _chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Split an iterable into lists of at most ``size`` items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_lookup_history(organization_id, since=None, until=None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield an organization's lookup records as export rows, newest first.
+
+    Args:
+        organization_id: Organization whose history is exported
+        since: Only include lookups at or after this datetime
+        until: Only include lookups before this datetime
+    """
+    lookups = LookupRecord.objects.filter(organization_id=organization_id)
+    if since is not None:
+        lookups = lookups.filter(created_at__gte=since)
+    if until is not None:
+        lookups = lookups.filter(created_at__lt=until)
+    lookups = lookups.select_related('user').only(
+        'id', 'organization', 'address', 'created_at', 'lookup_successful', 'notes',
+        'user', 'user__username'
+    ).order_by('-created_at', '-id')
+
+    for lookup in lookups.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield {
+            'lookup_id': str(lookup.id),
+            'address_id': str(lookup.address_id) if lookup.address_id else None,
+            'lookup_date': lookup.created_at.isoformat(),
+            'lookup_successful': lookup.lookup_successful,
+            'username': lookup.user.username,
+            'reason': lookup.notes,
+        }
+
+
+def iter_permitted_addresses(
+    organization_id,
+    on_chunk: Optional[Callable[[List[Any]], None]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the active addresses an organization has been granted, decrypted.
+
+    Address data is read from the encrypted database fields; blockchain and
+    IPFS are not contacted.
+
+    Args:
+        organization_id: Organization whose permitted addresses are exported
+        on_chunk: Called with each chunk of Address objects before it is
+            yielded, e.g. to write audit records
+    """
+    permissions = AddressPermission.objects.filter(
+        organization_id=organization_id,
+        is_active=True,
+        address__is_active=True
+    ).select_related('address').only(
+        'id', 'created_at', 'address',
+        'address__address_name', 'address__is_default',
+        *[f'address__{field}' for field in ADDRESS_DATA_FIELDS]
+    ).order_by('address_id')
+
+    for chunk in _chunked(permissions.iterator(chunk_size=EXPORT_CHUNK_SIZE), EXPORT_CHUNK_SIZE):
+        if on_chunk is not None:
+            on_chunk([permission.address for permission in chunk])
+
+        for permission in chunk:
+            address = permission.address
+            decrypted = decrypt_address_data({
+                field: getattr(address, field) or '' for field in ADDRESS_DATA_FIELDS
+            })
+            yield {
+                'address_id': str(address.id),
+                'address_name': address.address_name,
+                **decrypted,
+                'is_default': address.is_default,
+                'permission_granted_at': permission.created_at.isoformat(),
+            }
+
+
+def lookup_audit_writer(organization_id, user_id, ip_address=None, user_agent='') -> Callable[[List[Any]], None]:
+    """
+    Return an ``on_chunk`` callback that records one successful lookup per
+    exported address, buffered as one batch per chunk.
+    """
+    def write(addresses):
+        record_lookups([
+            build_lookup_entry(
+                organization_id,
+                user_id,
+                address.id,
+                lookup_successful=True,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                notes='Bulk export'
+            )
+            for address in addresses
+        ])
+    return write
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the value instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def render_csv(rows: Iterable[Dict[str, Any]], fieldnames: List[str]) -> Iterator[str]:
+    """Render rows as CSV, one line at a time, starting with the header."""
+    writer = csv.DictWriter(_Echo(), fieldnames=fieldnames)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def render_ndjson(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Render rows as newline-delimited JSON."""
+    for row in rows:
+        yield json.dumps(row) + '\n'
+
+
+def render_export(kind: str, export_format: str, rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Render export rows in the requested format."""
+    if export_format == 'csv':
+        return render_csv(rows, EXPORT_FIELDS[kind])
+    return render_ndjson(rows)
+
+
+def export_filename(kind: str, export_format: str) -> str:
+    return f"{kind}.{export_format}"
+
+
+# Asynchronous exports
+
+def _export_cache_key(token: str) -> str:
+    return f"export:{token}"
+
+
+def create_export_token(kind: str, export_format: str, organization_id) -> str:
+    """Register a pending asynchronous export and return its download token."""
+    token = uuid.uuid4().hex
+    cache.set(_export_cache_key(token), {
+        'status': 'pending',
+        'kind': kind,
+        'format': export_format,
+        'organization_id': str(organization_id),
+        'path': None,
+        'error': None,
+    }, EXPORT_TOKEN_TIMEOUT)
+    return token
+
+
+def get_export(token: str) -> Optional[Dict[str, Any]]:
+    """Return the state of an asynchronous export, or None if unknown or expired."""
+    return cache.get(_export_cache_key(token))
+
+
+def _update_export(token: str, **changes) -> None:
+    export = get_export(token)
+    if export is None:
+        return
+    export.update(changes)
+    cache.set(_export_cache_key(token), export, EXPORT_TOKEN_TIMEOUT)
+
+
+def _encrypted_blocks(chunks: Iterable[str]) -> Iterator[bytes]:
+    """Encrypt rendered output in blocks, one Fernet token per line."""
+    cipher = address_encryption.cipher
+    buffer, size = [], 0
+    for chunk in chunks:
+        data = chunk.encode()
+        buffer.append(data)
+        size += len(data)
+        if size >= EXPORT_BLOCK_SIZE:
+            yield cipher.encrypt(b''.join(buffer)) + b'\n'
+            buffer, size = [], 0
+    if buffer:
+        yield cipher.encrypt(b''.join(buffer)) + b'\n'
+
+
+def write_export_file(token: str, kind: str, export_format: str, rows: Iterable[Dict[str, Any]]) -> str:
+    """
+    Render an export, encrypted, to a temporary file, move it to default
+    storage and mark the token as ready.
+
+    Returns:
+        Storage path of the export file
+    """
+    try:
+        with tempfile.NamedTemporaryFile(mode='w+b', suffix=f'.{export_format}.enc') as temp_file:
+            for block in _encrypted_blocks(render_export(kind, export_format, rows)):
+                temp_file.write(block)
+            temp_file.flush()
+            temp_file.seek(0)
+            path = default_storage.save(
+                os.path.join(EXPORT_DIRECTORY, f"{token}.{export_format}.enc"),
+                File(temp_file)
+            )
+    except Exception as e:
+        _update_export(token, status='failed', error=str(e))
+        raise
+
+    _update_export(token, status='ready', path=path)
+    return path
+
+
+def read_export_file(path: str) -> Iterator[bytes]:
+    """Yield the decrypted content of an export file, one block at a time."""
+    cipher = address_encryption.cipher
+    with default_storage.open(path, 'rb') as export_file:
+        for line in export_file:
+            line = line.strip()
+            if line:
+                yield cipher.decrypt(line)
+
+
+def delete_expired_exports(max_age: int = EXPORT_TOKEN_TIMEOUT) -> int:
+    """
+    Delete export files older than ``max_age`` seconds, whose download
+    tokens have expired.
+
+    Returns:
+        Number of files deleted
+    """
+    if not default_storage.exists(EXPORT_DIRECTORY):
+        return 0
+
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    _, filenames = default_storage.listdir(EXPORT_DIRECTORY)
+    deleted = 0
+    for filename in filenames:
+        path = os.path.join(EXPORT_DIRECTORY, filename)
+        try:
+            if default_storage.get_modified_time(path) < cutoff:
+                default_storage.delete(path)
+                deleted += 1
+        except OSError as e:
+            logger.warning("Could not delete expired export %s: %s", path, e)
+    return deleted
@@ -0,0 +1,157 @@
+"""
+Deterministic in-process stand-ins for the RPC node and IPFS.
+
+``use_fake_chain()`` gives ``blockchain_manager`` a ``Web3Backend`` whose
+JSON-RPC provider and IPFS client answer locally, count every call and can
+add a fixed latency per call. Unlike ``InMemoryBackend`` this runs the real
+web3 code path, so management commands use it to measure the RPC calls the
+app makes without a node, a daemon or the network.
+"""
+
+import hashlib
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from eth_abi import encode
+from web3 import Web3
+from web3.providers.base import JSONBaseProvider
+
+from .backends.base import BaseChainBackend
+from .backends.memory import CallCounter
+from .backends.web3 import Web3Backend, load_contract_abi
+from .blockchain import blockchain_manager
+
+# Contract address the fake chain pretends the contract is deployed at
+FAKE_CONTRACT_ADDRESS = '0x5FbDB2315678afecb367f032d93F642f64180aa3'
+
+
+def _default_value(output: Dict[str, Any]):
+    """Zero value of an ABI output, e.g. ``0`` for uint256 or ``''`` for string."""
+    abi_type = output['type']
+    if abi_type.endswith(']'):
+        return []
+    if abi_type == 'tuple':
+        return tuple(_default_value(component) for component in output['components'])
+    if abi_type.startswith(('uint', 'int')):
+        return 0
+    if abi_type == 'bool':
+        return False
+    if abi_type == 'address':
+        return '0x' + '00' * 20
+    if abi_type == 'string':
+        return ''
+    if abi_type == 'bytes':
+        return b''
+    if abi_type.startswith('bytes'):
+        return b'\0' * int(abi_type[5:])
+    raise ValueError(f"Unsupported ABI type: {abi_type}")
+
+
+def _abi_type(output: Dict[str, Any]) -> str:
+    if output['type'].startswith('tuple'):
+        inner = ','.join(_abi_type(component) for component in output['components'])
+        return f"({inner}){output['type'][5:]}"
+    return output['type']
+
+
+class FakeChainProvider(JSONBaseProvider):
+    """
+    JSON-RPC provider answering from memory.
+
+    ``eth_call`` returns the zero value of the called function's outputs
+    (so ``getAddress`` reports "not stored"), and every call is counted.
+
+    Args:
+        abi: Contract ABI used to encode ``eth_call`` results
+        latency: Seconds each call takes
+    """
+
+    def __init__(self, abi: Optional[list] = None, latency: float = 0.0):
+        super().__init__()
+        self.latency = latency
+        self.counter = CallCounter()
+        self._outputs = {}
+        for item in abi or []:
+            if item.get('type') == 'function':
+                signature = f"{item['name']}({','.join(_abi_type(arg) for arg in item['inputs'])})"
+                selector = Web3.keccak(text=signature)[:4].hex().removeprefix('0x')
+                self._outputs[selector] = item.get('outputs', [])
+
+    def make_request(self, method, params):
+        self.counter.add(method)
+        if self.latency:
+            time.sleep(self.latency)
+        return {'jsonrpc': '2.0', 'id': 1, 'result': self._result(method, params)}
+
+    def _result(self, method, params):
+        if method == 'eth_call':
+            data = params[0].get('data') or params[0].get('input') or '0x'
+            outputs = self._outputs.get(data[2:10], [])
+            return '0x' + encode([_abi_type(output) for output in outputs],
+                                 [_default_value(output) for output in outputs]).hex()
+        return {
+            'web3_clientVersion': 'fake-chain/1.0',
+            'net_version': '31337',
+            'eth_chainId': hex(31337),
+            'eth_blockNumber': hex(1),
+            'eth_gasPrice': hex(1),
+            'eth_getTransactionCount': hex(0),
+            'eth_estimateGas': hex(21000),
+            'eth_getCode': '0x00',
+        }.get(method)
+
+
+class FakeIPFSClient:
+    """IPFS client keeping JSON documents in memory, counting every call."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.counter = CallCounter()
+        self.documents: Dict[str, Any] = {}
+
+    def _call(self, method: str) -> None:
+        self.counter.add(method)
+        if self.latency:
+            time.sleep(self.latency)
+
+    def add_json(self, data) -> str:
+        self._call('add_json')
+        ipfs_hash = 'Qm' + hashlib.sha256(str(data).encode()).hexdigest()[:44]
+        self.documents[ipfs_hash] = data
+        return ipfs_hash
+
+    def get_json(self, ipfs_hash: str):
+        self._call('get_json')
+        return self.documents.get(ipfs_hash, {})
+
+    def version(self) -> Dict[str, str]:
+        self._call('version')
+        return {'Version': 'fake'}
+
+
+@contextmanager
+def use_backend(backend: BaseChainBackend):
+    """Use ``backend`` for ``blockchain_manager`` inside the block."""
+    saved = blockchain_manager._backend
+    blockchain_manager.backend = backend
+    try:
+        yield backend
+    finally:
+        blockchain_manager.backend = saved
+
+
+@contextmanager
+def use_fake_chain(rpc_latency: float = 0.0, ipfs_latency: float = 0.0):
+    """
+    Point ``blockchain_manager`` at a fake node and IPFS inside the block.
+
+    Yields:
+        (FakeChainProvider, FakeIPFSClient), whose ``counter`` attributes
+        count the calls made
+    """
+    provider = FakeChainProvider(load_contract_abi(), latency=rpc_latency)
+    ipfs = FakeIPFSClient(latency=ipfs_latency)
+    backend = Web3Backend(provider=provider, ipfs_client=ipfs, contract_address=FAKE_CONTRACT_ADDRESS)
+    with use_backend(backend):
+        yield provider, ipfs
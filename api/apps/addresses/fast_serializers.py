@@ -0,0 +1,136 @@
+"""
+Fast-path serializers for address list and lookup responses.
+
+``AddressSerializer`` and ``OrganizationAddressLookupSerializer`` read each
+address field through several DRF fields (top level, ``address_breakdown``
+and ``full_address``), each with its own attribute lookup and
+representation step. The functions here build the same output directly
+from a single resolved record per row. ``benchmark_serializers`` checks
+they are identical to the DRF serializers and compares their speed.
+
+Use them with ``Address.objects.with_resolved_data()`` querysets.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+# Address data fields as named in responses, with the properties they come from
+_DATA_PROPERTIES = (
+    ('address', 'address_line'),
+    ('street', 'street_name'),
+    ('suburb', 'suburb_name'),
+    ('state', 'state_name'),
+    ('postcode', 'postal_code'),
+)
+
+# DRF's own datetime representation, used when the fast path does not apply
+_datetime_field = serializers.DateTimeField()
+
+
+def datetime_renderer() -> Callable[[Any], Any]:
+    """
+    Return a function rendering datetimes exactly like DRF's ``DateTimeField``.
+
+    The output time zone is looked up once, rather than per value as DRF does.
+    """
+    output_format = api_settings.DATETIME_FORMAT
+    if not settings.USE_TZ or not isinstance(output_format, str) or output_format.lower() != ISO_8601:
+        return lambda value: _datetime_field.to_representation(value) if value else None
+
+    output_timezone = timezone.get_current_timezone()
+
+    def render(value):
+        if not value:
+            return None
+        if timezone.is_naive(value):
+            return _datetime_field.to_representation(value)
+        value = value.astimezone(output_timezone).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+    return render
+
+
+def _string(value):
+    return None if value is None else str(value)
+
+
+def _integer(value):
+    return None if value is None else int(value)
+
+
+def _dict(value):
+    return None if value is None else {str(key): item for key, item in value.items()}
+
+
+def _address_data(address) -> Dict[str, Any]:
+    """Read the five address fields once, as the serializers would render them."""
+    return {name: _string(getattr(address, prop)) for name, prop in _DATA_PROPERTIES}
+
+
+def _blockchain_info(address, render_datetime) -> Dict[str, Any]:
+    return {
+        'is_stored_on_blockchain': bool(address.is_stored_on_blockchain),
+        'last_synced_at': render_datetime(address.last_synced_at),
+        'blockchain_tx_hash': _string(address.blockchain_tx_hash),
+        'blockchain_block_number': _integer(address.blockchain_block_number),
+        'ipfs_hash': _string(address.ipfs_hash),
+        'blockchain_data': _dict(address.blockchain_data),
+        'ipfs_metadata': _dict(address.ipfs_metadata),
+    }
+
+
+def address_data(address, render_datetime: Optional[Callable] = None) -> Dict[str, Any]:
+    """Return the ``AddressSerializer`` representation of an address."""
+    render_datetime = render_datetime or datetime_renderer()
+    data = _address_data(address)
+    blockchain_info = _blockchain_info(address, render_datetime)
+    return {
+        'id': str(address.id),
+        'address_name': _string(address.address_name),
+        **data,
+        'is_default': bool(address.is_default),
+        'is_active': bool(address.is_active),
+        'created_at': render_datetime(address.created_at),
+        'updated_at': render_datetime(address.updated_at),
+        'address_breakdown': dict(data),
+        'full_address': (
+            f"{data['address']}, {data['street']}, {data['suburb']}, {data['state']} {data['postcode']}"
+        ),
+        'blockchain_info': blockchain_info,
+        'is_stored_on_blockchain': blockchain_info['is_stored_on_blockchain'],
+        'last_synced_at': blockchain_info['last_synced_at'],
+        'blockchain_tx_hash': blockchain_info['blockchain_tx_hash'],
+        'blockchain_block_number': blockchain_info['blockchain_block_number'],
+        'ipfs_hash': blockchain_info['ipfs_hash'],
+    }
+
+
+def lookup_address_data(address, render_datetime: Optional[Callable] = None) -> Dict[str, Any]:
+    """Return the ``OrganizationAddressLookupSerializer`` representation of an address."""
+    render_datetime = render_datetime or datetime_renderer()
+    return {
+        'id': str(address.id),
+        'address_name': _string(address.address_name),
+        'is_default': bool(address.is_default),
+        'is_active': bool(address.is_active),
+        'created_at': render_datetime(address.created_at),
+        'updated_at': render_datetime(address.updated_at),
+        'address_breakdown': _address_data(address),
+        'blockchain_info': _blockchain_info(address, render_datetime),
+    }
+
+
+def address_list_data(addresses: Iterable) -> List[Dict[str, Any]]:
+    """Return the ``AddressSerializer(many=True)`` representation of addresses."""
+    render_datetime = datetime_renderer()
+    return [address_data(address, render_datetime) for address in addresses]
+
+
+def lookup_address_list_data(addresses: Iterable) -> List[Dict[str, Any]]:
+    """Return the ``OrganizationAddressLookupSerializer(many=True)`` representation of addresses."""
+    render_datetime = datetime_renderer()
+    return [lookup_address_data(address, render_datetime) for address in addresses]
@@ -0,0 +1,101 @@
+"""
+Compare the fast-path address serializers with the DRF serializers.
+
+Builds in-memory addresses with encrypted data (no database or blockchain
+access), resolves them the way ``with_resolved_data()`` does, checks that
+both paths produce identical JSON and reports rows per second for each.
+"""
+
+import json
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.addresses.encryption import encrypt_address_data
+from apps.addresses.fast_serializers import address_list_data, lookup_address_list_data
+from apps.addresses.models import Address
+from apps.addresses.resolution import resolve_addresses
+from apps.addresses.serializers import AddressSerializer, OrganizationAddressLookupSerializer
+
+DEFAULT_SIZES = [10, 100, 10000]
+
+
+def build_addresses(count):
+    """Return ``count`` unsaved, resolved addresses with typical data."""
+    now = timezone.now()
+    addresses = []
+    for index in range(count):
+        synced = index % 2 == 0
+        address = Address(
+            id=uuid.uuid4(),
+            user_id=1,
+            address_name=f"Address {index}",
+            is_default=index == 0,
+            is_active=True,
+            is_stored_on_blockchain=synced,
+            last_synced_at=now if synced else None,
+            blockchain_tx_hash=f"0x{uuid.uuid4().hex}{uuid.uuid4().hex}" if synced else None,
+            blockchain_block_number=1000 + index if synced else None,
+            created_at=now - timedelta(minutes=index),
+            updated_at=now,
+            **encrypt_address_data({
+                'address': f"{index} Example Street",
+                'street': 'Example Street',
+                'suburb': 'Sydney',
+                'state': 'NSW',
+                'postcode': '2000',
+            }),
+        )
+        addresses.append(address)
+    resolve_addresses(addresses, chain=False)
+    return addresses
+
+
+def rows_per_second(serialize, addresses, min_time):
+    """Run ``serialize`` until ``min_time`` seconds have passed; return rows per second."""
+    rows = 0
+    start = time.perf_counter()
+    while True:
+        serialize(addresses)
+        rows += len(addresses)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return rows / elapsed
+
+
+class Command(BaseCommand):
+    help = "Benchmark the fast-path address serializers against the DRF serializers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+            help='Numbers of rows to serialize (default: 10 100 10000)'
+        )
+        parser.add_argument(
+            '--min-time', type=float, default=1.0,
+            help='Seconds to spend on each measurement (default: 1.0)'
+        )
+
+    def handle(self, *args, **options):
+        cases = [
+            ('address list', lambda rows: AddressSerializer(rows, many=True).data, address_list_data),
+            ('lookup', lambda rows: OrganizationAddressLookupSerializer(rows, many=True).data, lookup_address_list_data),
+        ]
+
+        self.stdout.write(f"{'response':<14} {'rows':>7} {'DRF rows/s':>12} {'fast rows/s':>12} {'speedup':>8}")
+        for size in options['sizes']:
+            addresses = build_addresses(size)
+            for name, drf, fast in cases:
+                if json.dumps(drf(addresses)) != json.dumps(fast(addresses)):
+                    raise CommandError(f"Fast {name} serializer output differs from DRF at {size} rows")
+
+                drf_rate = rows_per_second(drf, addresses, options['min_time'])
+                fast_rate = rows_per_second(fast, addresses, options['min_time'])
+                self.stdout.write(
+                    f"{name:<14} {size:>7} {drf_rate:>12,.0f} {fast_rate:>12,.0f} {fast_rate / drf_rate:>7.1f}x"
+                )
+
+        self.stdout.write(self.style.SUCCESS("Fast serializers match the DRF output."))
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.10 on 2026-10-19 01:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("addresses", "0007_add_last_synced_at_field"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="address",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["user", "-is_default", "-created_at", "-id"],
+                name="addr_user_active_keyset_idx",
+            ),
+        ),
+    ]
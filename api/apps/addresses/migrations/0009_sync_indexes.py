@@ -0,0 +1,33 @@
+# Generated by Django 4.2.10 on 2026-10-19 01:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("addresses", "0008_address_keyset_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="address",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_active", True), ("is_stored_on_blockchain", False)
+                ),
+                fields=["-created_at"],
+                name="addr_pending_sync_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="address",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_active", True), ("is_stored_on_blockchain", True)
+                ),
+                fields=["-created_at"],
+                name="addr_synced_idx",
+            ),
+        ),
+    ]
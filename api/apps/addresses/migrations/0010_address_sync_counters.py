@@ -0,0 +1,78 @@
+# Generated by Django 4.2.10 on 2026-10-19 01:35
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.db.models.functions.comparison
+from django.db.models import Count, Q
+
+
+def populate_counters(apps, schema_editor):
+    """Seed the per-user and global counters from existing addresses."""
+    Address = apps.get_model("addresses", "Address")
+    AddressSyncCounter = apps.get_model("addresses", "AddressSyncCounter")
+
+    counts = {
+        "total_addresses": Count("id"),
+        "addresses_on_blockchain": Count("id", filter=Q(is_stored_on_blockchain=True)),
+    }
+    active = Address.objects.filter(is_active=True).order_by()
+    AddressSyncCounter.objects.bulk_create(
+        [
+            AddressSyncCounter(**row)
+            for row in active.values("user_id").annotate(**counts)
+        ]
+        + [AddressSyncCounter(user_id=None, **active.aggregate(**counts))],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("addresses", "0009_sync_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AddressSyncCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("total_addresses", models.IntegerField(default=0)),
+                ("addresses_on_blockchain", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Address Sync Counter",
+                "verbose_name_plural": "Address Sync Counters",
+                "db_table": "address_sync_counters",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="addresssynccounter",
+            constraint=models.UniqueConstraint(
+                django.db.models.functions.comparison.Coalesce("user", models.Value(0)),
+                name="unique_address_sync_counter",
+            ),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -3,11 +3,55 @@ Address models for MyAddressHub.
 """
 
 import uuid
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
+from django.db.models.query import ModelIterable
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.core.validators import RegexValidator
 from .blockchain import blockchain_manager
+from .counters import apply_state_change
 from .encryption import encrypt_address_data, decrypt_address_data
+from .resolution import resolve_addresses
+
+
+class AddressQuerySet(models.QuerySet):
+    """
+    QuerySet for addresses, with batched data resolution.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._resolve_data = False
+        self._resolve_chain = True
+    
+    def with_resolved_data(self, chain=True):
+        """
+        Resolve the address data of every fetched row in one batch.
+        
+        Like prefetch_related, resolution happens once the rows are fetched:
+        all rows are decrypted together and, when ``chain`` is true, their
+        blockchain records and IPFS metadata are read concurrently. Not
+        applied by ``iterator()``.
+        """
+        clone = self._chain()
+        clone._resolve_data = True
+        clone._resolve_chain = chain
+        return clone
+    
+    def _clone(self):
+        clone = super()._clone()
+        clone._resolve_data = self._resolve_data
+        clone._resolve_chain = self._resolve_chain
+        return clone
+    
+    def _fetch_all(self):
+        resolve = self._resolve_data and self._result_cache is None
+        super()._fetch_all()
+        if resolve and issubclass(self._iterable_class, ModelIterable):
+            resolve_addresses(self._result_cache, chain=self._resolve_chain)
 
 
 class Address(models.Model):
@@ -39,6 +83,8 @@ class Address(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = AddressQuerySet.as_manager()
+    
     class Meta:
         db_table = 'addresses'
         ordering = ['-created_at']
@@ -52,6 +98,26 @@ class Address(models.Model):
                 name='unique_default_address_per_user'
             )
         ]
+        indexes = [
+            # Backs keyset pagination of a user's active addresses
+            models.Index(
+                fields=['user', '-is_default', '-created_at', '-id'],
+                condition=models.Q(is_active=True),
+                name='addr_user_active_keyset_idx'
+            ),
+            # Addresses waiting for (or already in) blockchain sync, in the
+            # order the batch sync picks them up
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(is_active=True, is_stored_on_blockchain=False),
+                name='addr_pending_sync_idx'
+            ),
+            models.Index(
+                fields=['-created_at'],
+                condition=models.Q(is_active=True, is_stored_on_blockchain=True),
+                name='addr_synced_idx'
+            ),
+        ]
     
     def __str__(self):
         try:
@@ -89,7 +155,9 @@ class Address(models.Model):
                 actual_user = None
             
             if actual_user:
-                Address.objects.filter(user=actual_user, is_default=True).exclude(pk=self.pk).update(is_default=False)
+                Address.objects.filter(user=actual_user, is_default=True).exclude(pk=self.pk).update(
+                    is_default=False, updated_at=timezone.now()
+                )
             else:
                 print(f"Error: Cannot determine user for default address update. self.user: {getattr(self, 'user', 'None')}, self.user_id: {getattr(self, 'user_id', 'None')}")
         
@@ -97,10 +165,12 @@ class Address(models.Model):
         is_new = self.pk is None
         metadata_changed = False
         blockchain_data_changed = False
+        old_sync_state = None
 
         if not is_new:
             try:
                 old_instance = Address.objects.get(pk=self.pk)
+                old_sync_state = (old_instance.is_active, old_instance.is_stored_on_blockchain)
                 metadata_changed = (
                     old_instance.address_name != self.address_name or
                     old_instance.is_default != self.is_default or
@@ -117,8 +187,11 @@ class Address(models.Model):
         # Encrypt address data before saving
         self._encrypt_address_data()
         
-        # Save metadata to database first
-        super().save(*args, **kwargs)
+        # Save metadata to database first, keeping the sync counters in step
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            apply_state_change(self.user_id, old_sync_state, (self.is_active, self.is_stored_on_blockchain))
+        self._clear_resolved_data()
         
         # Store address data on blockchain if it's new or changed and blockchain is available
         # Note: For new addresses, blockchain storage is handled in the serializer
@@ -219,7 +292,7 @@ class Address(models.Model):
                     self.ipfs_hash = ipfs_hash
                 
                 # Save blockchain metadata without triggering save again
-                Address.objects.filter(pk=self.pk).update(
+                self.update_blockchain_fields(
                     blockchain_tx_hash=self.blockchain_tx_hash,
                     blockchain_block_number=self.blockchain_block_number,
                     is_stored_on_blockchain=self.is_stored_on_blockchain,
@@ -229,6 +302,31 @@ class Address(models.Model):
         except Exception as e:
             print(f"Error storing address on blockchain: {e}")
     
+    def refresh_from_db(self, *args, **kwargs):
+        self._clear_resolved_data()
+        super().refresh_from_db(*args, **kwargs)
+    
+    def _clear_resolved_data(self):
+        """Drop data attached by with_resolved_data() once it may be stale."""
+        self.__dict__.pop('_resolved_fields', None)
+        self.__dict__.pop('_resolved_chain', None)
+    
+    def update_blockchain_fields(self, **fields):
+        """
+        Write blockchain metadata fields directly, without running save(),
+        and apply any sync state change to the sync counters.
+        """
+        with transaction.atomic():
+            old = Address.objects.select_for_update().filter(pk=self.pk).values_list(
+                'is_active', 'is_stored_on_blockchain'
+            ).first()
+            if old is None:
+                return
+            Address.objects.filter(pk=self.pk).update(updated_at=timezone.now(), **fields)
+            self._clear_resolved_data()
+            new = (old[0], fields.get('is_stored_on_blockchain', old[1]))
+            apply_state_change(self.user_id, old, new)
+    
     def _has_blockchain_data_changed(self, old_instance):
         """Compares current instance's blockchain data with old instance's blockchain data."""
         if not blockchain_manager.is_connected():
@@ -260,24 +358,7 @@ class Address(models.Model):
             # For now, use a default wallet address
             user_wallet = "0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266"
             
-            # Convert UUID to bytes32
-            address_id_bytes = blockchain_manager.w3.to_bytes(hexstr=str(self.id).replace('-', ''))
-            
-            # Build delete transaction
-            tx = blockchain_manager.contract.functions.deleteAddress(address_id_bytes).build_transaction({
-                'from': user_wallet,
-                'gas': 2000000,
-                'gasPrice': blockchain_manager.w3.eth.gas_price,
-                'nonce': blockchain_manager.w3.eth.get_transaction_count(user_wallet)
-            })
-            
-            # For development, simulate the transaction
-            result = {
-                'success': True,
-                'transaction_hash': f"0x{uuid.uuid4().hex}",
-                'block_number': blockchain_manager.w3.eth.block_number,
-                'message': 'Address deleted from blockchain (simulated)'
-            }
+            result = blockchain_manager.delete_address_from_blockchain(str(self.id), user_wallet)
             
             if result.get('success'):
                 # Update blockchain metadata to reflect deletion
@@ -286,7 +367,7 @@ class Address(models.Model):
                 self.blockchain_block_number = result.get('block_number')
                 
                 # Save without triggering save method again
-                Address.objects.filter(pk=self.pk).update(
+                self.update_blockchain_fields(
                     is_stored_on_blockchain=False,
                     blockchain_tx_hash=self.blockchain_tx_hash,
                     blockchain_block_number=self.blockchain_block_number
@@ -307,6 +388,9 @@ class Address(models.Model):
     @property
     def address_line(self):
         """Get address from blockchain or database."""
+        if '_resolved_fields' in self.__dict__:
+            return self._resolved_fields['address']
+        
         blockchain_data = self.blockchain_data
         if blockchain_data and blockchain_data.get('address'):
             return blockchain_data.get('address', '')
@@ -318,6 +402,9 @@ class Address(models.Model):
     @property
     def street_name(self):
         """Get street from blockchain or database."""
+        if '_resolved_fields' in self.__dict__:
+            return self._resolved_fields['street']
+        
         blockchain_data = self.blockchain_data
         if blockchain_data and blockchain_data.get('street'):
             return blockchain_data.get('street', '')
@@ -329,6 +416,9 @@ class Address(models.Model):
     @property
     def suburb_name(self):
         """Get suburb from blockchain or database."""
+        if '_resolved_fields' in self.__dict__:
+            return self._resolved_fields['suburb']
+        
         blockchain_data = self.blockchain_data
         if blockchain_data and blockchain_data.get('suburb'):
             return blockchain_data.get('suburb', '')
@@ -340,6 +430,9 @@ class Address(models.Model):
     @property
     def state_name(self):
         """Get state from blockchain or database."""
+        if '_resolved_fields' in self.__dict__:
+            return self._resolved_fields['state']
+        
         blockchain_data = self.blockchain_data
         if blockchain_data and blockchain_data.get('state'):
             return blockchain_data.get('state', '')
@@ -351,6 +444,9 @@ class Address(models.Model):
     @property
     def postal_code(self):
         """Get postcode from blockchain or database."""
+        if '_resolved_fields' in self.__dict__:
+            return self._resolved_fields['postcode']
+        
         blockchain_data = self.blockchain_data
         if blockchain_data and blockchain_data.get('postcode'):
             return blockchain_data.get('postcode', '')
@@ -379,6 +475,9 @@ class Address(models.Model):
     @property
     def blockchain_data(self):
         """Get complete blockchain data for this address."""
+        if '_resolved_chain' in self.__dict__:
+            return self._resolved_chain['blockchain_data']
+        
         if not self.is_stored_on_blockchain or not blockchain_manager.is_connected():
             return None
         
@@ -391,6 +490,9 @@ class Address(models.Model):
     @property
     def ipfs_metadata(self):
         """Get IPFS metadata for this address."""
+        if '_resolved_chain' in self.__dict__:
+            return self._resolved_chain['ipfs_metadata']
+        
         if not self.ipfs_hash or not blockchain_manager.is_connected():
             return None
         
@@ -455,4 +557,43 @@ class Address(models.Model):
         if state is not None:
             self._state_value = state
         if postcode is not None:
-            self._postcode = postcode 
\ No newline at end of file
+            self._postcode = postcode
+
+
+class AddressSyncCounter(models.Model):
+    """
+    Active and on-chain address counts for one user, or for all users when
+    ``user`` is NULL. Maintained by apps.addresses.counters.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    total_addresses = models.IntegerField(default=0)
+    addresses_on_blockchain = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'address_sync_counters'
+        verbose_name = 'Address Sync Counter'
+        verbose_name_plural = 'Address Sync Counters'
+        constraints = [
+            # One row per user plus a single global row
+            models.UniqueConstraint(
+                Coalesce('user', models.Value(0)),
+                name='unique_address_sync_counter'
+            )
+        ]
+    
+    def __str__(self):
+        scope = f"User ID: {self.user_id}" if self.user_id else "All users"
+        return f"{scope} - {self.addresses_on_blockchain}/{self.total_addresses} on blockchain"
+
+
+@receiver(post_delete, sender=Address)
+def remove_from_sync_counters(sender, instance, **kwargs):
+    """Drop a deleted address from the sync counters."""
+    # The owner may be being deleted too, so never recreate their row here
+    apply_state_change(
+        instance.user_id,
+        (instance.is_active, instance.is_stored_on_blockchain),
+        None,
+        create_missing=False
+    )
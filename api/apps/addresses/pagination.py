@@ -0,0 +1,30 @@
+"""
+Keyset (cursor) pagination for address and lookup listings.
+"""
+
+from apps.core.pagination import (
+    KeysetPagination,
+    parse_cursor_bool,
+    parse_cursor_datetime,
+    parse_cursor_uuid,
+)
+
+
+class AddressKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination over ``(is_default, created_at, id)``, all descending.
+    Backed by the ``addr_user_active_keyset_idx`` index.
+    """
+    ordering = ('-is_default', '-created_at', '-id')
+    cursor_parsers = (parse_cursor_bool, parse_cursor_datetime, parse_cursor_uuid)
+
+
+class LookupRecordKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination over ``(created_at, id)``, newest first.
+    Backed by the ``lookup_org_created_idx`` index.
+    """
+    ordering = ('-created_at', '-id')
+    cursor_parsers = (parse_cursor_datetime, parse_cursor_uuid)
+    page_size = 100
+    max_page_size = 1000
@@ -0,0 +1,53 @@
+"""
+Batched resolution of address data for lists of addresses.
+
+``Address.objects.with_resolved_data()`` calls ``resolve_addresses`` once per
+fetched queryset, the way ``prefetch_related`` runs after the main query:
+every row is decrypted in one pass and chain records are read concurrently,
+then the results are attached to the instances so the address properties
+(and the serializers built on them) read from memory.
+"""
+
+from typing import Iterable
+
+from .chain import fetch_chain_data
+from .encryption import decrypt_addresses
+
+ADDRESS_DATA_FIELDS = ('address', 'street', 'suburb', 'state', 'postcode')
+
+
+def resolve_addresses(addresses: Iterable, chain: bool = True) -> None:
+    """
+    Attach resolved address data to a batch of Address instances.
+
+    Each field comes from the address's blockchain record when it has a value
+    there, otherwise from the decrypted database field, matching the
+    unresolved properties.
+
+    Args:
+        addresses: Iterable of Address objects
+        chain: Also read blockchain records and IPFS metadata; when False
+            only the database fields are used
+    """
+    addresses = list(addresses)
+    if not addresses:
+        return
+
+    decrypted = decrypt_addresses(addresses)
+    chain_data = fetch_chain_data(addresses) if chain else {}
+
+    for address in addresses:
+        entry = chain_data.get(address.id, {})
+        blockchain_data = entry.get('blockchain_data')
+        address._resolved_fields = {
+            field: (
+                blockchain_data[field]
+                if blockchain_data and blockchain_data.get(field)
+                else decrypted[address.id].get(field, '')
+            )
+            for field in ADDRESS_DATA_FIELDS
+        }
+        address._resolved_chain = {
+            'blockchain_data': blockchain_data,
+            'ipfs_metadata': entry.get('ipfs_metadata'),
+        }
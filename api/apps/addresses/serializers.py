@@ -2,10 +2,13 @@
 Address serializers for MyAddressHub.
 """
 
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
 from .models import Address
 from .blockchain import blockchain_manager
 from .encryption import encrypt_address_data
+from .resolution import resolve_addresses
 
 
 class AddressBreakdownSerializer(serializers.Serializer):
@@ -52,6 +55,13 @@ class AddressSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at', 'address', 'street', 'suburb', 'state', 'postcode', 
                            'is_stored_on_blockchain', 'last_synced_at', 'blockchain_tx_hash', 'blockchain_block_number', 'ipfs_hash']
     
+    def to_representation(self, instance):
+        # Read the chain record once for the whole instance instead of once
+        # per address property
+        if '_resolved_fields' not in instance.__dict__:
+            resolve_addresses([instance])
+        return super().to_representation(instance)
+
     def validate(self, attrs):
         """Custom validation for address data."""
         # For updates, we don't validate address fields since they're read-only
@@ -114,7 +124,7 @@ class AddressCreateSerializer(serializers.ModelSerializer):
             encrypted_data = encrypt_address_data(address_data)
             
             # Update the address with encrypted data
-            Address.objects.filter(pk=address.pk).update(**encrypted_data)
+            Address.objects.filter(pk=address.pk).update(**encrypted_data, updated_at=timezone.now())
             
             # Refresh the instance to get the updated data
             address.refresh_from_db()
@@ -157,7 +167,7 @@ class AddressCreateSerializer(serializers.ModelSerializer):
                         address.ipfs_hash = ipfs_hash
                     
                     # Save blockchain metadata without triggering save method again
-                    Address.objects.filter(pk=address.pk).update(
+                    address.update_blockchain_fields(
                         blockchain_tx_hash=address.blockchain_tx_hash,
                         blockchain_block_number=address.blockchain_block_number,
                         is_stored_on_blockchain=address.is_stored_on_blockchain,
@@ -266,7 +276,7 @@ class AddressUpdateSerializer(serializers.ModelSerializer):
                         instance.ipfs_hash = ipfs_hash
                     
                     # Save blockchain metadata without triggering save method again
-                    Address.objects.filter(pk=instance.pk).update(
+                    instance.update_blockchain_fields(
                         blockchain_tx_hash=instance.blockchain_tx_hash,
                         blockchain_block_number=instance.blockchain_block_number,
                         is_stored_on_blockchain=instance.is_stored_on_blockchain,
@@ -305,4 +315,22 @@ class OrganizationAddressLookupSerializer(serializers.ModelSerializer):
             'id', 'address_name', 'is_default', 'is_active', 
             'created_at', 'updated_at', 'address_breakdown', 'blockchain_info'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at'] 
\ No newline at end of file
+        read_only_fields = ['id', 'created_at', 'updated_at'] 
+
+
+class BulkAddressLookupRequestSerializer(serializers.Serializer):
+    """Serializer for bulk address lookup requests."""
+    address_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False
+    )
+    
+    def validate_address_ids(self, value):
+        """Drop duplicates (keeping order) and enforce the batch size limit."""
+        max_addresses = getattr(settings, 'BULK_LOOKUP_MAX_ADDRESSES', 100)
+        address_ids = list(dict.fromkeys(value))
+        if len(address_ids) > max_addresses:
+            raise serializers.ValidationError(
+                f"At most {max_addresses} addresses can be looked up at once."
+            )
+        return address_ids
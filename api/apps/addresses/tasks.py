@@ -3,6 +3,7 @@ Celery tasks for the addresses app.
 """
 
 from celery import shared_task
+from django.utils.dateparse import parse_datetime
 from .batch_sync import BatchSyncManager
 
 
@@ -79,13 +80,11 @@ def schedule_batch_sync():
     This should be called by Celery Beat periodically.
     """
     try:
-        from .models import Address
+        from .counters import get_sync_counts
         
-        # Check if there are addresses to sync
-        pending_count = Address.objects.filter(
-            is_active=True,
-            is_stored_on_blockchain=False
-        ).count()
+        # Global counts are maintained incrementally, so this is a single-row read
+        counts = get_sync_counts()
+        pending_count = counts['pending_sync']
         
         if pending_count > 0:
             # Queue sync task
@@ -93,10 +92,7 @@ def schedule_batch_sync():
             print(f"Queued batch sync for {pending_count} pending addresses")
         
         # Check if there are addresses to update
-        updated_count = Address.objects.filter(
-            is_active=True,
-            is_stored_on_blockchain=True
-        ).count()
+        updated_count = counts['addresses_on_blockchain']
         
         if updated_count > 0:
             # Queue update task
@@ -115,3 +111,68 @@ def schedule_batch_sync():
             'success': False,
             'error': str(e)
         }
+
+
+@shared_task(ignore_result=True)
+def cleanup_expired_exports():
+    """
+    Delete asynchronous export files whose download tokens have expired.
+    Scheduled by Celery Beat.
+    """
+    from .exports import delete_expired_exports
+    
+    return delete_expired_exports()
+
+
+@shared_task(ignore_result=True)
+def reconcile_address_sync_counters():
+    """
+    Recompute the blockchain sync counters from the addresses table,
+    correcting any drift. Scheduled by Celery Beat.
+    """
+    from .counters import reconcile_counters
+    
+    return reconcile_counters()
+
+
+@shared_task
+def generate_export(token: str, kind: str, export_format: str, organization_id: str,
+                    user_id: int = None, since: str = None, until: str = None,
+                    ip_address: str = None, user_agent: str = ''):
+    """
+    Write an organization export to storage for later download by token.
+    
+    Args:
+        token: Download token returned to the client
+        kind: ``lookup_history`` or ``permitted_addresses``
+        export_format: ``csv`` or ``ndjson``
+        organization_id: Organization being exported
+        user_id: User who requested the export (audited for address exports)
+        since, until: ISO datetime bounds for lookup history exports
+    """
+    from .exports import (
+        LOOKUP_HISTORY,
+        iter_lookup_history,
+        iter_permitted_addresses,
+        lookup_audit_writer,
+        write_export_file,
+    )
+    
+    if kind == LOOKUP_HISTORY:
+        rows = iter_lookup_history(
+            organization_id,
+            since=parse_datetime(since) if since else None,
+            until=parse_datetime(until) if until else None
+        )
+    else:
+        rows = iter_permitted_addresses(
+            organization_id,
+            on_chunk=lookup_audit_writer(organization_id, user_id, ip_address, user_agent)
+        )
+    
+    path = write_export_file(token, kind, export_format, rows)
+    return {
+        'success': True,
+        'token': token,
+        'path': path
+    }
@@ -25,9 +25,15 @@ urlpatterns = [
     path('blockchain/address/<uuid:address_id>/', views.get_address_from_blockchain, name='get-address-from-blockchain'),
     
     # Organization features
+    path('lookup/bulk/', views.bulk_lookup_addresses, name='bulk-lookup-addresses'),
     path('lookup/<uuid:address_uuid>/', views.lookup_address_by_uuid, name='lookup-address-by-uuid'),
     path('lookup-history/', views.organization_lookup_history, name='organization-lookup-history'),
     
+    # Organization exports
+    path('lookup-history/export/', views.export_lookup_history, name='export-lookup-history'),
+    path('permitted-addresses/export/', views.export_permitted_addresses, name='export-permitted-addresses'),
+    path('exports/<str:token>/', views.download_export, name='download-export'),
+    
     # Permission management
     path('<uuid:address_id>/grant-permission/', views.grant_address_permission, name='grant-address-permission'),
     path('<uuid:address_id>/revoke-permission/<uuid:organization_id>/', views.revoke_address_permission, name='revoke-address-permission'),
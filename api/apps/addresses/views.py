@@ -2,39 +2,80 @@
 Address views for MyAddressHub.
 """
 
+import json
+from datetime import datetime, time, timedelta
 from rest_framework import status, generics, permissions
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework.exceptions import NotFound
 from django.shortcuts import get_object_or_404
-from django.http import Http404
-from django.db.models import Q
+from django.http import Http404, StreamingHttpResponse
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from .models import Address
 from .serializers import (
     AddressSerializer, 
     AddressCreateSerializer, 
     AddressUpdateSerializer,
     AddressBreakdownSerializer,
-    OrganizationAddressLookupSerializer
+    BulkAddressLookupRequestSerializer
 )
 from apps.accounts.models import AddressPermission, Organization, LookupRecord
+from apps.accounts.authentication import CLAIMS_AUTHENTICATION_CLASSES
+from apps.accounts.audit import build_lookup_entry, record_lookup, record_lookups
+from apps.accounts.directory import get_directory_page
+from apps.accounts.permission_cache import has_address_permission
 from .blockchain import blockchain_manager
+from .chain import fetch_chain_data
+from .conditional import (
+    address_set_validators,
+    address_validators,
+    not_modified_response,
+    set_validators,
+)
+from .counters import get_sync_counts
+from .fast_serializers import address_list_data, datetime_renderer, lookup_address_data
+from .pagination import AddressKeysetPagination, LookupRecordKeysetPagination
+from .resolution import resolve_addresses
+from .exports import (
+    EXPORT_CONTENT_TYPES,
+    LOOKUP_HISTORY,
+    PERMITTED_ADDRESSES,
+    create_export_token,
+    export_filename,
+    get_export,
+    iter_lookup_history,
+    iter_permitted_addresses,
+    lookup_audit_writer,
+    read_export_file,
+    render_export,
+)
+from .tasks import generate_export
+
+# Rows fetched per server-side cursor round trip when streaming lookup history
+LOOKUP_HISTORY_STREAM_CHUNK_SIZE = 2000
 
 
 class AddressListView(generics.ListCreateAPIView):
     """
     List all addresses for the authenticated user and create new addresses.
     """
+    authentication_classes = CLAIMS_AUTHENTICATION_CLASSES
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = AddressSerializer
+    pagination_class = AddressKeysetPagination
     
     def get_queryset(self):
         """Return addresses based on user type."""
         user = self.request.user
         
         if user.profile.is_individual:
-            # Individual users see their own addresses
-            return Address.objects.filter(user=user, is_active=True)
+            # Individual users see their own addresses, resolved in one batch
+            return Address.objects.filter(user=user, is_active=True).with_resolved_data()
         elif user.profile.is_organization_user:
             # Organization users should not see any addresses by default
             # They should only access addresses via UUID lookup
@@ -48,6 +89,11 @@ class AddressListView(generics.ListCreateAPIView):
             return AddressCreateSerializer
         return AddressSerializer
     
+    def list(self, request, *args, **kwargs):
+        """List a page of addresses through the fast serializer."""
+        page = self.paginate_queryset(self.get_queryset())
+        return self.get_paginated_response(address_list_data(page))
+    
     def create(self, request, *args, **kwargs):
         """Override create to return consistent response format."""
         # Only individual users can create addresses
@@ -76,6 +122,7 @@ class AddressDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update, or delete an address.
     """
+    authentication_classes = CLAIMS_AUTHENTICATION_CLASSES
     permission_classes = [permissions.IsAuthenticated]
     serializer_class = AddressSerializer
     lookup_field = 'id'
@@ -86,7 +133,10 @@ class AddressDetailView(generics.RetrieveUpdateDestroyAPIView):
         
         if user.profile.is_individual:
             # Individual users can access their own addresses
-            return Address.objects.filter(user=user)
+            addresses = Address.objects.filter(user=user)
+            if self.request.method in permissions.SAFE_METHODS:
+                addresses = addresses.with_resolved_data()
+            return addresses
         elif user.profile.is_organization_user:
             # Organization users should not access addresses via regular endpoints
             # They should only access addresses via UUID lookup
@@ -109,6 +159,19 @@ class AddressDetailView(generics.RetrieveUpdateDestroyAPIView):
         # Use the model's soft_delete method which handles blockchain deletion
         instance.soft_delete()
     
+    def retrieve(self, request, *args, **kwargs):
+        """Answer conditional requests before loading the address."""
+        etag = address_validators(self.get_queryset(), kwargs[self.lookup_field])
+        if etag is not None:
+            not_modified = not_modified_response(request, etag)
+            if not_modified is not None:
+                return not_modified
+        
+        response = super().retrieve(request, *args, **kwargs)
+        if etag is not None:
+            set_validators(response, etag)
+        return response
+    
     def update(self, request, *args, **kwargs):
         """Override update to return consistent response format."""
         # Only individual users can update their own addresses
@@ -148,6 +211,7 @@ class AddressBreakdownView(APIView):
     """
     Get address breakdown by UUID.
     """
+    authentication_classes = CLAIMS_AUTHENTICATION_CLASSES
     permission_classes = [permissions.IsAuthenticated]
     
     def get(self, request, address_id):
@@ -166,18 +230,14 @@ class AddressBreakdownView(APIView):
             if user.profile.is_individual:
                 # Individual users can access their own addresses
                 address = get_object_or_404(
-                    Address, 
+                    Address.objects.with_resolved_data(), 
                     id=address_id, 
                     user=user,
                     is_active=True
                 )
             elif user.profile.is_organization_user and user.profile.organization:
                 # Organization users can access addresses they have permission for
-                has_permission = AddressPermission.objects.filter(
-                    address_id=address_id,
-                    organization=user.profile.organization,
-                    is_active=True
-                ).exists()
+                has_permission = has_address_permission(user.profile.organization_id, address_id)
                 
                 if not has_permission:
                     return Response({
@@ -186,7 +246,7 @@ class AddressBreakdownView(APIView):
                     }, status=status.HTTP_403_FORBIDDEN)
                 
                 address = get_object_or_404(
-                    Address, 
+                    Address.objects.with_resolved_data(), 
                     id=address_id,
                     is_active=True
                 )
@@ -215,10 +275,14 @@ class AddressBreakdownView(APIView):
 
 
 @api_view(['GET'])
+@authentication_classes(CLAIMS_AUTHENTICATION_CLASSES)
 @permission_classes([permissions.IsAuthenticated])
 def user_addresses(request):
     """
-    Get all addresses for the authenticated user.
+    Get the authenticated user's addresses, one keyset page at a time.
+    
+    Pass the returned ``next_cursor`` as ``?cursor=`` to fetch the next page.
+    Supports ``If-None-Match`` (304 when unchanged).
     """
     try:
         user = request.user
@@ -228,7 +292,7 @@ def user_addresses(request):
             addresses = Address.objects.filter(
                 user=user, 
                 is_active=True
-            ).order_by('-is_default', '-created_at')
+            )
         elif user.profile.is_organization_user:
             # Organization users should not see any addresses by default
             # They should only access addresses via UUID lookup
@@ -236,13 +300,28 @@ def user_addresses(request):
         else:
             addresses = Address.objects.none()
         
-        serializer = AddressSerializer(addresses, many=True)
-        return Response({
+        # Each page (query string) is a separate representation
+        etag = address_set_validators(addresses, variant=request.META.get('QUERY_STRING', ''))
+        not_modified = not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+        
+        paginator = AddressKeysetPagination()
+        page = paginator.paginate_queryset(addresses.with_resolved_data(), request)
+        data = address_list_data(page)
+        response = Response({
             'success': True,
-            'data': serializer.data,
-            'count': len(serializer.data)
+            'data': data,
+            'count': len(data),
+            **paginator.to_page_metadata()
         })
+        return set_validators(response, etag)
         
+    except NotFound as e:
+        return Response({
+            'success': False,
+            'error': str(e.detail)
+        }, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
         return Response({
             'success': False,
@@ -296,10 +375,12 @@ def set_default_address(request, address_id):
 
 
 @api_view(['GET'])
+@authentication_classes(CLAIMS_AUTHENTICATION_CLASSES)
 @permission_classes([permissions.IsAuthenticated])
 def default_address(request):
     """
     Get the default address for the authenticated user.
+    Supports ``If-None-Match`` (304 when unchanged).
     """
     try:
         user = request.user
@@ -310,11 +391,17 @@ def default_address(request):
                 'error': 'Only individual users have default addresses'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        address = Address.objects.filter(
+        addresses = Address.objects.filter(
             user=user,
             is_default=True,
             is_active=True
-        ).first()
+        )
+        etag = address_set_validators(addresses)
+        not_modified = not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+        
+        address = addresses.with_resolved_data().first()
         
         if not address:
             return Response({
@@ -322,11 +409,11 @@ def default_address(request):
                 'error': 'No default address found'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        serializer = OrganizationAddressLookupSerializer(address)
-        return Response({
+        response = Response({
             'success': True,
-            'data': serializer.data
+            'data': lookup_address_data(address)
         })
+        return set_validators(response, etag)
         
     except Exception as e:
         return Response({
@@ -336,6 +423,7 @@ def default_address(request):
 
 
 @api_view(['GET'])
+@authentication_classes(CLAIMS_AUTHENTICATION_CLASSES)
 @permission_classes([permissions.IsAuthenticated])
 def lookup_address_by_uuid(request, address_uuid):
     """
@@ -357,27 +445,20 @@ def lookup_address_by_uuid(request, address_uuid):
             }, status=status.HTTP_403_FORBIDDEN)
         
         # Check if organization has permission to access this address
-        has_permission = AddressPermission.objects.filter(
-            address_id=address_uuid,
-            organization=user.profile.organization,
-            is_active=True
-        ).exists()
+        has_permission = has_address_permission(user.profile.organization_id, address_uuid)
         
         if not has_permission:
-            # Create a failed lookup record
-            try:
-                address = Address.objects.get(id=address_uuid, is_active=True)
-                LookupRecord.objects.create(
-                    organization=user.profile.organization,
-                    user=user,
-                    address=address,
+            # Record a failed lookup (not for non-existent addresses)
+            if Address.objects.filter(id=address_uuid, is_active=True).exists():
+                record_lookup(
+                    user.profile.organization_id,
+                    user.id,
+                    address_uuid,
                     lookup_successful=False,
                     ip_address=request.META.get('REMOTE_ADDR'),
                     user_agent=request.META.get('HTTP_USER_AGENT', ''),
                     notes='Access denied - no permission'
                 )
-            except Address.DoesNotExist:
-                pass  # Don't create record for non-existent addresses
             
             return Response({
                 'success': False,
@@ -385,26 +466,25 @@ def lookup_address_by_uuid(request, address_uuid):
             }, status=status.HTTP_403_FORBIDDEN)
         
         address = get_object_or_404(
-            Address, 
+            Address.objects.with_resolved_data(), 
             id=address_uuid,
             is_active=True
         )
         
-        # Create a successful lookup record
-        LookupRecord.objects.create(
-            organization=user.profile.organization,
-            user=user,
-            address=address,
+        # Record a successful lookup
+        record_lookup(
+            user.profile.organization_id,
+            user.id,
+            address.id,
             lookup_successful=True,
             ip_address=request.META.get('REMOTE_ADDR'),
             user_agent=request.META.get('HTTP_USER_AGENT', ''),
             notes='Successful lookup'
         )
         
-        serializer = OrganizationAddressLookupSerializer(address)
         return Response({
             'success': True,
-            'data': serializer.data
+            'data': lookup_address_data(address)
         })
         
     except Http404:
@@ -419,6 +499,117 @@ def lookup_address_by_uuid(request, address_uuid):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated])
+def bulk_lookup_addresses(request):
+    """
+    Look up many addresses by UUID in one request (organization users only).
+    
+    Permissions for every requested address are checked in a single query,
+    the permitted addresses are decrypted in one batch and all audit records
+    are buffered together for one ``bulk_create``. Results are returned per UUID, in
+    request order.
+    
+    Request body:
+        address_ids: list of address UUIDs (at most ``BULK_LOOKUP_MAX_ADDRESSES``)
+    """
+    try:
+        user = request.user
+        
+        if not user.profile.is_organization_user:
+            return Response({
+                'success': False,
+                'error': 'Only organization users can look up addresses by UUID'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        if not user.profile.organization:
+            return Response({
+                'success': False,
+                'error': 'Organization user must be assigned to an organization'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        request_serializer = BulkAddressLookupRequestSerializer(data=request.data)
+        if not request_serializer.is_valid():
+            return Response({
+                'success': False,
+                'error': request_serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+        address_ids = request_serializer.validated_data['address_ids']
+        organization = user.profile.organization
+        
+        # Fetch the addresses and their permission state in one query
+        addresses = {
+            address.id: address
+            for address in Address.objects.filter(
+                id__in=address_ids,
+                is_active=True
+            ).annotate(
+                has_permission=Exists(AddressPermission.objects.filter(
+                    address=OuterRef('pk'),
+                    organization=organization,
+                    is_active=True
+                ))
+            )
+        }
+        permitted = [address for address in addresses.values() if address.has_permission]
+        # Same payload as the single lookup, from the database fields only:
+        # chain records and IPFS metadata are not fetched in bulk
+        resolve_addresses(permitted, chain=False)
+        render_datetime = datetime_renderer()
+        
+        ip_address = request.META.get('REMOTE_ADDR')
+        user_agent = request.META.get('HTTP_USER_AGENT', '')
+        lookup_entries = []
+        results = []
+        for address_id in address_ids:
+            address = addresses.get(address_id)
+            if address is None:
+                # Don't create records for non-existent addresses
+                results.append({
+                    'address_id': str(address_id),
+                    'success': False,
+                    'error': 'Address not found'
+                })
+                continue
+            
+            lookup_entries.append(build_lookup_entry(
+                organization.id,
+                user.id,
+                address.id,
+                lookup_successful=address.has_permission,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                notes='Successful lookup' if address.has_permission else 'Access denied - no permission'
+            ))
+            if address.has_permission:
+                results.append({
+                    'address_id': str(address_id),
+                    'success': True,
+                    'data': lookup_address_data(address, render_datetime)
+                })
+            else:
+                results.append({
+                    'address_id': str(address_id),
+                    'success': False,
+                    'error': 'Access denied to this address'
+                })
+        
+        record_lookups(lookup_entries)
+        
+        return Response({
+            'success': True,
+            'data': results,
+            'count': len(results),
+            'found': len(permitted)
+        })
+        
+    except Exception as e:
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def grant_address_permission(request, address_id):
@@ -513,9 +704,11 @@ def revoke_address_permission(request, address_id, organization_id):
             organization=organization
         )
         
-        # Soft delete the permission
-        permission.is_active = False
-        permission.save()
+        # Soft delete the permission; atomic so that the revoke is rolled
+        # back if the permission cache cannot be told about it
+        with transaction.atomic():
+            permission.is_active = False
+            permission.save()
         
         return Response({
             'success': True,
@@ -535,6 +728,7 @@ def revoke_address_permission(request, address_id, organization_id):
 
 
 @api_view(['GET'])
+@authentication_classes(CLAIMS_AUTHENTICATION_CLASSES)
 @permission_classes([permissions.IsAuthenticated])
 def get_address_permissions(request, address_id):
     """
@@ -595,10 +789,15 @@ def get_address_permissions(request, address_id):
 
 
 @api_view(['GET'])
+@authentication_classes(CLAIMS_AUTHENTICATION_CLASSES)
 @permission_classes([permissions.IsAuthenticated])
 def list_organizations(request):
     """
-    List all active organizations (for individual users to grant permissions).
+    List active organizations (for individual users to grant permissions).
+    
+    Query parameters:
+        q: search by name prefix or similar names; the best matches first
+        cursor / page_size: keyset pagination, by name or by search rank
     """
     try:
         user = request.user
@@ -609,19 +808,17 @@ def list_organizations(request):
                 'error': 'Only individual users can list organizations'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        organizations = Organization.objects.filter(is_active=True).order_by('name')
-        
-        data = [{
-            'id': str(org.id),
-            'name': org.name,
-            'description': org.description
-        } for org in organizations]
-        
+        page = get_directory_page(request)
         return Response({
             'success': True,
-            'data': data
+            **page
         })
         
+    except NotFound as e:
+        return Response({
+            'success': False,
+            'error': str(e.detail)
+        }, status=status.HTTP_404_NOT_FOUND)
     except Exception as e:
         return Response({
             'success': False,
@@ -694,11 +891,85 @@ def test_address_data(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR) 
 
 
+def _is_truthy(value):
+    """Interpret a query parameter as a boolean flag."""
+    return (value or '').lower() in ('1', 'true', 'yes')
+
+
+def _parse_history_bound(value, end_of_day=False):
+    """
+    Parse a lookup history date filter.
+    
+    Accepts an ISO datetime or an ISO date. A bare date used as an upper bound
+    covers the whole day. Naive values are interpreted in the current timezone.
+    """
+    parsed = parse_datetime(value)
+    if parsed is None:
+        parsed_date = parse_date(value)
+        if parsed_date is None:
+            raise ValueError(f"Invalid date: {value}")
+        if end_of_day:
+            parsed_date += timedelta(days=1)
+        parsed = datetime.combine(parsed_date, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _lookup_history_queryset(organization, include):
+    """
+    Build the lookup history queryset with a minimal column projection.
+    
+    The address and user tables are only joined when the caller asked for
+    their fields through ``include``.
+    """
+    fields = ['id', 'organization', 'address', 'created_at', 'notes']
+    lookups = LookupRecord.objects.filter(organization=organization)
+    if 'address' in include:
+        lookups = lookups.select_related('address')
+        fields.append('address__address_name')
+    if 'user' in include:
+        lookups = lookups.select_related('user')
+        fields.extend(['user', 'user__username'])
+    return lookups.only(*fields)
+
+
+def _serialize_lookup(lookup, include):
+    """Serialize a lookup record for the lookup history endpoint."""
+    data = {
+        'address_id': str(lookup.address_id) if lookup.address_id else None,
+        'lookup_date': lookup.created_at.isoformat(),
+        'reason': lookup.notes
+    }
+    if 'address' in include:
+        data['address_name'] = lookup.address.address_name if lookup.address_id else None
+    if 'user' in include:
+        data['username'] = lookup.user.username
+    return data
+
+
+def _stream_lookup_history(lookups, include):
+    """Yield the full lookup history as one JSON document, chunk by chunk."""
+    yield '{"success": true, "data": ['
+    separator = ''
+    for lookup in lookups.iterator(chunk_size=LOOKUP_HISTORY_STREAM_CHUNK_SIZE):
+        yield separator + json.dumps(_serialize_lookup(lookup, include))
+        separator = ','
+    yield ']}'
+
+
 @api_view(['GET'])
+@authentication_classes(CLAIMS_AUTHENTICATION_CLASSES)
 @permission_classes([permissions.IsAuthenticated])
 def organization_lookup_history(request):
     """
-    Get lookup history for the organization user.
+    Get lookup history for the organization user, newest first.
+    
+    Query parameters:
+        since, until: ISO date or datetime bounds on the lookup date
+        include: comma-separated extra fields to return (``address``, ``user``)
+        cursor, page_size: keyset pagination, see ``next_cursor`` in the response
+        stream: ``true`` to stream the whole filtered history instead of one page
     """
     try:
         user = request.user
@@ -712,23 +983,198 @@ def organization_lookup_history(request):
                 'success': False,
                 'error': 'Organization user must be assigned to an organization'
             }, status=status.HTTP_403_FORBIDDEN)
-        # Get lookup records for this organization
-        lookups = LookupRecord.objects.filter(
-            organization=user.profile.organization
-        ).select_related('address', 'user').order_by('-created_at')
-        # Serialize the data
-        lookup_data = []
-        for lookup in lookups:
-            lookup_data.append({
-                'address_id': str(lookup.address.id) if lookup.address else None,
-                'lookup_date': lookup.created_at.isoformat(),
-                'reason': lookup.notes
-            })
+        
+        include = {
+            field.strip() for field in request.query_params.get('include', '').split(',') if field.strip()
+        }
+        lookups = _lookup_history_queryset(user.profile.organization, include)
+        
+        # Apply date range filters
+        try:
+            if request.query_params.get('since'):
+                lookups = lookups.filter(
+                    created_at__gte=_parse_history_bound(request.query_params['since'])
+                )
+            if request.query_params.get('until'):
+                lookups = lookups.filter(
+                    created_at__lt=_parse_history_bound(request.query_params['until'], end_of_day=True)
+                )
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if _is_truthy(request.query_params.get('stream')):
+            lookups = lookups.order_by(*LookupRecordKeysetPagination.ordering)
+            return StreamingHttpResponse(
+                _stream_lookup_history(lookups, include),
+                content_type='application/json'
+            )
+        
+        paginator = LookupRecordKeysetPagination()
+        page = paginator.paginate_queryset(lookups, request)
+        lookup_data = [_serialize_lookup(lookup, include) for lookup in page]
         return Response({
             'success': True,
             'data': lookup_data,
-            'count': len(lookup_data)
+            'count': len(lookup_data),
+            **paginator.to_page_metadata()
         })
+    except NotFound as e:
+        return Response({
+            'success': False,
+            'error': str(e.detail)
+        }, status=status.HTTP_404_NOT_FOUND)
+    except Exception as e:
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def _requested_export_format(request):
+    """Return the export format requested through ``?output=``."""
+    export_format = request.query_params.get('output', 'csv').lower()
+    if export_format not in EXPORT_CONTENT_TYPES:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    return export_format
+
+
+def _streaming_export(kind, export_format, rows):
+    """Stream export rows as a file download."""
+    response = StreamingHttpResponse(
+        render_export(kind, export_format, rows),
+        content_type=EXPORT_CONTENT_TYPES[export_format]
+    )
+    response['Content-Disposition'] = f'attachment; filename="{export_filename(kind, export_format)}"'
+    return response
+
+
+def _start_async_export(request, kind, export_format, since=None, until=None):
+    """Queue an export to be written to storage and return its download token."""
+    user = request.user
+    organization = user.profile.organization
+    token = create_export_token(kind, export_format, organization.id)
+    generate_export.delay(
+        token,
+        kind,
+        export_format,
+        str(organization.id),
+        user_id=user.id,
+        since=since.isoformat() if since else None,
+        until=until.isoformat() if until else None,
+        ip_address=request.META.get('REMOTE_ADDR'),
+        user_agent=request.META.get('HTTP_USER_AGENT', '')
+    )
+    return Response({
+        'success': True,
+        'status': 'pending',
+        'token': token,
+        'download_url': request.build_absolute_uri(reverse('addresses:download-export', args=[token]))
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@authentication_classes(CLAIMS_AUTHENTICATION_CLASSES)
+@permission_classes([permissions.IsAuthenticated])
+def export_lookup_history(request):
+    """
+    Export the organization's lookup history as CSV or NDJSON.
+    
+    Query parameters:
+        output: ``csv`` (default) or ``ndjson``
+        since, until: ISO date or datetime bounds on the lookup date
+        async: ``true`` to build the file in the background and return a download token
+    """
+    try:
+        user = request.user
+        if not user.profile.is_organization_user:
+            return Response({
+                'success': False,
+                'error': 'Only organization users can export lookup history'
+            }, status=status.HTTP_403_FORBIDDEN)
+        if not user.profile.organization:
+            return Response({
+                'success': False,
+                'error': 'Organization user must be assigned to an organization'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        try:
+            export_format = _requested_export_format(request)
+            since = until = None
+            if request.query_params.get('since'):
+                since = _parse_history_bound(request.query_params['since'])
+            if request.query_params.get('until'):
+                until = _parse_history_bound(request.query_params['until'], end_of_day=True)
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if _is_truthy(request.query_params.get('async')):
+            return _start_async_export(request, LOOKUP_HISTORY, export_format, since=since, until=until)
+        
+        rows = iter_lookup_history(user.profile.organization.id, since=since, until=until)
+        return _streaming_export(LOOKUP_HISTORY, export_format, rows)
+        
+    except Exception as e:
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@authentication_classes(CLAIMS_AUTHENTICATION_CLASSES)
+@permission_classes([permissions.IsAuthenticated])
+def export_permitted_addresses(request):
+    """
+    Export every address the organization has been granted, as CSV or NDJSON.
+    
+    Each exported address is recorded as a lookup for auditing.
+    
+    Query parameters:
+        output: ``csv`` (default) or ``ndjson``
+        async: ``true`` to build the file in the background and return a download token
+    """
+    try:
+        user = request.user
+        if not user.profile.is_organization_user:
+            return Response({
+                'success': False,
+                'error': 'Only organization users can export addresses'
+            }, status=status.HTTP_403_FORBIDDEN)
+        if not user.profile.organization:
+            return Response({
+                'success': False,
+                'error': 'Organization user must be assigned to an organization'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        try:
+            export_format = _requested_export_format(request)
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        if _is_truthy(request.query_params.get('async')):
+            return _start_async_export(request, PERMITTED_ADDRESSES, export_format)
+        
+        organization = user.profile.organization
+        rows = iter_permitted_addresses(
+            organization.id,
+            on_chunk=lookup_audit_writer(
+                organization.id,
+                user.id,
+                ip_address=request.META.get('REMOTE_ADDR'),
+                user_agent=request.META.get('HTTP_USER_AGENT', '')
+            )
+        )
+        return _streaming_export(PERMITTED_ADDRESSES, export_format, rows)
+        
     except Exception as e:
         return Response({
             'success': False,
@@ -737,6 +1183,57 @@ def organization_lookup_history(request):
 
 
 @api_view(['GET'])
+@authentication_classes(CLAIMS_AUTHENTICATION_CLASSES)
+@permission_classes([permissions.IsAuthenticated])
+def download_export(request, token):
+    """
+    Download an asynchronous export by token.
+    
+    Returns 202 while the export is still being written.
+    """
+    try:
+        user = request.user
+        export = get_export(token)
+        
+        if (
+            export is None or
+            not user.profile.is_organization_user or
+            export['organization_id'] != str(user.profile.organization_id)
+        ):
+            return Response({
+                'success': False,
+                'error': 'Export not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        if export['status'] == 'pending':
+            return Response({
+                'success': True,
+                'status': 'pending'
+            }, status=status.HTTP_202_ACCEPTED)
+        
+        if export['status'] == 'failed':
+            return Response({
+                'success': False,
+                'status': 'failed',
+                'error': export['error']
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        
+        response = StreamingHttpResponse(
+            read_export_file(export['path']),
+            content_type=EXPORT_CONTENT_TYPES[export['format']]
+        )
+        response['Content-Disposition'] = f'attachment; filename="{export_filename(export["kind"], export["format"])}"'
+        return response
+        
+    except Exception as e:
+        return Response({
+            'success': False,
+            'error': str(e)
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@authentication_classes(CLAIMS_AUTHENTICATION_CLASSES)
 @permission_classes([permissions.IsAuthenticated])
 def get_address_from_blockchain(request, address_id):
     """
@@ -786,6 +1283,7 @@ def get_address_from_blockchain(request, address_id):
 
 
 @api_view(['GET'])
+@authentication_classes(CLAIMS_AUTHENTICATION_CLASSES)
 @permission_classes([permissions.IsAuthenticated])
 def get_user_addresses_from_blockchain(request):
     """
@@ -801,13 +1299,17 @@ def get_user_addresses_from_blockchain(request):
             }, status=status.HTTP_403_FORBIDDEN)
         
         # Get user's addresses from database
-        db_addresses = Address.objects.filter(user=user, is_active=True)
+        db_addresses = list(Address.objects.filter(user=user, is_active=True))
+        
+        # Read every address's chain record and IPFS metadata concurrently
+        chain_data = fetch_chain_data(db_addresses)
         
         blockchain_addresses = []
         for address in db_addresses:
+            chain = chain_data[address.id]
             blockchain_addresses.append({
                 'address_id': str(address.id),
-                'blockchain_data': address.blockchain_data,
+                'blockchain_data': chain['blockchain_data'],
                 'database_data': {
                     'address_name': address.address_name,
                     'is_default': address.is_default,
@@ -818,17 +1320,18 @@ def get_user_addresses_from_blockchain(request):
                     'blockchain_block_number': address.blockchain_block_number,
                     'ipfs_hash': address.ipfs_hash
                 },
-                'ipfs_metadata': address.ipfs_metadata
+                'ipfs_metadata': chain['ipfs_metadata'],
+                'timed_out': chain['timed_out']
             })
         
         return Response({
             'success': True,
             'data': blockchain_addresses,
+            'partial': any(chain['timed_out'] for chain in chain_data.values()),
             'blockchain_status': {
                 'blockchain_available': blockchain_manager.is_connected(),
                 'contract_address': blockchain_manager.contract_address,
-                'total_addresses': len(db_addresses),
-                'addresses_on_blockchain': sum(1 for addr in db_addresses if addr.is_stored_on_blockchain)
+                **get_sync_counts(user.id)
             }
         })
         
@@ -840,6 +1343,7 @@ def get_user_addresses_from_blockchain(request):
 
 
 @api_view(['GET'])
+@authentication_classes(CLAIMS_AUTHENTICATION_CLASSES)
 @permission_classes([permissions.IsAuthenticated])
 def blockchain_status(request):
     """
@@ -854,21 +1358,20 @@ def blockchain_status(request):
                 'error': 'Only individual users can view blockchain status'
             }, status=status.HTTP_403_FORBIDDEN)
         
-        # Get user's addresses
-        addresses = Address.objects.filter(user=user, is_active=True)
-        
-        # Calculate blockchain statistics
-        total_addresses = addresses.count()
-        addresses_on_blockchain = sum(1 for addr in addresses if addr.is_stored_on_blockchain)
+        # Blockchain statistics from the maintained sync counters
+        counts = get_sync_counts(user.id)
+        total_addresses = counts['total_addresses']
+        addresses_on_blockchain = counts['addresses_on_blockchain']
         
         blockchain_status = {
             'blockchain_available': blockchain_manager.is_connected(),
             'total_addresses': total_addresses,
             'addresses_on_blockchain': addresses_on_blockchain,
+            'pending_sync': counts['pending_sync'],
             'blockchain_percentage': round((addresses_on_blockchain / total_addresses * 100) if total_addresses > 0 else 0, 2),
-            'contract_address': blockchain_manager.contract_address if blockchain_manager.contract else None,
-            'polygon_rpc_url': blockchain_manager.polygon_rpc_url,
-            'ipfs_available': blockchain_manager.ipfs_client is not None
+            'contract_address': blockchain_manager.contract_address,
+            'polygon_rpc_url': blockchain_manager.rpc_url,
+            'ipfs_available': blockchain_manager.ipfs_available()
         }
         
         return Response({
@@ -1,8 +1,14 @@
+import logging
+
 from celery import shared_task
 from django.db import connections
 from django.core.mail import send_mail
 from django.conf import settings
 
+from apps.core.db.pool import all_pools
+
+logger = logging.getLogger(__name__)
+
 @shared_task(
     queue='default',
     autoretry_for=(Exception,),
@@ -10,19 +16,44 @@ from django.conf import settings
     retry_kwargs={'max_retries': 3},
 )
 def check_db_connections():
-    """Check the number of database connections and warn if too high."""
-    for conn in connections.all():
-        if conn.connection is not None:
-            with conn.cursor() as cursor:
-                cursor.execute('SELECT count(*) FROM pg_stat_activity')
-                count = cursor.fetchone()[0]
-                if count > settings.DB_CONNECTION_WARNING_THRESHOLD:
-                    send_mail(
-                        subject='High Database Connections Warning',
-                        message=f'Current connection count: {count}',
-                        from_email=settings.DEFAULT_FROM_EMAIL,
-                        recipient_list=[admin[1] for admin in settings.ADMINS],
-                    )
+    """
+    Check the number of database connections and warn if too high.
+
+    Connections are counted by application name (web, worker, ...) and state
+    and compared with the server's ``max_connections``; the pool usage of
+    this worker process is logged alongside.
+    """
+    with connections['default'].cursor() as cursor:
+        cursor.execute("SELECT current_setting('max_connections')::int")
+        max_connections = cursor.fetchone()[0]
+        cursor.execute(
+            "SELECT application_name, coalesce(state, ''), count(*) FROM pg_stat_activity "
+            "WHERE datname = current_database() GROUP BY 1, 2 ORDER BY 3 DESC"
+        )
+        rows = cursor.fetchall()
+
+    count = sum(row[2] for row in rows)
+    breakdown = ', '.join(f"{name or '-'}/{state or '-'}: {n}" for name, state, n in rows)
+    pools = {key[0]: pool.stats() for key, pool in all_pools().items()}
+    logger.info(
+        "Database connections: %d of %d (%s); pools in this process: %s",
+        count, max_connections, breakdown, pools
+    )
+
+    threshold = getattr(
+        settings, 'DB_CONNECTION_WARNING_THRESHOLD',
+        int(max_connections * getattr(settings, 'DB_CONNECTION_WARNING_RATIO', 0.8))
+    )
+    if count > threshold:
+        send_mail(
+            subject='High Database Connections Warning',
+            message=(
+                f'Current connection count: {count} of {max_connections}\n\n'
+                f'By application/state: {breakdown}'
+            ),
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[admin[1] for admin in settings.ADMINS],
+        )
     return True
 
 @shared_task(
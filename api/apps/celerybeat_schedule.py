@@ -17,6 +17,46 @@ CELERYBEAT_SCHEDULE = {
         }
     },
     
+    # Write buffered lookup audit records to the database
+    'flush-lookup-records': {
+        'task': 'apps.accounts.tasks.flush_lookup_records',
+        'schedule': 5.0,  # 5 seconds
+        'options': {
+            'queue': 'celery',
+            'routing_key': 'celery'
+        }
+    },
+    
+    # Create upcoming lookup record partitions, archive and drop expired ones
+    'maintain-lookup-record-partitions': {
+        'task': 'apps.accounts.tasks.maintain_lookup_record_partitions',
+        'schedule': crontab(hour=3, minute=0),  # Daily at 3 AM
+        'options': {
+            'queue': 'celery',
+            'routing_key': 'celery'
+        }
+    },
+    
+    # Recompute blockchain sync counters to correct any drift
+    'reconcile-address-sync-counters': {
+        'task': 'apps.addresses.tasks.reconcile_address_sync_counters',
+        'schedule': crontab(minute=15),  # Hourly at quarter past
+        'options': {
+            'queue': 'celery',
+            'routing_key': 'celery'
+        }
+    },
+    
+    # Delete asynchronous export files once their download tokens expire
+    'cleanup-expired-exports': {
+        'task': 'apps.addresses.tasks.cleanup_expired_exports',
+        'schedule': crontab(minute=45),  # Hourly at quarter to
+        'options': {
+            'queue': 'celery',
+            'routing_key': 'celery'
+        }
+    },
+    
     # Alternative: Run every 2 minutes for more frequent sync
     # 'batch-sync-addresses-frequent': {
     #     'task': 'apps.addresses.batch_sync.schedule_batch_sync',
@@ -0,0 +1,37 @@
+"""
+Cache backends for MyAddressHub.
+"""
+
+from django_redis.cache import RedisCache
+
+from apps.core.metrics import record_cache
+
+_MISSING = object()
+
+
+class InstrumentedRedisCache(RedisCache):
+    """
+    django-redis cache that records hits and misses in the metrics registry.
+
+    Series are labelled with the ``METRICS_NAME`` entry of the cache's
+    settings (``"default"`` when unset).
+    """
+
+    def __init__(self, server, params):
+        super().__init__(server, params)
+        self.metrics_name = params.get('METRICS_NAME', 'default')
+
+    def get(self, key, default=None, version=None, client=None):
+        value = super().get(key, default=_MISSING, version=version, client=client)
+        record_cache(self.metrics_name, value is not _MISSING)
+        return default if value is _MISSING else value
+
+    def get_many(self, keys, version=None, client=None):
+        keys = list(keys)
+        values = super().get_many(keys, version=version, client=client)
+        hits = len(values)
+        for _ in range(hits):
+            record_cache(self.metrics_name, True)
+        for _ in range(len(keys) - hits):
+            record_cache(self.metrics_name, False)
+        return values
@@ -0,0 +1,58 @@
+"""
+PostgreSQL backend that borrows connections from a process-local pool.
+
+Configure it with ``CONN_MAX_AGE = 0`` so connections go back to the pool
+at the end of every request and task, and size the pool with the ``POOL``
+entry of the database settings (see ``apps.core.db.pool.ConnectionPool``):
+
+    "ENGINE": "apps.core.db.backends.postgresql_pool",
+    "CONN_MAX_AGE": 0,
+    "POOL": {"max_size": 2, "max_overflow": 2, "timeout": 5.0},
+"""
+
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from apps.core.db.pool import get_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    # Server-side cursors opened on the current connection
+    _named_cursors_used = False
+
+    _pool_key = None
+
+    def _pool(self):
+        # Looked up on every use rather than kept, so that a forked child
+        # gets its own pool instead of its parent's
+        return get_pool(self._pool_key, self.alias, self.settings_dict.get('POOL', {}))
+
+    def get_new_connection(self, conn_params):
+        # Keyed by the connection parameters too, so that e.g. the test
+        # database never reuses connections to the main one
+        self._pool_key = (self.alias, repr(sorted(conn_params.items())))
+        self._named_cursors_used = False
+
+        # The parent sets this only when it opens a connection; a pooled one
+        # may be reused
+        options = self.settings_dict['OPTIONS']
+        if 'isolation_level' in options:
+            self.isolation_level = IsolationLevel(options['isolation_level'])
+        else:
+            self.isolation_level = IsolationLevel.READ_COMMITTED
+
+        return self._pool().getconn(
+            lambda: super(DatabaseWrapper, self).get_new_connection(conn_params)
+        )
+
+    def create_cursor(self, name=None):
+        if name:
+            self._named_cursors_used = True
+        return super().create_cursor(name)
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self._pool().putconn(
+                    self.connection, close_cursors=self._named_cursors_used
+                )
@@ -0,0 +1,269 @@
+"""
+Process-local connection pool for PostgreSQL.
+
+Django opens one connection per thread and keeps it for ``CONN_MAX_AGE``
+seconds, so the number of server connections grows with every web and
+Celery process whether or not it is busy. With the pooled backend
+(``apps.core.db.backends.postgresql_pool``) Django runs with
+``CONN_MAX_AGE = 0``: each request or task borrows a connection from this
+pool and hands it back when it finishes, and each process holds at most
+``max_size + max_overflow`` connections.
+
+Pools are created lazily per process; a forked child never touches the
+connections it inherited from its parent.
+"""
+
+import collections
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from psycopg2 import extensions
+
+from apps.core import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeout(Exception):
+    """No connection became available within the pool timeout."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of raw psycopg2 connections.
+
+    Args:
+        name: Label used in metrics and logs (the database alias)
+        max_size: Connections kept open for reuse
+        max_overflow: Extra connections opened under load and closed on return
+        timeout: Seconds to wait for a connection when the pool is exhausted
+        max_lifetime: Seconds after which a connection is replaced
+        max_idle: Seconds an idle connection above ``min_size`` is kept
+        min_size: Idle connections never closed for being idle
+        check_interval: Idle seconds after which a connection is checked with
+            ``SELECT 1`` before being handed out
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_size: int = 2,
+        max_overflow: int = 2,
+        timeout: float = 5.0,
+        max_lifetime: float = 3600.0,
+        max_idle: float = 300.0,
+        min_size: int = 0,
+        check_interval: float = 30.0,
+    ):
+        self.name = name
+        self.max_size = max_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.max_idle = max_idle
+        self.min_size = min_size
+        self.check_interval = check_interval
+
+        self._cond = threading.Condition()
+        # (connection, created_at, returned_at), most recently returned last
+        self._idle = collections.deque()
+        self._created_at: Dict[int, float] = {}
+        self.in_use = 0
+        self.waiting = 0
+
+    @property
+    def size(self) -> int:
+        """Open connections, idle or in use."""
+        return len(self._created_at)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'size': self.size,
+                'idle': len(self._idle),
+                'in_use': self.in_use,
+                'waiting': self.waiting,
+                'overflow': max(0, self.size - self.max_size),
+                'max_size': self.max_size,
+                'max_overflow': self.max_overflow,
+            }
+
+    def owns(self, connection) -> bool:
+        return id(connection) in self._created_at
+
+    def getconn(self, connect: Callable[[], Any]):
+        """
+        Return a healthy connection, opening one with ``connect`` if needed.
+
+        Raises:
+            PoolTimeout: If the pool stays exhausted for ``timeout`` seconds
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+        while True:
+            connection, source, needs_check = self._checkout(deadline)
+            if needs_check and not self._check(connection):
+                continue
+            if connection is None:
+                try:
+                    connection = connect()
+                except Exception:
+                    with self._cond:
+                        self.in_use -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._created_at[id(connection)] = time.monotonic()
+
+            metrics.DB_POOL_CHECKOUTS.inc(pool=self.name, source=source)
+            metrics.DB_POOL_WAIT.observe(time.monotonic() - start, pool=self.name)
+            metrics.DB_POOL_IN_USE.observe(self.in_use, pool=self.name)
+            return connection
+
+    def _checkout(self, deadline: float) -> Tuple[Optional[Any], str, bool]:
+        """
+        Reserve an idle connection, or a slot for a new one (returned as None).
+
+        Returns:
+            The connection, where it came from, and whether it needs a check
+        """
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                while self._idle:
+                    connection, created_at, returned_at = self._idle.pop()
+                    if now - created_at >= self.max_lifetime:
+                        self._discard(connection, 'lifetime')
+                        continue
+                    self.in_use += 1
+                    # Connections returned recently are used without a check
+                    return connection, 'idle', now - returned_at >= self.check_interval
+
+                # Slots being opened count as in use until the connection exists
+                if self.in_use < self.max_size + self.max_overflow:
+                    self.in_use += 1
+                    return None, 'overflow' if self.in_use > self.max_size else 'new', False
+
+                remaining = deadline - now
+                if remaining <= 0:
+                    metrics.DB_POOL_CHECKOUTS.inc(pool=self.name, source='timeout')
+                    raise PoolTimeout(
+                        f"No connection available in pool '{self.name}' after {self.timeout}s "
+                        f"({self.in_use} in use)"
+                    )
+                self.waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self.waiting -= 1
+
+    def _check(self, connection) -> bool:
+        """Run ``SELECT 1``; discard the connection and free its slot if it fails."""
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return True
+        except Exception as e:
+            logger.info("Discarding broken connection from pool '%s': %s", self.name, e)
+            with self._cond:
+                self.in_use -= 1
+                self._discard(connection, 'broken')
+                self._cond.notify()
+            return False
+
+    def putconn(self, connection, close_cursors: bool = False) -> None:
+        """
+        Return a connection, resetting it for the next borrower.
+
+        Args:
+            close_cursors: Close server-side (``WITH HOLD``) cursors left open
+        """
+        if not self.owns(connection):
+            # Opened by another pool or before a fork: never close a
+            # connection that may belong to the parent process
+            return
+
+        reusable = self._reset(connection, close_cursors)
+        now = time.monotonic()
+        with self._cond:
+            self.in_use -= 1
+            created_at = self._created_at[id(connection)]
+            if not reusable:
+                self._discard(connection, 'broken')
+            elif now - created_at >= self.max_lifetime:
+                self._discard(connection, 'lifetime')
+            elif self.size > self.max_size:
+                self._discard(connection, 'overflow')
+            else:
+                self._idle.append((connection, created_at, now))
+                self._prune_idle(now)
+            self._cond.notify()
+
+    def _reset(self, connection, close_cursors: bool) -> bool:
+        if connection.closed:
+            return False
+        try:
+            if connection.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+            if close_cursors:
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    cursor.execute('CLOSE ALL')
+            return True
+        except Exception as e:
+            logger.info("Could not reset connection for pool '%s': %s", self.name, e)
+            return False
+
+    def _prune_idle(self, now: float) -> None:
+        """Close connections idle for ``max_idle`` seconds, oldest first, down to ``min_size``."""
+        while len(self._idle) > self.min_size and now - self._idle[0][2] >= self.max_idle:
+            connection, _, _ = self._idle.popleft()
+            self._discard(connection, 'idle')
+
+    def _discard(self, connection, reason: str) -> None:
+        """Close a connection and forget it; the caller holds the lock."""
+        self._created_at.pop(id(connection), None)
+        metrics.DB_POOL_DISCARDS.inc(pool=self.name, reason=reason)
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._cond:
+            while self._idle:
+                connection, _, _ = self._idle.pop()
+                self._discard(connection, 'closed')
+
+
+_pools: Dict[Tuple, ConnectionPool] = {}
+_pools_pid: Optional[int] = None
+_pools_lock = threading.Lock()
+
+
+def get_pool(key: Tuple, name: str, options: Dict[str, Any]) -> ConnectionPool:
+    """
+    Return the pool for ``key`` in this process, creating it on first use.
+
+    After a fork the parent's pools are dropped without closing their
+    connections, which still belong to the parent.
+    """
+    global _pools_pid
+    with _pools_lock:
+        if _pools_pid != os.getpid():
+            _pools.clear()
+            _pools_pid = os.getpid()
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(name, **options)
+        return pool
+
+
+def all_pools() -> Dict[Tuple, ConnectionPool]:
+    """Pools created in this process."""
+    with _pools_lock:
+        return dict(_pools) if _pools_pid == os.getpid() else {}
@@ -0,0 +1,134 @@
+"""
+Bounded-concurrency fan-out for slow, independent I/O calls.
+
+Views that need one remote call per item (blockchain RPC, IPFS, ...) run
+them through ``fan_out`` so the request waits for roughly the slowest call
+instead of the sum of all of them. Each call has its own deadline measured
+from when it starts, the whole fan-out has an overall deadline, and calls
+that miss either are reported as timed out rather than failing the request.
+
+Calls run on worker threads: they must not use the database connection of
+the calling thread, and a timed-out call keeps running in the background
+until its own I/O timeout, so callers should configure client timeouts too.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CallResult:
+    """Outcome of one fanned-out call."""
+    value: Any = None
+    timed_out: bool = False
+    error: Optional[str] = None
+    elapsed: Optional[float] = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.timed_out and self.error is None
+
+
+def fan_out(
+    calls: Mapping[Hashable, Callable[[], Any]],
+    max_workers: int = 8,
+    call_timeout: Optional[float] = None,
+    deadline: Optional[float] = None,
+) -> Dict[Hashable, CallResult]:
+    """
+    Run ``calls`` concurrently and return a CallResult for every key.
+
+    Args:
+        calls: Mapping of key to a zero-argument callable
+        max_workers: Most calls in flight at once
+        call_timeout: Seconds allowed per call, from the moment it starts
+        deadline: Seconds allowed for the whole fan-out; calls still queued
+            or running when it passes are marked as timed out
+
+    Returns:
+        Dictionary mapping each key to its CallResult, in the order of ``calls``
+    """
+    if not calls:
+        return {}
+
+    started: Dict[Hashable, float] = {}
+    lock = threading.Lock()
+
+    def run(key, call):
+        with lock:
+            started[key] = time.monotonic()
+        return call()
+
+    results: Dict[Hashable, CallResult] = {}
+    begin = time.monotonic()
+    overall_expiry = begin + deadline if deadline is not None else None
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(calls))), thread_name_prefix='fanout')
+    try:
+        # Each call runs in a copy of the caller's context (e.g. per-request metrics)
+        pending = {
+            executor.submit(contextvars.copy_context().run, run, key, call): key
+            for key, call in calls.items()
+        }
+
+        while pending:
+            now = time.monotonic()
+
+            # Expire running calls that have used up their own deadline
+            if call_timeout is not None:
+                with lock:
+                    expired = [
+                        future for future, key in pending.items()
+                        if key in started and now - started[key] >= call_timeout and not future.done()
+                    ]
+                for future in expired:
+                    key = pending.pop(future)
+                    results[key] = CallResult(timed_out=True, elapsed=now - started[key])
+                if not pending:
+                    break
+
+            if overall_expiry is not None and now >= overall_expiry:
+                break
+
+            # Wake up for the next completion or the next deadline
+            expiries = [overall_expiry] if overall_expiry is not None else []
+            if call_timeout is not None:
+                with lock:
+                    for key in pending.values():
+                        # Queued calls have no start time yet: they start no earlier than now
+                        expiries.append(started.get(key, now) + call_timeout)
+            timeout = max(0.0, min(expiries) - now) if expiries else None
+
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                key = pending.pop(future)
+                elapsed = time.monotonic() - started.get(key, begin)
+                try:
+                    results[key] = CallResult(value=future.result(), elapsed=elapsed)
+                except Exception as exc:
+                    logger.warning("Fan-out call %r failed: %s", key, exc)
+                    results[key] = CallResult(error=str(exc), elapsed=elapsed)
+
+        # Anything left missed the overall deadline
+        for future, key in pending.items():
+            future.cancel()
+            results[key] = CallResult(
+                timed_out=True,
+                elapsed=time.monotonic() - started[key] if key in started else None,
+            )
+    finally:
+        # Do not wait for calls that overran; they finish in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    timed_out = sum(1 for result in results.values() if result.timed_out)
+    if timed_out:
+        logger.warning("Fan-out: %d of %d calls timed out", timed_out, len(calls))
+
+    return {key: results[key] for key in calls}
@@ -0,0 +1,255 @@
+"""
+Health checks for MyAddressHub.
+
+The basic check (database and Redis) is what load balancers poll; the deep
+check also covers the blockchain RPC node, IPFS and the Celery queues, runs
+every component concurrently with its own timeout and reports each one's
+latency. Results are cached per process for a few seconds and only one
+thread refreshes them at a time, so frequent polling never turns into load
+on the dependencies and never queues behind a slow one.
+"""
+
+import datetime
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import redis
+from django.conf import settings
+from django.db import connections, transaction
+
+from apps.core.fanout import fan_out
+
+logger = logging.getLogger(__name__)
+
+HEALTHY = 'healthy'
+UNHEALTHY = 'unhealthy'
+DEGRADED = 'degraded'
+TIMEOUT = 'timeout'
+
+# Components the service cannot work without; the others only degrade it
+REQUIRED_COMPONENTS = ('database', 'redis')
+
+# How many TTLs a cached result is served for while its refresh hangs
+MAX_STALE_TTLS = 5
+
+_redis_clients: Dict[str, redis.Redis] = {}
+_redis_clients_lock = threading.Lock()
+
+
+def _timeout() -> float:
+    return getattr(settings, 'HEALTH_CHECK_TIMEOUT', 2.0)
+
+
+def _redis_client(url: str) -> redis.Redis:
+    """Return a pooled client for ``url``, created once per process."""
+    client = _redis_clients.get(url)
+    if client is None:
+        with _redis_clients_lock:
+            client = _redis_clients.get(url)
+            if client is None:
+                client = redis.Redis.from_url(
+                    url,
+                    socket_connect_timeout=_timeout(),
+                    socket_timeout=_timeout(),
+                )
+                _redis_clients[url] = client
+    return client
+
+
+def check_database(close: bool = False) -> Dict[str, Any]:
+    """
+    Run ``SELECT 1`` on the default database, within ``HEALTH_CHECK_TIMEOUT``
+    on PostgreSQL.
+
+    Args:
+        close: Close the connection afterwards; used on worker threads, whose
+            connections would otherwise stay open
+    """
+    connection = connections['default']
+    try:
+        with transaction.atomic(using='default'), connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    "SELECT set_config('statement_timeout', %s, true)", [str(int(_timeout() * 1000))]
+                )
+            cursor.execute('SELECT 1')
+    finally:
+        if close:
+            connection.close()
+    return {'status': HEALTHY}
+
+
+def check_redis() -> Dict[str, Any]:
+    """Ping the Redis server used for caching and sessions."""
+    _redis_client(os.environ.get('REDIS_URL', 'redis://redis:6379/0')).ping()
+    return {'status': HEALTHY}
+
+
+def check_blockchain() -> Dict[str, Any]:
+    """Fetch the latest block number from the RPC node."""
+    from apps.addresses.blockchain import blockchain_manager
+
+    backend = blockchain_manager.backend
+    if not backend.enabled:
+        return {'status': HEALTHY, 'enabled': False}
+    return {'status': HEALTHY, 'block_number': backend.block_number()}
+
+
+def check_ipfs() -> Dict[str, Any]:
+    """Ask the IPFS daemon for its version."""
+    from apps.addresses.blockchain import blockchain_manager
+
+    backend = blockchain_manager.backend
+    if not backend.enabled:
+        return {'status': HEALTHY, 'enabled': False}
+    if not backend.ipfs_available():
+        return {'status': UNHEALTHY}
+    backend.ipfs_version()
+    return {'status': HEALTHY}
+
+
+def check_celery() -> Dict[str, Any]:
+    """Report the number of messages waiting in each Celery queue."""
+    broker_url = getattr(settings, 'CELERY_BROKER_URL', None) or os.environ.get('REDIS_URL', 'redis://redis:6379/0')
+    if not broker_url.startswith(('redis://', 'rediss://')):
+        return {'status': HEALTHY, 'queues': {}}
+
+    client = _redis_client(broker_url)
+    pipe = client.pipeline(transaction=False)
+    queues = list(getattr(settings, 'HEALTH_CHECK_CELERY_QUEUES', ['celery']))
+    for queue in queues:
+        pipe.llen(queue)
+    depths = dict(zip(queues, pipe.execute()))
+
+    max_depth = getattr(settings, 'HEALTH_CHECK_CELERY_MAX_QUEUE_DEPTH', 1000)
+    status = DEGRADED if any(depth > max_depth for depth in depths.values()) else HEALTHY
+    return {'status': status, 'queues': depths}
+
+
+DEEP_CHECKS: Dict[str, Callable[[], Dict[str, Any]]] = {
+    'database': lambda: check_database(close=True),
+    'redis': check_redis,
+    'blockchain': check_blockchain,
+    'ipfs': check_ipfs,
+    'celery': check_celery,
+}
+
+
+def _overall_status(components: Dict[str, Dict[str, Any]]) -> str:
+    if any(components[name]['status'] != HEALTHY for name in REQUIRED_COMPONENTS if name in components):
+        return UNHEALTHY
+    if any(component['status'] != HEALTHY for component in components.values()):
+        return DEGRADED
+    return HEALTHY
+
+
+def _report(components: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        'status': _overall_status(components),
+        'timestamp': datetime.datetime.utcnow().isoformat(),
+        'components': components,
+    }
+
+
+def _timed(check: Callable[[], Dict[str, Any]], name: str) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        result = check()
+    except Exception as e:
+        logger.warning("Health check %s failed: %s", name, e)
+        result = {'status': UNHEALTHY}
+    result['latency_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+def run_basic_checks() -> Dict[str, Any]:
+    """
+    Check the database and Redis in the calling thread.
+
+    The database check reuses the thread's persistent connection, so polling
+    does not open new connections.
+    """
+    return _report({
+        'database': _timed(check_database, 'database'),
+        'redis': _timed(check_redis, 'redis'),
+    })
+
+
+def run_deep_checks() -> Dict[str, Any]:
+    """Check every dependency concurrently, each within ``HEALTH_CHECK_TIMEOUT``."""
+    timeout = _timeout()
+    calls = {name: (lambda name=name, check=check: _timed(check, name)) for name, check in DEEP_CHECKS.items()}
+    results = fan_out(calls, max_workers=len(calls), call_timeout=timeout, deadline=timeout)
+
+    components = {}
+    for name, result in results.items():
+        if result.timed_out:
+            logger.warning("Health check %s timed out after %.1fs", name, timeout)
+            components[name] = {'status': TIMEOUT, 'latency_ms': round(timeout * 1000, 2)}
+        else:
+            components[name] = result.value
+    return _report(components)
+
+
+class CachedCheck:
+    """
+    Result of a check, reused for ``ttl`` seconds.
+
+    When the result is stale, one thread refreshes it while the others keep
+    serving the previous result instead of waiting. A result more than
+    ``MAX_STALE_TTLS`` TTLs old means the refresh is hanging, and the check
+    reports unhealthy until it finishes.
+    """
+
+    def __init__(self, run: Callable[[], Dict[str, Any]], ttl_setting: str, default_ttl: float):
+        self.run = run
+        self.ttl_setting = ttl_setting
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+
+    def _ttl(self) -> float:
+        return getattr(settings, self.ttl_setting, self.default_ttl)
+
+    def _fresh(self) -> bool:
+        return self._result is not None and time.monotonic() - self._checked_at < self._ttl()
+
+    def _servable(self) -> bool:
+        max_age = self._ttl() * MAX_STALE_TTLS
+        return self._result is not None and time.monotonic() - self._checked_at < max_age
+
+    def _hanging(self) -> Dict[str, Any]:
+        logger.warning("Health check refresh has not finished within %d TTLs", MAX_STALE_TTLS)
+        return {
+            'status': UNHEALTHY,
+            'timestamp': datetime.datetime.utcnow().isoformat(),
+            'components': {},
+            'error': 'Health check refresh is not finishing',
+        }
+
+    def get(self) -> Dict[str, Any]:
+        if self._fresh():
+            return self._result
+        # Only wait for the refresh when there is nothing to serve yet, and
+        # then no longer than a result may be served stale
+        if self._result is None:
+            acquired = self._lock.acquire(timeout=self._ttl() * MAX_STALE_TTLS)
+        else:
+            acquired = self._lock.acquire(blocking=False)
+        if not acquired:
+            return self._result if self._servable() else self._hanging()
+        try:
+            if not self._fresh():
+                self._result = self.run()
+                self._checked_at = time.monotonic()
+            return self._result
+        finally:
+            self._lock.release()
+
+
+basic_health = CachedCheck(run_basic_checks, 'HEALTH_CHECK_CACHE_TTL', 2.0)
+deep_health = CachedCheck(run_deep_checks, 'HEALTH_CHECK_DEEP_CACHE_TTL', 10.0)
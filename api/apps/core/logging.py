@@ -1,14 +1,29 @@
+import atexit
+import copy
 import logging
 import json
+import os
+import queue
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+import orjson
+
+# Attributes every LogRecord has; anything else was passed with ``extra=``
+_RECORD_ATTRIBUTES = frozenset(logging.LogRecord('', 0, '', 0, '', (), None).__dict__) | {'message', 'asctime'}
+
 
 class JSONFormatter(logging.Formatter):
     """
     Custom JSON formatter for Django logs
     """
     def format(self, record):
+        return self.serialize(self.get_log_data(record))
+
+    def get_log_data(self, record):
         log_data = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.fromtimestamp(record.created).isoformat(),
             'level': record.levelname,
             'message': record.getMessage(),
             'logger': record.name,
@@ -16,13 +31,107 @@ class JSONFormatter(logging.Formatter):
             'lineno': record.lineno,
             'func': record.funcName,
         }
-        
-        # Add exception info if available
+
+        # Add exception info if available (already rendered if queued)
         if record.exc_info:
             log_data['exc_info'] = self.formatException(record.exc_info)
-        
+        elif record.exc_text:
+            log_data['exc_info'] = record.exc_text
+
+        # Add fields passed with extra=
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and key != 'extra':
+                log_data[key] = value
+
         # Add extra fields if available
         if hasattr(record, 'extra'):
             log_data.update(record.extra)
-        
-        return json.dumps(log_data) 
\ No newline at end of file
+
+        return log_data
+
+    def serialize(self, log_data):
+        return json.dumps(log_data, default=str)
+
+
+class ORJSONFormatter(JSONFormatter):
+    """
+    JSONFormatter that serializes with orjson; values orjson cannot encode
+    are written with str() instead of failing the log line.
+    """
+    def serialize(self, log_data):
+        return orjson.dumps(log_data, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    Hand log records to a background thread that writes them to ``handlers``.
+
+    Logging threads only put the record on a bounded in-memory queue and never
+    wait on log I/O: when the queue is full the record is dropped and counted.
+    The listener thread is started lazily in each process, so it survives
+    forking web and Celery workers.
+
+    Configure with ``cfg://`` references to the handlers to write to. dictConfig
+    creates handlers in name order, so they must sort before this one:
+
+        "queue": {
+            "()": "apps.core.logging.QueueListenerHandler",
+            "handlers": ["cfg://handlers.console"],
+        }
+    """
+    def __init__(self, handlers, queue_size=10000):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        # Index rather than iterate: dictConfig resolves cfg:// items on access
+        self.handlers = [handlers[index] for index in range(len(handlers))]
+        for handler in self.handlers:
+            if not isinstance(handler, logging.Handler):
+                raise ValueError(f"{handler!r} is not a configured handler; it must sort before the queue handler")
+        self.queue_size = queue_size
+        self.dropped = 0
+        self._listener = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid == os.getpid():
+                return
+            if self._pid is not None:
+                # Forked: the parent's listener thread does not exist here
+                self.queue = queue.Queue(maxsize=self.queue_size)
+            self._listener = QueueListener(self.queue, *self.handlers, respect_handler_level=True)
+            self._listener.start()
+            self._pid = os.getpid()
+            atexit.register(self.stop)
+
+    def prepare(self, record):
+        """Render the message and traceback now into a copy; the copy is formatted later."""
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self):
+        """Write out the queued records and stop the listener thread."""
+        listener, self._listener = self._listener, None
+        if listener is not None and self._pid == os.getpid():
+            listener.stop()
+        self._pid = None
+
+    def close(self):
+        self.stop()
+        super().close()
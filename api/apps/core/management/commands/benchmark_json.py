@@ -0,0 +1,89 @@
+"""
+Measure JSON encoding and decoding time for typical address payloads.
+
+Compares DRF's stdlib ``JSONRenderer`` / ``JSONParser`` and the stdlib log
+formatter with their orjson counterparts, after checking that the rendered
+responses are byte-for-byte identical.
+"""
+
+import io
+import logging
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.addresses.fast_serializers import address_list_data
+from apps.addresses.management.commands.benchmark_serializers import build_addresses
+from apps.core.logging import JSONFormatter, ORJSONFormatter
+from apps.core.parsers import ORJSONParser
+from apps.core.renderers import ORJSONRenderer
+
+DEFAULT_SIZES = [1, 50, 1000]
+
+
+def seconds_per_call(call, min_time):
+    """Run ``call`` until ``min_time`` seconds have passed; return the mean time per call."""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        call()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / calls
+
+
+class Command(BaseCommand):
+    help = "Benchmark stdlib JSON against orjson for address responses and log lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+            help='Numbers of addresses per response (default: 1 50 1000)'
+        )
+        parser.add_argument(
+            '--min-time', type=float, default=1.0,
+            help='Seconds to spend on each measurement (default: 1.0)'
+        )
+
+    def handle(self, *args, **options):
+        min_time = options['min_time']
+        stdlib_renderer, orjson_renderer = JSONRenderer(), ORJSONRenderer()
+        stdlib_parser, orjson_parser = JSONParser(), ORJSONParser()
+
+        self.stdout.write(f"{'operation':<24} {'stdlib':>12} {'orjson':>12} {'speedup':>8}")
+        for size in options['sizes']:
+            payload = {'success': True, 'data': address_list_data(build_addresses(size)), 'next': None}
+
+            body = stdlib_renderer.render(payload)
+            if orjson_renderer.render(payload) != body:
+                raise CommandError(f"orjson rendering differs from JSONRenderer at {size} addresses")
+
+            self._report(
+                f"render {size} addresses",
+                seconds_per_call(lambda: stdlib_renderer.render(payload), min_time),
+                seconds_per_call(lambda: orjson_renderer.render(payload), min_time),
+            )
+            self._report(
+                f"parse {size} addresses",
+                seconds_per_call(lambda: stdlib_parser.parse(io.BytesIO(body)), min_time),
+                seconds_per_call(lambda: orjson_parser.parse(io.BytesIO(body)), min_time),
+            )
+
+        record = logging.LogRecord(
+            'apps.addresses', logging.INFO, __file__, 1, "Served %d addresses", (50,), None
+        )
+        record.extra = {'request_id': 'b3c1d2e4', 'user_id': 42, 'duration_ms': 12.5}
+        self._report(
+            "format log line",
+            seconds_per_call(lambda: JSONFormatter().format(record), min_time),
+            seconds_per_call(lambda: ORJSONFormatter().format(record), min_time),
+        )
+
+    def _report(self, name, stdlib_time, orjson_time):
+        self.stdout.write(
+            f"{name:<24} {stdlib_time * 1e6:>10,.1f}us {orjson_time * 1e6:>10,.1f}us "
+            f"{stdlib_time / orjson_time:>7.1f}x"
+        )
@@ -0,0 +1,367 @@
+"""
+Load-test the hot API endpoints over HTTP and report latency and throughput.
+
+Serves the project from a threaded WSGI server inside this process, with
+``blockchain_manager`` pointed at an in-process chain and IPFS with a fixed
+latency per call, so runs need no node, daemon or network and are
+reproducible. ``--backend web3`` runs the web3 backend against the fakes from
+``apps.addresses.fake_chain`` (counting JSON-RPC calls); ``--backend memory``
+uses ``InMemoryBackend``, which skips web3 entirely. Seeds an owner with
+``--addresses`` addresses shared with an organization and ``--lookups``
+lookup records, then drives each scenario with ``--concurrency`` keep-alive
+clients for ``--duration`` seconds and reports p50/p95/p99 latency,
+throughput and the RPC and IPFS calls per request. The seeded data is
+deleted afterwards.
+
+Write the results with ``--output`` and pass an earlier file to
+``--compare`` to see the change, e.g. before and after an optimization.
+"""
+
+import contextlib
+import json
+import os
+import platform
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+import django
+import requests
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application
+from django.db import connection
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.accounts.models import AddressPermission, LookupRecord, Organization, OrganizationMembership
+from apps.addresses.encryption import encrypt_address_data
+from apps.addresses.backends.memory import InMemoryBackend
+from apps.addresses.fake_chain import use_backend, use_fake_chain
+from apps.addresses.models import Address
+
+SCENARIOS = ['list', 'create', 'update', 'org_lookup', 'lookup_history']
+
+ADDRESS_DATA = {
+    'address': '1 Example Street',
+    'street': 'Example Street',
+    'suburb': 'Sydney',
+    'state': 'NSW',
+    'postcode': '2000',
+}
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def percentile(sorted_values, percent):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def seed(addresses, lookups):
+    """Create an owner, an organization user, shared addresses and lookup history."""
+    suffix = uuid.uuid4().hex[:8]
+    now = timezone.now()
+
+    owner = User.objects.create_user(f"bench-owner-{suffix}", f"owner-{suffix}@example.com")
+    org_user = User.objects.create_user(f"bench-org-{suffix}", f"org-{suffix}@example.com")
+    organization = Organization.objects.create(name=f"Benchmark {suffix}")
+    org_user.profile.user_type = 'organization'
+    org_user.profile.organization = organization
+    org_user.profile.save()
+    OrganizationMembership.objects.create(organization=organization, user=org_user, role='owner')
+
+    encrypted = encrypt_address_data(ADDRESS_DATA)
+    rows = Address.objects.bulk_create([
+        Address(
+            user=owner,
+            address_name=f"Address {index:05d}",
+            is_default=index == 0,
+            is_stored_on_blockchain=index % 2 == 0,
+            last_synced_at=now if index % 2 == 0 else None,
+            ipfs_hash=f"Qm{uuid.uuid4().hex}" if index % 2 == 0 else None,
+            **encrypted,
+        )
+        for index in range(addresses)
+    ], batch_size=500)
+    AddressPermission.objects.bulk_create([
+        AddressPermission(address=address, organization=organization, granted_by=owner)
+        for address in rows
+    ], batch_size=500)
+    LookupRecord.objects.bulk_create([
+        LookupRecord(
+            organization=organization,
+            user=org_user,
+            address=rows[index % len(rows)],
+            created_at=now - timedelta(seconds=index),
+        )
+        for index in range(lookups)
+    ], batch_size=500)
+
+    return {
+        'owner': owner,
+        'org_user': org_user,
+        'organization': organization,
+        'address_ids': [str(address.id) for address in rows],
+    }
+
+
+def cleanup(data):
+    # Users first: their addresses, permissions and lookups cascade with them
+    User.objects.filter(id__in=[data['owner'].id, data['org_user'].id]).delete()
+    data['organization'].delete()
+
+
+def bearer(user, lifetime):
+    token = AccessToken.for_user(user)
+    token.set_exp(lifetime=lifetime)
+    return {'Authorization': f"Bearer {token}"}
+
+
+class Command(BaseCommand):
+    help = 'Load-test the hot API endpoints against an in-memory chain and report latency percentiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS,
+            help=f"Scenarios to run (default: {' '.join(SCENARIOS)})"
+        )
+        parser.add_argument(
+            '--duration', type=float, default=10.0,
+            help='Seconds to run each scenario (default: 10)'
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=4,
+            help='Concurrent clients (default: 4)'
+        )
+        parser.add_argument(
+            '--warmup', type=int, default=5,
+            help='Requests per client sent before measuring (default: 5)'
+        )
+        parser.add_argument(
+            '--addresses', type=int, default=500,
+            help='Addresses to seed for the owner (default: 500)'
+        )
+        parser.add_argument(
+            '--lookups', type=int, default=5000,
+            help='Lookup records to seed for the organization (default: 5000)'
+        )
+        parser.add_argument(
+            '--backend', choices=['web3', 'memory'], default='web3',
+            help='Chain backend: web3 against a fake node, or the in-memory backend (default: web3)'
+        )
+        parser.add_argument(
+            '--rpc-latency', type=float, default=0.005,
+            help='Seconds each fake RPC call takes (default: 0.005)'
+        )
+        parser.add_argument(
+            '--ipfs-latency', type=float, default=0.01,
+            help='Seconds each fake IPFS call takes (default: 0.01)'
+        )
+        parser.add_argument(
+            '--label', default='',
+            help='Name of this run, stored in the results (e.g. a commit or branch)'
+        )
+        parser.add_argument(
+            '--output', dest='output_path',
+            help='Write the results as JSON to this path'
+        )
+        parser.add_argument(
+            '--compare', dest='compare_path',
+            help='Results file of an earlier run to compare against'
+        )
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['duration'] <= 0:
+            raise CommandError('--concurrency and --duration must be positive')
+        if options['addresses'] < options['concurrency']:
+            raise CommandError('Seed at least one address per client (--addresses >= --concurrency)')
+
+        baseline = None
+        if options['compare_path']:
+            with open(options['compare_path']) as f:
+                baseline = json.load(f)
+
+        with override_settings(ALLOWED_HOSTS=['127.0.0.1', 'localhost']), \
+                self._chain(options) as counters:
+            self.stdout.write(f"Seeding {options['addresses']} addresses and {options['lookups']} lookups...")
+            data = seed(options['addresses'], options['lookups'])
+            server = ThreadedWSGIServer(('127.0.0.1', 0), _QuietHandler, allow_reuse_address=False)
+            server.set_app(get_internal_wsgi_application())
+            thread = threading.Thread(target=server.serve_forever, name='benchmark-server', daemon=True)
+            thread.start()
+            base_url = f"http://127.0.0.1:{server.server_port}"
+            try:
+                scenarios = {}
+                for name in options['scenarios']:
+                    scenarios[name] = self._run_scenario(name, base_url, data, counters, options)
+                    self._print_result(name, scenarios[name], baseline)
+            finally:
+                server.shutdown()
+                server.server_close()
+                cleanup(data)
+
+        results = {
+            'label': options['label'],
+            'started_at': timezone.now().isoformat(),
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'cpus': os.cpu_count(),
+            },
+            'options': {
+                key: options[key] for key in (
+                    'duration', 'concurrency', 'warmup', 'addresses', 'lookups',
+                    'backend', 'rpc_latency', 'ipfs_latency',
+                )
+            },
+            'scenarios': scenarios,
+        }
+        if options['output_path']:
+            with open(options['output_path'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"Results written to {options['output_path']}")
+
+        failed = [name for name, result in scenarios.items() if result['errors']]
+        if failed:
+            raise CommandError(f"Requests failed in: {', '.join(failed)}")
+
+    @contextlib.contextmanager
+    def _chain(self, options):
+        """Swap in the chosen chain backend; yields its (RPC, IPFS) call counters."""
+        if options['backend'] == 'memory':
+            backend = InMemoryBackend(options['rpc_latency'], options['ipfs_latency'])
+            with use_backend(backend):
+                yield backend.rpc_calls, backend.ipfs_calls
+        else:
+            with use_fake_chain(options['rpc_latency'], options['ipfs_latency']) as (provider, ipfs):
+                yield provider.counter, ipfs.counter
+
+    def _requests(self, name, data, client_index, lifetime):
+        """Return a function making the scenario's ``n``-th request for one client."""
+        owner = bearer(data['owner'], lifetime)
+        org = bearer(data['org_user'], lifetime)
+        address_ids = data['address_ids']
+        list_url = reverse('addresses:address-list')
+
+        if name == 'list':
+            return lambda session, base, n: session.get(base + list_url, headers=owner)
+        if name == 'create':
+            return lambda session, base, n: session.post(
+                base + list_url, headers=owner,
+                json={'address_name': f"Created {client_index}-{n}", **ADDRESS_DATA},
+            )
+        if name == 'update':
+            # Each client updates its own address, so clients do not wait on each other's row
+            detail_url = reverse('addresses:address-detail', kwargs={'id': address_ids[client_index]})
+            return lambda session, base, n: session.patch(
+                base + detail_url, headers=owner,
+                json={'address_name': f"Updated {client_index}-{n}", **ADDRESS_DATA},
+            )
+        if name == 'org_lookup':
+            return lambda session, base, n: session.get(
+                base + reverse('addresses:lookup-address-by-uuid', kwargs={
+                    'address_uuid': address_ids[(client_index + n * 7919) % len(address_ids)],
+                }),
+                headers=org,
+            )
+        history_url = reverse('addresses:organization-lookup-history')
+        return lambda session, base, n: session.get(base + history_url, headers=org)
+
+    def _run_scenario(self, name, base_url, data, counters, options):
+        rpc_calls, ipfs_calls = counters
+        concurrency = options['concurrency']
+        duration = options['duration']
+        lifetime = timedelta(seconds=duration * 2 + 300)
+        latencies = [[] for _ in range(concurrency)]
+        errors = [0] * concurrency
+        ready = threading.Barrier(concurrency + 1)
+        start_at = [0.0]
+
+        def client(index):
+            send = self._requests(name, data, index, lifetime)
+            with requests.Session() as session:
+                for n in range(options['warmup']):
+                    with contextlib.suppress(requests.RequestException):
+                        send(session, base_url, -n - 1)
+                ready.wait()
+                ready.wait()
+                deadline = start_at[0] + duration
+                n = 0
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        response = send(session, base_url, n)
+                        failed = response.status_code >= 400
+                    except requests.RequestException:
+                        failed = True
+                    latencies[index].append(time.perf_counter() - started)
+                    errors[index] += failed
+                    n += 1
+
+        self.stdout.write(f"Running {name} for {duration:g}s with {concurrency} clients...")
+        threads = [threading.Thread(target=client, args=(index,)) for index in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        # Once every client has warmed up, reset the counters and start the clock together
+        ready.wait()
+        rpc_calls.reset()
+        ipfs_calls.reset()
+        start_at[0] = time.perf_counter()
+        ready.wait()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start_at[0]
+
+        samples = sorted(latency for client_latencies in latencies for latency in client_latencies)
+        count = len(samples)
+        return {
+            'requests': count,
+            'errors': sum(errors),
+            'throughput_rps': round(count / elapsed, 2),
+            'latency_ms': {
+                'p50': round(percentile(samples, 50) * 1000, 2),
+                'p95': round(percentile(samples, 95) * 1000, 2),
+                'p99': round(percentile(samples, 99) * 1000, 2),
+                'mean': round(sum(samples) / count * 1000, 2) if count else 0.0,
+                'max': round(samples[-1] * 1000, 2) if count else 0.0,
+            },
+            'rpc_per_request': round(rpc_calls.total / count, 2) if count else 0.0,
+            'ipfs_per_request': round(ipfs_calls.total / count, 2) if count else 0.0,
+        }
+
+    def _print_result(self, name, result, baseline):
+        latency = result['latency_ms']
+        line = (
+            f"  {name:<16} {result['throughput_rps']:>8.1f} req/s  "
+            f"p50 {latency['p50']:>8.1f} ms  p95 {latency['p95']:>8.1f} ms  p99 {latency['p99']:>8.1f} ms  "
+            f"rpc/req {result['rpc_per_request']:>5.1f}  ipfs/req {result['ipfs_per_request']:>4.1f}"
+        )
+        if result['errors']:
+            line += f"  {result['errors']} errors"
+        style = self.style.ERROR if result['errors'] else self.style.SUCCESS
+        self.stdout.write(style(line))
+
+        previous = (baseline or {}).get('scenarios', {}).get(name)
+        if previous:
+            changes = [
+                f"{key} {self._change(previous['latency_ms'][key], latency[key])}" for key in ('p50', 'p95', 'p99')
+            ]
+            changes.append(f"throughput {self._change(previous['throughput_rps'], result['throughput_rps'])}")
+            self.stdout.write(f"  {'':<16} vs {baseline.get('label') or 'baseline'}: {', '.join(changes)}")
+
+    @staticmethod
+    def _change(before, after):
+        if not before:
+            return 'n/a'
+        return f"{(after - before) / before * 100:+.1f}%"
@@ -0,0 +1,228 @@
+"""
+EXPLAIN the ORM queries behind the hot endpoints and fail on sequential scans.
+
+Seeds a throwaway data set inside a transaction that is always rolled back,
+then checks that every query can be answered from an index, and that deep
+keyset pages start their index scan at the cursor. On PostgreSQL
+sequential scans are disabled for the check, so a remaining ``Seq Scan``
+means no index can serve the query at all.
+"""
+
+import re
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.accounts.directory import OrganizationDirectoryPagination, search_queryset
+from apps.accounts.models import (
+    AddressPermission, LookupRecord, Organization, OrganizationMembership
+)
+from apps.addresses.models import Address
+from apps.addresses.pagination import AddressKeysetPagination, LookupRecordKeysetPagination
+
+# "Seq Scan on <table>" (PostgreSQL) or "SCAN <table>" without an index (SQLite)
+SEQUENTIAL_SCAN_RE = re.compile(r'Seq Scan on (\w+)|\bSCAN (\w+)\b(?! USING (?:COVERING )?INDEX)')
+
+SEEDED_TABLES = [
+    Organization._meta.db_table,
+    Address._meta.db_table,
+    AddressPermission._meta.db_table,
+    LookupRecord._meta.db_table,
+    OrganizationMembership._meta.db_table,
+]
+
+
+def _range_scan_re(field):
+    """Match an index condition bounding ``field`` (PostgreSQL, then SQLite)."""
+    return re.compile(
+        rf'Index Cond: .*\b{field}\b\)? [<>]=?|USING (?:COVERING )?INDEX \w+ \(.*\b{field}[<>]'
+    )
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _after(pagination_class, row):
+    """Return the cursor condition of the page that follows ``row``."""
+    pagination = pagination_class()
+    return pagination.after_cursor_filter(tuple(getattr(row, field) for field in pagination.fields))
+
+
+def hot_queries(data):
+    """
+    Return (name, queryset) pairs mirroring the queries of the hot endpoints.
+
+    Deep keyset pages are (name, queryset, field) triples: their index scan
+    must also start at the cursor, with a range condition on ``field``.
+    """
+    user = data['user']
+    organization = data['organization']
+    address = data['address']
+
+    queries = [
+        ('user addresses page', Address.objects.filter(
+            user=user, is_active=True
+        ).order_by(*AddressKeysetPagination.ordering)[:AddressKeysetPagination.page_size + 1]),
+        ('user addresses deep page', Address.objects.filter(
+            _after(AddressKeysetPagination, data['deep_address']), user=user, is_active=True
+        ).order_by(*AddressKeysetPagination.ordering)[:AddressKeysetPagination.page_size + 1],
+            'is_default'),
+        ('default address', Address.objects.filter(
+            user=user, is_default=True, is_active=True
+        )),
+        ('pending blockchain sync', Address.objects.filter(
+            is_active=True, is_stored_on_blockchain=False
+        ).select_related('user')[:10]),
+        ('synced addresses', Address.objects.filter(
+            is_active=True, is_stored_on_blockchain=True
+        ).select_related('user')[:10]),
+        ('address permission check', AddressPermission.objects.filter(
+            organization=organization, address=address, is_active=True
+        )),
+        ('permitted addresses', AddressPermission.objects.filter(
+            organization=organization, is_active=True
+        ).order_by('address_id')),
+        ('lookup history page', LookupRecord.objects.filter(
+            organization=organization
+        ).order_by(*LookupRecordKeysetPagination.ordering)[:LookupRecordKeysetPagination.page_size + 1]),
+        ('lookup history deep page', LookupRecord.objects.filter(
+            _after(LookupRecordKeysetPagination, data['deep_lookup']), organization=organization
+        ).order_by(*LookupRecordKeysetPagination.ordering)[:LookupRecordKeysetPagination.page_size + 1],
+            'created_at'),
+        ('organization members', OrganizationMembership.objects.filter(
+            organization=organization, is_active=True
+        ).select_related('user', 'created_by')),
+        ('active membership', OrganizationMembership.objects.filter(
+            organization=organization, user=user, is_active=True
+        )),
+        ('organization directory page', Organization.objects.filter(
+            is_active=True
+        ).order_by(*OrganizationDirectoryPagination.ordering)[:OrganizationDirectoryPagination.page_size + 1]),
+    ]
+    if connection.vendor == 'postgresql':
+        # Elsewhere search falls back to a substring match, which no index serves
+        queries.append(('organization directory search', search_queryset(
+            organization.name[:6]
+        )[:OrganizationDirectoryPagination.page_size]))
+    return queries
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot ORM queries against seeded data and fail on sequential scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=2000,
+            help='Number of addresses and lookup records to seed (default: 2000)'
+        )
+        parser.add_argument(
+            '--verbose-plans',
+            action='store_true',
+            help='Print the plan of every query, not only the failing ones'
+        )
+
+    def handle(self, *args, **options):
+        failures = []
+
+        try:
+            with transaction.atomic():
+                data = self._seed(options['rows'])
+                self._prepare_planner()
+
+                for name, queryset, *range_field in hot_queries(data):
+                    plan = queryset.explain()
+                    scanned = [table for match in SEQUENTIAL_SCAN_RE.findall(plan) for table in match if table]
+                    if scanned:
+                        failures.append(name)
+                        self.stdout.write(self.style.ERROR(f"FAIL {name}: sequential scan on {', '.join(scanned)}"))
+                        self.stdout.write(plan)
+                    elif range_field and not _range_scan_re(range_field[0]).search(plan):
+                        failures.append(name)
+                        self.stdout.write(self.style.ERROR(f"FAIL {name}: index scan is not bounded on {range_field[0]}"))
+                        self.stdout.write(plan)
+                    else:
+                        self.stdout.write(self.style.SUCCESS(f"ok   {name}"))
+                        if options['verbose_plans']:
+                            self.stdout.write(plan)
+
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        if failures:
+            raise CommandError(f"{len(failures)} queries fail the plan check: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS('All query plans use indexes'))
+
+    def _prepare_planner(self):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                for table in SEEDED_TABLES:
+                    cursor.execute(f"ANALYZE {connection.ops.quote_name(table)}")
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            elif connection.vendor == 'sqlite':
+                cursor.execute("ANALYZE")
+
+    def _seed(self, rows):
+        """Create organizations, users, addresses, permissions, memberships and lookups."""
+        suffix = uuid.uuid4().hex[:8]
+        now = timezone.now()
+
+        organizations = Organization.objects.bulk_create([
+            Organization(name=f"Plan check {suffix} {index}") for index in range(max(rows // 20, 2))
+        ])
+        users = User.objects.bulk_create([
+            User(username=f"plancheck-{suffix}-{index}") for index in range(max(rows // 20, 1))
+        ])
+
+        addresses = Address.objects.bulk_create([
+            Address(
+                user=users[index % len(users)],
+                address_name=f"Address {index}",
+                is_default=index < len(users),
+                is_active=index % 10 != 0,
+                is_stored_on_blockchain=index % 3 != 0,
+            )
+            for index in range(rows)
+        ])
+
+        AddressPermission.objects.bulk_create([
+            AddressPermission(
+                address=address,
+                organization=organizations[index % 2],
+                granted_by=address.user,
+                is_active=index % 5 != 0,
+            )
+            for index, address in enumerate(addresses)
+        ])
+        OrganizationMembership.objects.bulk_create([
+            OrganizationMembership(
+                organization=organizations[index % 2],
+                user=user,
+                is_active=index % 7 != 0,
+            )
+            for index, user in enumerate(users)
+        ])
+        lookups = LookupRecord.objects.bulk_create([
+            LookupRecord(
+                organization=organizations[index % 2],
+                user=users[index % len(users)],
+                address=addresses[index],
+                created_at=now - timedelta(minutes=index),
+            )
+            for index in range(rows)
+        ])
+
+        return {
+            'organization': organizations[0],
+            'user': users[0],
+            'address': addresses[0],
+            'deep_address': addresses[rows // 2],
+            'deep_lookup': lookups[rows // 2],
+        }
@@ -0,0 +1,350 @@
+"""
+Check the database queries, blockchain RPCs and IPFS calls of every endpoint.
+
+Seeds users, an organization, addresses, permissions and lookup records at
+several sizes inside a transaction that is always rolled back, then calls
+every URL of ``apps.addresses.urls`` and ``apps.accounts.urls`` through the
+test client, each in its own savepoint. The RPC node and IPFS are replaced
+by the counting fakes from ``apps.addresses.fake_chain``.
+
+Every budget is fixed: database queries, RPCs and IPFS calls must not grow
+with the number of rows returned. The report lists the counts at every size
+and whether they stay flat (O(1)) or grow with the size (O(n)); any
+endpoint over its budget fails the command.
+"""
+
+import json
+import uuid
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.auth.tokens import default_token_generator
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.accounts.models import AddressPermission, LookupRecord, Organization, OrganizationMembership, Profile
+from apps.addresses.encryption import encrypt_address_data
+from apps.addresses.exports import LOOKUP_HISTORY, create_export_token
+from apps.addresses.fake_chain import use_fake_chain
+from apps.addresses.models import Address
+
+DEFAULT_SIZES = [3, 30]
+PASSWORD = 'Budget-check-Pa55word!'
+NEW_PASSWORD = 'Budget-check-Pa55word!2'
+
+ADDRESS_DATA = {
+    'address': '1 Example Street',
+    'street': 'Example Street',
+    'suburb': 'Sydney',
+    'state': 'NSW',
+    'postcode': '2000',
+}
+
+
+class _Rollback(Exception):
+    pass
+
+
+@dataclass
+class Endpoint:
+    """One request to check, and its budget."""
+    url_name: str
+    method: str
+    user: Optional[str]
+    db: int
+    rpc: int = 0
+    ipfs: int = 0
+    kwargs: Callable[[dict], dict] = lambda seed: {}
+    data: Callable[[dict], dict] = lambda seed: None
+    query: Dict[str, str] = field(default_factory=dict)
+    label: str = ''
+
+    @property
+    def name(self):
+        return f"{self.method} {self.url_name}{f' ({self.label})' if self.label else ''}"
+
+    def budget(self):
+        return {'db': self.db, 'rpc': self.rpc, 'ipfs': self.ipfs}
+
+
+ENDPOINTS = [
+    # Addresses
+    Endpoint('addresses:address-list', 'get', 'owner', db=4, rpc=2),
+    Endpoint('addresses:address-list', 'post', 'owner', db=34, rpc=14, ipfs=3,
+             data=lambda seed: {'address_name': 'New', **ADDRESS_DATA}),
+    Endpoint('addresses:address-detail', 'get', 'owner', db=3, rpc=3, ipfs=1,
+             kwargs=lambda seed: {'id': seed['address'].id}),
+    Endpoint('addresses:address-detail', 'patch', 'owner', db=13, rpc=15, ipfs=2,
+             kwargs=lambda seed: {'id': seed['address'].id},
+             data=lambda seed: {'address_name': 'Renamed', **ADDRESS_DATA}),
+    Endpoint('addresses:address-detail', 'delete', 'owner', db=24, rpc=12,
+             kwargs=lambda seed: {'id': seed['other_address'].id}),
+    Endpoint('addresses:user-addresses', 'get', 'owner', db=4, rpc=2),
+    Endpoint('addresses:default-address', 'get', 'owner', db=3, rpc=3, ipfs=1),
+    Endpoint('addresses:set-default-address', 'post', 'owner', db=10, rpc=10, ipfs=1,
+             kwargs=lambda seed: {'address_id': seed['other_address'].id}),
+    Endpoint('addresses:address-breakdown', 'get', 'owner', db=3, rpc=3, ipfs=1,
+             kwargs=lambda seed: {'address_id': seed['address'].id}),
+    Endpoint('addresses:test-address-data', 'get', 'owner', db=3, rpc=19, ipfs=1),
+    Endpoint('addresses:blockchain-status', 'get', 'owner', db=9, rpc=2),
+    Endpoint('addresses:get-user-addresses-from-blockchain', 'get', 'owner', db=10, rpc=3),
+    Endpoint('addresses:get-address-from-blockchain', 'get', 'owner', db=3, rpc=5, ipfs=1,
+             kwargs=lambda seed: {'address_id': seed['address'].id}),
+    Endpoint('addresses:grant-address-permission', 'post', 'owner', db=8,
+             kwargs=lambda seed: {'address_id': seed['address'].id},
+             data=lambda seed: {'organization_id': str(seed['other_organization'].id)}),
+    Endpoint('addresses:revoke-address-permission', 'delete', 'owner', db=7,
+             kwargs=lambda seed: {'address_id': seed['address'].id, 'organization_id': seed['organization'].id}),
+    Endpoint('addresses:get-address-permissions', 'get', 'owner', db=4,
+             kwargs=lambda seed: {'address_id': seed['address'].id}),
+    Endpoint('addresses:list-organizations', 'get', 'owner', db=3),
+
+    # Organization lookups
+    Endpoint('addresses:bulk-lookup-addresses', 'post', 'org', db=6,
+             data=lambda seed: {'address_ids': [str(address.id) for address in seed['addresses']]}),
+    Endpoint('addresses:lookup-address-by-uuid', 'get', 'org', db=6, rpc=3, ipfs=1,
+             kwargs=lambda seed: {'address_uuid': seed['address'].id}),
+    Endpoint('addresses:organization-lookup-history', 'get', 'org', db=4),
+    Endpoint('addresses:export-lookup-history', 'get', 'org', db=4),
+    Endpoint('addresses:export-permitted-addresses', 'get', 'org', db=5),
+    Endpoint('addresses:download-export', 'get', 'org', db=2,
+             kwargs=lambda seed: {'token': seed['export_token']}),
+
+    # Accounts
+    Endpoint('register', 'post', None, db=10, data=lambda seed: {
+        'username': f"budget-new-{seed['suffix']}", 'email': f"new-{seed['suffix']}@example.com",
+        'first_name': 'Budget', 'last_name': 'Check',
+        'password': PASSWORD, 'password2': PASSWORD,
+    }),
+    Endpoint('token_obtain_pair', 'post', None, db=8,
+             data=lambda seed: {'username': seed['owner'].username, 'password': PASSWORD}),
+    Endpoint('token_refresh', 'post', None, db=2, data=lambda seed: {'refresh': seed['refresh']}),
+    Endpoint('change_password', 'put', 'owner', db=4, data=lambda seed: {
+        'old_password': PASSWORD, 'new_password': NEW_PASSWORD, 'new_password2': NEW_PASSWORD,
+    }),
+    Endpoint('reset_password_email', 'post', None, db=2,
+             data=lambda seed: {'email': seed['owner'].email}),
+    Endpoint('reset_password', 'post', None, db=4, data=lambda seed: {
+        'uid': seed['reset_uid'], 'token': seed['reset_token'],
+        'password': NEW_PASSWORD, 'password2': NEW_PASSWORD,
+    }),
+    Endpoint('user_profile', 'get', 'owner', db=3),
+    Endpoint('profile_update', 'patch', 'owner', db=4, data=lambda seed: {'bio': 'Budget check'}),
+    Endpoint('organization_users', 'get', 'org', db=4),
+    Endpoint('organization_user_create', 'post', 'org', db=14, data=lambda seed: {
+        'username': f"budget-member-{seed['suffix']}", 'email': f"member-{seed['suffix']}@example.com",
+        'first_name': 'Budget', 'last_name': 'Member',
+        'password': PASSWORD, 'password2': PASSWORD, 'role': 'member',
+    }),
+    Endpoint('organization_user_update', 'patch', 'org', db=6,
+             kwargs=lambda seed: {'pk': seed['member'].user_id},
+             data=lambda seed: {'first_name': 'Budget'}),
+    Endpoint('organization_user_delete', 'patch', 'org', db=6,
+             kwargs=lambda seed: {'pk': seed['member'].id}, data=lambda seed: {}),
+    Endpoint('organization_user_role_update', 'patch', 'org', db=6,
+             kwargs=lambda seed: {'pk': seed['member'].id}, data=lambda seed: {'role': 'manager'}),
+]
+
+
+def seed(size):
+    """Create the data every endpoint needs, with ``size`` rows per collection."""
+    suffix = uuid.uuid4().hex[:8]
+    now = timezone.now()
+
+    owner = User.objects.create_user(f"budget-owner-{suffix}", f"owner-{suffix}@example.com", PASSWORD)
+    org_user = User.objects.create_user(f"budget-org-{suffix}", f"org-{suffix}@example.com", PASSWORD)
+    organization, other_organization = Organization.objects.bulk_create([
+        Organization(name=f"Budget check {suffix}"),
+        Organization(name=f"Budget check {suffix} other"),
+    ])
+    org_user.profile.user_type = 'organization'
+    org_user.profile.organization = organization
+    org_user.profile.save()
+    OrganizationMembership.objects.create(organization=organization, user=org_user, role='owner')
+
+    encrypted = encrypt_address_data(ADDRESS_DATA)
+    addresses = Address.objects.bulk_create([
+        Address(
+            user=owner,
+            address_name=f"Address {index}",
+            is_default=index == 0,
+            is_stored_on_blockchain=index % 2 == 0,
+            ipfs_hash=f"Qm{uuid.uuid4().hex}" if index % 2 == 0 else None,
+            **encrypted,
+        )
+        for index in range(size)
+    ])
+    AddressPermission.objects.bulk_create([
+        AddressPermission(address=address, organization=organization, granted_by=owner)
+        for address in addresses
+    ])
+    LookupRecord.objects.bulk_create([
+        LookupRecord(
+            organization=organization,
+            user=org_user,
+            address=addresses[index % len(addresses)],
+            created_at=now - timedelta(minutes=index),
+        )
+        for index in range(size)
+    ])
+
+    members = User.objects.bulk_create([
+        User(username=f"budget-member-{suffix}-{index}") for index in range(size)
+    ])
+    # bulk_create skips the post_save signal that creates profiles
+    Profile.objects.bulk_create([
+        Profile(user=member, user_type='organization', organization=organization)
+        for member in members
+    ])
+    memberships = OrganizationMembership.objects.bulk_create([
+        OrganizationMembership(organization=organization, user=member, created_by=org_user)
+        for member in members
+    ])
+
+    return {
+        'suffix': suffix,
+        'owner': owner,
+        'org_user': org_user,
+        'organization': organization,
+        'other_organization': other_organization,
+        'addresses': addresses,
+        'address': addresses[0],
+        'other_address': addresses[-1],
+        'member': memberships[0],
+        'refresh': str(RefreshToken.for_user(owner)),
+        'reset_uid': urlsafe_base64_encode(force_bytes(owner.pk)),
+        'reset_token': default_token_generator.make_token(owner),
+        'export_token': create_export_token(LOOKUP_HISTORY, 'csv', organization.id),
+        'clients': {
+            None: Client(raise_request_exception=False),
+            'owner': Client(raise_request_exception=False, HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(owner).access_token}"),
+            'org': Client(raise_request_exception=False, HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(org_user).access_token}"),
+        },
+    }
+
+
+class Command(BaseCommand):
+    help = 'Check DB query, blockchain RPC and IPFS call budgets of every API endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+            help='Rows seeded per collection, one run each (default: 3 30)'
+        )
+        parser.add_argument(
+            '--json', dest='json_path',
+            help='Also write the report to this JSON file'
+        )
+
+    def handle(self, *args, **options):
+        sizes = sorted(set(options['sizes']))
+        if len(sizes) < 2:
+            raise CommandError('Give at least two sizes so that growth can be measured')
+
+        with override_settings(
+            ALLOWED_HOSTS=['testserver'],
+            EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+            FRONTEND_URL=getattr(settings, 'FRONTEND_URL', 'http://localhost:3000'),
+        ), use_fake_chain() as (provider, ipfs):
+            # Warm-up run: first-request work (content types, JWT keys, ...) is not counted
+            self._run(sizes[0], provider, ipfs)
+            counts = {size: self._run(size, provider, ipfs) for size in sizes}
+
+        report, failures = self._report(counts, sizes)
+        if options['json_path']:
+            with open(options['json_path'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Report written to {options['json_path']}")
+
+        if failures:
+            raise CommandError(f"{len(failures)} endpoints over budget or failing: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS('All endpoints within budget'))
+
+    def _run(self, size, provider, ipfs):
+        """Seed ``size`` rows and measure every endpoint; everything is rolled back."""
+        results = {}
+        try:
+            with transaction.atomic():
+                data = seed(size)
+                for endpoint in ENDPOINTS:
+                    try:
+                        with transaction.atomic():
+                            results[endpoint.name] = self._measure(endpoint, data, provider, ipfs)
+                            raise _Rollback
+                    except _Rollback:
+                        pass
+                raise _Rollback
+        except _Rollback:
+            pass
+        return results
+
+    def _measure(self, endpoint, data, provider, ipfs):
+        client = data['clients'][endpoint.user]
+        url = reverse(endpoint.url_name, kwargs=endpoint.kwargs(data))
+        body = endpoint.data(data)
+
+        provider.counter.reset()
+        ipfs.counter.reset()
+        with CaptureQueriesContext(connection) as queries:
+            if body is None:
+                response = getattr(client, endpoint.method)(url, endpoint.query)
+            else:
+                response = getattr(client, endpoint.method)(url, body, content_type='application/json')
+            if response.streaming:
+                b''.join(response.streaming_content)
+
+        return {
+            'status': response.status_code,
+            'db': len(queries),
+            'rpc': provider.counter.total,
+            'ipfs': ipfs.counter.total,
+        }
+
+    def _report(self, counts, sizes):
+        report, failures = [], []
+        header = f"{'endpoint':<62}" + ''.join(f"{f'n={size} db/rpc/ipfs':>22}" for size in sizes)
+        self.stdout.write(header + f"{'growth':>8}")
+
+        for endpoint in ENDPOINTS:
+            runs = [counts[size][endpoint.name] for size in sizes]
+            problems = []
+            for size, run in zip(sizes, runs):
+                if run['status'] >= 400:
+                    problems.append(f"HTTP {run['status']} at n={size}")
+                for resource, limit in endpoint.budget().items():
+                    if run[resource] > limit:
+                        problems.append(f"{resource} {run[resource]} > {limit} at n={size}")
+
+            grows = [
+                resource for resource in ('db', 'rpc', 'ipfs')
+                if runs[-1][resource] > runs[0][resource]
+            ]
+            growth = f"O(n) {'/'.join(grows)}" if grows else 'O(1)'
+
+            line = f"{endpoint.name:<62}" + ''.join(
+                f"{'%d/%d/%d' % (run['db'], run['rpc'], run['ipfs']):>22}" for run in runs
+            ) + f"  {growth}"
+            if problems:
+                failures.append(endpoint.name)
+                self.stdout.write(self.style.ERROR(f"{line}  FAIL: {'; '.join(problems)}"))
+            else:
+                self.stdout.write(line)
+
+            report.append({
+                'endpoint': endpoint.name,
+                'budget': endpoint.budget(),
+                'counts': dict(zip(sizes, runs)),
+                'growth': growth,
+                'problems': problems,
+            })
+        return report, failures
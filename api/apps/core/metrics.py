@@ -0,0 +1,338 @@
+"""
+In-process metrics registry with a Prometheus text endpoint.
+
+Counters and histograms are updated in memory (a dict increment under a
+lock), and a background thread in each process adds the accumulated deltas
+to a Redis hash every ``METRICS_FLUSH_INTERVAL`` seconds with
+``HINCRBYFLOAT``, so every gunicorn and Celery worker contributes to the
+same totals. ``render_metrics`` returns those totals in the Prometheus text
+exposition format. Without Redis, each process reports its own totals.
+
+Per-request figures (DB queries, blockchain RPCs, IPFS calls) are collected
+in a ``RequestStats`` bound to the request's context by ``MetricsMiddleware``.
+"""
+
+import atexit
+import contextvars
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY = 'metrics:series'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+_registry: Dict[str, '_Metric'] = {}
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _series(name: str, labels: Iterable[Tuple[str, str]]) -> str:
+    labels = ','.join(f'{key}="{_escape(value)}"' for key, value in labels)
+    return f'{name}{{{labels}}}' if labels else name
+
+
+class _Store:
+    """Deltas accumulated in this process since the last flush."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending: Dict[str, float] = {}
+        self.local_totals: Dict[str, float] = {}
+        self.pid: Optional[int] = None
+        self.flusher: Optional[threading.Thread] = None
+
+    def add(self, series: str, amount: float) -> None:
+        self._ensure_flusher()
+        with self.lock:
+            self.pending[series] = self.pending.get(series, 0.0) + amount
+
+    def _ensure_flusher(self) -> None:
+        if self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            # Forked: deltas inherited from the parent were already its own
+            self.pending = {}
+            self.pid = os.getpid()
+            self.flusher = threading.Thread(target=self._flush_forever, name='metrics-flusher', daemon=True)
+            self.flusher.start()
+            atexit.register(flush)
+
+    def _flush_forever(self) -> None:
+        interval = getattr(settings, 'METRICS_FLUSH_INTERVAL', 5.0)
+        while True:
+            time.sleep(interval)
+            try:
+                flush()
+            except Exception as e:
+                logger.warning('Metrics flush failed: %s', e)
+
+    def take(self) -> Dict[str, float]:
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        return pending
+
+    def restore(self, deltas: Dict[str, float]) -> None:
+        with self.lock:
+            for series, amount in deltas.items():
+                self.pending[series] = self.pending.get(series, 0.0) + amount
+
+
+_store = _Store()
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        _registry[name] = self
+
+    def _labels(self, labels: Dict[str, object]) -> Tuple[Tuple[str, str], ...]:
+        return tuple((name, str(labels.get(name, ''))) for name in self.labelnames)
+
+    def owns(self, base_name: str) -> bool:
+        return base_name == self.name
+
+
+class Counter(_Metric):
+    """A monotonically increasing total."""
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if _enabled():
+            _store.add(_series(self.name, self._labels(labels)), amount)
+
+
+class Histogram(_Metric):
+    """A distribution of observed values in cumulative buckets."""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def owns(self, base_name: str) -> bool:
+        return base_name in (f'{self.name}_bucket', f'{self.name}_sum', f'{self.name}_count')
+
+    def observe(self, value: float, **labels) -> None:
+        if not _enabled():
+            return
+        label_pairs = self._labels(labels)
+        for bound in self.buckets:
+            if value <= bound:
+                _store.add(_series(f'{self.name}_bucket', label_pairs + (('le', _format_value(bound)),)), 1)
+        _store.add(_series(f'{self.name}_sum', label_pairs), value)
+        _store.add(_series(f'{self.name}_count', label_pairs), 1)
+
+
+def _enabled() -> bool:
+    return getattr(settings, 'METRICS_ENABLED', True)
+
+
+def _get_redis():
+    """Return the raw Redis client behind the default cache, or None."""
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+    except Exception:
+        return None
+
+
+def flush() -> None:
+    """Add this process's accumulated deltas to the shared totals."""
+    deltas = _store.take()
+    if not deltas:
+        return
+
+    client = _get_redis()
+    if client is None:
+        with _store.lock:
+            for series, amount in deltas.items():
+                _store.local_totals[series] = _store.local_totals.get(series, 0.0) + amount
+        return
+
+    try:
+        pipe = client.pipeline(transaction=False)
+        for series, amount in deltas.items():
+            pipe.hincrbyfloat(REDIS_KEY, series, amount)
+        pipe.execute()
+    except RedisError as e:
+        logger.warning('Metrics store unavailable, keeping deltas: %s', e)
+        _store.restore(deltas)
+
+
+def collect() -> Dict[str, float]:
+    """Return the current totals of every series, across processes where possible."""
+    flush()
+    client = _get_redis()
+    if client is None:
+        with _store.lock:
+            return dict(_store.local_totals)
+    return {
+        (series.decode() if isinstance(series, bytes) else series): float(value)
+        for series, value in client.hgetall(REDIS_KEY).items()
+    }
+
+
+def _series_order(item):
+    """Sort series by name and labels, with histogram buckets in ``le`` order."""
+    series = item[0]
+    head, sep, bound = series.rpartition(',le="')
+    if not sep:
+        head, sep, bound = series.rpartition('{le="')
+    if sep:
+        bound = bound.rstrip('"}')
+        return head, float('inf') if bound == '+Inf' else float(bound)
+    return series, -math.inf
+
+
+def render_metrics() -> str:
+    """Render every registered metric in the Prometheus text exposition format."""
+    totals = collect()
+    by_metric: Dict[str, list] = {name: [] for name in _registry}
+    for series, value in totals.items():
+        base_name = series.split('{', 1)[0]
+        for metric in _registry.values():
+            if metric.owns(base_name):
+                by_metric[metric.name].append((series, value))
+                break
+
+    lines = []
+    for name, metric in sorted(_registry.items()):
+        lines.append(f'# HELP {name} {metric.documentation}')
+        lines.append(f'# TYPE {name} {metric.kind}')
+        for series, value in sorted(by_metric[name], key=_series_order):
+            lines.append(f'{series} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+# Metrics
+
+HTTP_REQUESTS = Counter(
+    'http_requests_total', 'HTTP requests by view, method and status.', ('view', 'method', 'status')
+)
+HTTP_REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'HTTP request latency by view.', ('view', 'method')
+)
+DB_QUERIES = Counter('db_queries_total', 'Database queries by view.', ('view',))
+DB_QUERY_DURATION = Counter('db_query_duration_seconds_total', 'Time spent in database queries by view.', ('view',))
+DB_QUERIES_PER_REQUEST = Histogram(
+    'db_queries_per_request', 'Database queries per request by view.', ('view',), buckets=COUNT_BUCKETS
+)
+DB_POOL_CHECKOUTS = Counter(
+    'db_pool_checkouts_total', 'Connection pool checkouts by source (idle/new/overflow/timeout).', ('pool', 'source')
+)
+DB_POOL_WAIT = Histogram('db_pool_wait_seconds', 'Time spent waiting for a pooled connection.', ('pool',))
+DB_POOL_IN_USE = Histogram(
+    'db_pool_in_use', 'Pooled connections in use at each checkout.', ('pool',), buckets=COUNT_BUCKETS
+)
+DB_POOL_DISCARDS = Counter('db_pool_discards_total', 'Pooled connections closed, by reason.', ('pool', 'reason'))
+RPC_REQUESTS = Counter('blockchain_rpc_requests_total', 'Blockchain JSON-RPC calls by method.', ('method', 'outcome'))
+RPC_DURATION = Histogram('blockchain_rpc_duration_seconds', 'Blockchain JSON-RPC latency by method.', ('method',))
+RPC_PER_REQUEST = Histogram(
+    'blockchain_rpc_per_request', 'Blockchain JSON-RPC calls per request by view.', ('view',), buckets=COUNT_BUCKETS
+)
+IPFS_REQUESTS = Counter('ipfs_requests_total', 'IPFS calls by operation.', ('operation', 'outcome'))
+IPFS_DURATION = Histogram('ipfs_request_duration_seconds', 'IPFS call latency by operation.', ('operation',))
+IPFS_PER_REQUEST = Histogram(
+    'ipfs_requests_per_request', 'IPFS calls per request by view.', ('view',), buckets=COUNT_BUCKETS
+)
+CACHE_REQUESTS = Counter(
+    'cache_requests_total', 'Cache reads by cache and result (hit/miss); hit ratio = hit / total.', ('cache', 'result')
+)
+
+
+# Per-request collection
+
+class RequestStats:
+    """Counts and timings gathered while serving one request."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.db_queries = 0
+        self.db_seconds = 0.0
+        self.rpc_calls = 0
+        self.ipfs_calls = 0
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        """``connection.execute_wrapper`` hook timing every query."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.db_queries += 1
+                self.db_seconds += elapsed
+
+
+current_request_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar(
+    'current_request_stats', default=None
+)
+
+
+def record_rpc(method: str, seconds: float, ok: bool = True) -> None:
+    """Record one blockchain JSON-RPC call."""
+    RPC_REQUESTS.inc(method=method, outcome='ok' if ok else 'error')
+    RPC_DURATION.observe(seconds, method=method)
+    stats = current_request_stats.get()
+    if stats is not None:
+        with stats.lock:
+            stats.rpc_calls += 1
+
+
+@contextmanager
+def observe_ipfs(operation: str):
+    """Time an IPFS call made inside the block."""
+    start = time.perf_counter()
+    outcome = 'error'
+    try:
+        yield
+        outcome = 'ok'
+    finally:
+        IPFS_REQUESTS.inc(operation=operation, outcome=outcome)
+        IPFS_DURATION.observe(time.perf_counter() - start, operation=operation)
+        stats = current_request_stats.get()
+        if stats is not None:
+            with stats.lock:
+                stats.ipfs_calls += 1
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Record one cache read."""
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def record_request(view: str, method: str, status: int, seconds: float, stats: RequestStats) -> None:
+    """Record a finished request and the per-request figures gathered for it."""
+    HTTP_REQUESTS.inc(view=view, method=method, status=status)
+    HTTP_REQUEST_DURATION.observe(seconds, view=view, method=method)
+    DB_QUERIES.inc(stats.db_queries, view=view)
+    DB_QUERY_DURATION.inc(stats.db_seconds, view=view)
+    DB_QUERIES_PER_REQUEST.observe(stats.db_queries, view=view)
+    RPC_PER_REQUEST.observe(stats.rpc_calls, view=view)
+    IPFS_PER_REQUEST.observe(stats.ipfs_calls, view=view)
@@ -4,15 +4,28 @@ Middleware for MyAddressHub core functionality.
 
 import uuid
 import time
+import random
 import logging
-import json
 import traceback
+from contextlib import ExitStack
 from django.conf import settings
+from django.db import connections
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject, empty
+
+from apps.core import metrics, tracing
 
 logger = logging.getLogger(__name__)
 
 
+def view_name(request):
+    """Name of the view that served ``request``, never its raw path."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match._func_path
+
+
 class RequestIDMiddleware(MiddlewareMixin):
     """
     Middleware that adds a unique request ID to each request.
@@ -29,89 +42,80 @@ class RequestIDMiddleware(MiddlewareMixin):
 
 class JSONLoggingMiddleware(MiddlewareMixin):
     """
-    Middleware that logs request and response information in JSON format.
+    Middleware that logs one JSON record per request, with timing.
+    
+    Errors (4xx/5xx) are always logged; successful requests are sampled at
+    ``REQUEST_LOG_SAMPLE_RATE``. Records go through the queued logging
+    handler, so the request thread never waits on log output.
     """
     
+    # Largest error response body included in DEBUG logs (bytes)
+    MAX_LOGGED_RESPONSE = 2048
+    
     def process_request(self, request):
         """
-        Log request information and attach start time to the request.
+        Attach the start time to the request.
         """
-        request.start_time = time.time()
-        
-        # Don't log health check requests
-        if request.path.startswith('/api/health'):
-            return None
-        
-        # Don't log static/media requests
-        if request.path.startswith(('/static/', '/media/')):
-            return None
-        
-        log_data = {
-            'request_id': getattr(request, 'request_id', str(uuid.uuid4())),
-            'method': request.method,
-            'path': request.path,
-            'query_params': dict(request.GET),
-            'remote_addr': request.META.get('REMOTE_ADDR', ''),
-            'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-            'user_id': request.user.id if hasattr(request, 'user') and request.user.is_authenticated else None,
-        }
-        
-        # In development, also log request body
-        if settings.DEBUG and request.body:
-            try:
-                log_data['body'] = json.loads(request.body)
-            except json.JSONDecodeError:
-                log_data['body'] = request.body.decode('utf-8', errors='replace')
-        
-        logger.info('Request started', extra=log_data)
+        request.start_time = time.monotonic()
         return None
     
     def process_response(self, request, response):
         """
-        Log response information including timing.
+        Log the request and response, including timing.
         """
-        # Don't log health check responses
-        if request.path.startswith('/api/health'):
+        # Don't log health check, static or media responses
+        if request.path.startswith(('/api/health', '/static/', '/media/')):
             return response
         
-        # Don't log static/media responses
-        if request.path.startswith(('/static/', '/media/')):
+        status_code = response.status_code
+        if status_code < 400 and not self._sampled():
             return response
         
         # Calculate request duration
         duration = 0
         if hasattr(request, 'start_time'):
-            duration = time.time() - request.start_time
+            duration = time.monotonic() - request.start_time
         
         log_data = {
-            'request_id': getattr(request, 'request_id', str(uuid.uuid4())),
+            'request_id': getattr(request, 'request_id', None),
             'method': request.method,
             'path': request.path,
-            'status_code': response.status_code,
-            'duration_ms': int(duration * 1000),
-            'user_id': request.user.id if hasattr(request, 'user') and request.user.is_authenticated else None,
+            'query_params': dict(request.GET),
+            'status_code': status_code,
+            'duration_ms': round(duration * 1000, 1),
+            'remote_addr': request.META.get('REMOTE_ADDR', ''),
+            'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+            'user_id': self._user_id(request),
         }
         
-        # In development, include response content for errors
-        if settings.DEBUG and response.status_code >= 400:
-            try:
-                log_data['response'] = json.loads(response.content)
-            except json.JSONDecodeError:
-                log_data['response'] = response.content.decode('utf-8', errors='replace')
-            
-            # Include traceback for 500 errors
-            if response.status_code >= 500:
-                log_data['traceback'] = traceback.format_exc()
+        # In development, include the (truncated) response body for errors
+        if settings.DEBUG and status_code >= 400 and not response.streaming:
+            log_data['response'] = response.content[:self.MAX_LOGGED_RESPONSE].decode('utf-8', errors='replace')
         
         # Log at different levels based on status code
-        if response.status_code >= 500:
+        if status_code >= 500:
             logger.error('Request failed', extra=log_data)
-        elif response.status_code >= 400:
+        elif status_code >= 400:
             logger.warning('Request error', extra=log_data)
         else:
             logger.info('Request completed', extra=log_data)
         
         return response
+    
+    def _sampled(self):
+        rate = getattr(settings, 'REQUEST_LOG_SAMPLE_RATE', 1.0)
+        return rate >= 1 or (rate > 0 and random.random() < rate)
+    
+    def _user_id(self, request):
+        """
+        Return the authenticated user's ID without triggering authentication:
+        a user nobody has looked at yet (e.g. a JWT request that never reached
+        DRF) is reported as None instead of being loaded from the session.
+        """
+        user = getattr(request, 'user', None)
+        if user is None or (isinstance(user, SimpleLazyObject) and user._wrapped is empty):
+            return None
+        return user.id if user.is_authenticated else None
 
 
 class ExceptionLoggingMiddleware(MiddlewareMixin):
@@ -133,4 +137,67 @@ class ExceptionLoggingMiddleware(MiddlewareMixin):
         }
         
         logger.error('Unhandled exception', extra=log_data)
-        return None 
\ No newline at end of file
+        return None
+
+
+class MetricsMiddleware:
+    """
+    Middleware that records per-view latency, DB query counts and time, and
+    blockchain RPC and IPFS calls made while serving each request.
+    """
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            return self.get_response(request)
+        
+        stats = metrics.RequestStats()
+        token = metrics.current_request_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(stats.db_wrapper))
+                response = self.get_response(request)
+        finally:
+            metrics.current_request_stats.reset(token)
+        
+        metrics.record_request(
+            view_name(request),
+            request.method,
+            response.status_code,
+            time.perf_counter() - start,
+            stats
+        )
+        return response
+
+
+class TracingMiddleware:
+    """
+    Middleware that records a trace span for each request, with a child span
+    per database query. Blockchain, IPFS and Celery spans started while the
+    request is served join the same trace.
+    
+    Must come after RequestIDMiddleware: the request ID is the trace ID,
+    unless the request continues a trace from a ``traceparent`` header.
+    """
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        request_span = tracing.start_trace(
+            f'HTTP {request.method}',
+            trace_id=tracing.trace_id_from_request_id(getattr(request, 'request_id', '')),
+            parent=tracing.parse_traceparent(request.META.get('HTTP_TRACEPARENT', '')),
+            **{'http.method': request.method, 'http.target': request.path},
+        )
+        with request_span, tracing.traced_queries():
+            response = self.get_response(request)
+            request_span.set_attribute('http.route', view_name(request))
+            request_span.set_attribute('http.status_code', response.status_code)
+            if response.status_code >= 500:
+                request_span.set_error(f'HTTP {response.status_code}')
+        return response
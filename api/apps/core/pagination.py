@@ -0,0 +1,172 @@
+"""
+Keyset (cursor) pagination for MyAddressHub.
+"""
+
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def _encode_value(value: Any) -> Any:
+    """Convert a cursor value to a JSON-safe representation."""
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def parse_cursor_bool(value: Any) -> bool:
+    """Parse an encoded boolean cursor value."""
+    return bool(int(value))
+
+
+def parse_cursor_datetime(value: Any) -> datetime:
+    """Parse an encoded datetime cursor value."""
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(f"Invalid datetime: {value}")
+    return parsed
+
+
+def parse_cursor_uuid(value: Any) -> uuid.UUID:
+    """Parse an encoded UUID cursor value."""
+    return uuid.UUID(value)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination over a fixed, unique ordering.
+
+    Each page is fetched with a single indexed range query: no OFFSET and no
+    COUNT, so response time does not depend on the size of the result set.
+    The cursor is an opaque, URL-safe token encoding the last row of the page.
+
+    Subclasses set ``ordering`` to the model fields to page on (most
+    significant first, ending with a unique field, each optionally
+    descending with a ``-`` prefix) and ``cursor_parsers`` to
+    one parser per field that turns the encoded value back into a Python value.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 50
+    max_page_size = 200
+    ordering: Tuple[str, ...] = ('-created_at', '-id')
+    cursor_parsers: Tuple[Any, ...] = (parse_cursor_datetime, parse_cursor_uuid)
+    invalid_cursor_message = 'Invalid cursor'
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return tuple(field.lstrip('-') for field in self.ordering)
+
+    def paginate_queryset(self, queryset, request, view=None) -> List[Any]:
+        """Return one page of ``queryset`` starting after the request cursor."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        if self.cursor is not None:
+            queryset = queryset.filter(self.after_cursor_filter(self.cursor))
+
+        # Fetch one extra row to find out whether there is a next page
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request) -> int:
+        """Return the requested page size, clamped to ``max_page_size``."""
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_next_cursor(self) -> Optional[str]:
+        """Return the opaque cursor for the next page, or None on the last page."""
+        if not self.has_next or not self.page:
+            return None
+        last = self.page[-1]
+        return self.encode_cursor(tuple(getattr(last, field) for field in self.fields))
+
+    def get_next_link(self) -> Optional[str]:
+        """Return the absolute URL of the next page, or None on the last page."""
+        next_cursor = self.get_next_cursor()
+        if next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'next_cursor': self.get_next_cursor(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'next_cursor': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
+
+    def to_page_metadata(self) -> Dict[str, Any]:
+        """Return cursor metadata for views that build their own response envelope."""
+        return {
+            'next': self.get_next_link(),
+            'next_cursor': self.get_next_cursor(),
+        }
+
+    def encode_cursor(self, position: Tuple[Any, ...]) -> str:
+        """Encode a position (one value per ordering field) as an opaque token."""
+        payload = json.dumps([_encode_value(value) for value in position], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request) -> Optional[Tuple[Any, ...]]:
+        """Decode the request cursor, raising NotFound if it is malformed."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            if not isinstance(values, list) or len(values) != len(self.cursor_parsers):
+                raise ValueError("Cursor has the wrong shape")
+            return tuple(parse(value) for parse, value in zip(self.cursor_parsers, values))
+        except (TypeError, ValueError, AttributeError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def after_cursor_filter(self, position: Tuple[Any, ...]) -> Q:
+        """
+        Build the condition selecting the rows that sort after ``position``.
+
+        The OR of the per-field conditions is ANDed with a bound on the
+        leading field, so the database can start an index range scan (and
+        prune partitions) at the cursor instead of at the first row.
+        """
+        condition = Q()
+        for index, (field, ordering) in enumerate(zip(self.fields, self.ordering)):
+            equal_prefix = dict(zip(self.fields[:index], position[:index]))
+            lookup = 'lt' if ordering.startswith('-') else 'gt'
+            condition |= Q(**equal_prefix, **{f'{field}__{lookup}': position[index]})
+        bound = 'lte' if self.ordering[0].startswith('-') else 'gte'
+        return Q(**{f'{self.fields[0]}__{bound}': position[0]}) & condition
@@ -0,0 +1,54 @@
+"""
+orjson-based renderers for MyAddressHub.
+"""
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Serialize UTC datetimes with a "Z" suffix, like DRF
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+_encoder = JSONEncoder()
+
+
+def orjson_default(obj):
+    """
+    Encode the types orjson does not handle natively (Decimal, timedelta,
+    lazy strings, querysets, ...) exactly as DRF's JSONEncoder does.
+    """
+    return _encoder.default(obj)
+
+
+def orjson_dumps(data) -> bytes:
+    """Serialize ``data`` to compact JSON bytes with DRF-compatible type handling."""
+    return orjson.dumps(data, default=orjson_default, option=ORJSON_OPTIONS)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer using orjson.
+
+    Produces the same output as DRF's compact ``JSONRenderer``: UUIDs as
+    strings, UTC datetimes ending in "Z", Decimals as numbers; NaN and
+    infinity become null rather than an error. Requests for indented output
+    (e.g. the browsable API), ASCII-only settings and data orjson cannot
+    encode (such as non-string keys) fall back to the stdlib renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if self.ensure_ascii or self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson_dumps(data)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escape the line and paragraph separators, which are invalid in JavaScript strings
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,358 @@
+"""
+Lightweight request tracing.
+
+A trace follows one request through the web process, the Celery tasks it
+enqueues and the database, blockchain RPC and IPFS calls made on the way.
+The trace ID is the request ID from ``RequestIDMiddleware`` (or the one in
+an incoming W3C ``traceparent`` header), and it travels to Celery tasks in
+the message headers, so task spans join the trace of the request that
+queued them.
+
+Spans are kept in the OTLP/JSON shape and exported in batches by a
+background thread: as JSON lines to ``TRACE_EXPORT_FILE`` and/or posted to
+the OTLP/HTTP collector at ``TRACE_OTLP_ENDPOINT``. Tracing is off unless
+one of them is set; ``TRACE_SAMPLE_RATE`` picks the share of new traces
+recorded. Outside a sampled trace ``span()`` does nothing.
+"""
+
+import atexit
+import contextvars
+import logging
+import os
+import queue
+import random
+import re
+import secrets
+import threading
+import time
+import uuid
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import orjson
+from celery.signals import before_task_publish, task_postrun, task_prerun
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = 'myaddresshub'
+
+# OTLP span kinds
+INTERNAL, SERVER, CLIENT, PRODUCER, CONSUMER = 1, 2, 3, 4, 5
+
+# OTLP status codes
+STATUS_OK, STATUS_ERROR = 1, 2
+
+TRACEPARENT_RE = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+
+# Largest SQL statement kept on a database span
+MAX_STATEMENT_LENGTH = 500
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+
+current_span: contextvars.ContextVar[Optional[SpanContext]] = contextvars.ContextVar('current_span', default=None)
+
+
+def enabled() -> bool:
+    return bool(getattr(settings, 'TRACE_EXPORT_FILE', '') or getattr(settings, 'TRACE_OTLP_ENDPOINT', ''))
+
+
+def trace_id_from_request_id(request_id: str) -> str:
+    """Use a UUID request ID as the trace ID, so logs and traces line up."""
+    try:
+        return uuid.UUID(str(request_id)).hex
+    except ValueError:
+        return secrets.token_hex(16)
+
+
+def parse_traceparent(header: str) -> Optional[SpanContext]:
+    """Read a W3C ``traceparent`` header into the remote parent's context."""
+    match = TRACEPARENT_RE.match((header or '').strip().lower())
+    if not match:
+        return None
+    trace_id, span_id, flags = match.groups()
+    return SpanContext(trace_id, span_id, bool(int(flags, 16) & 1))
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {'key': key, 'value': {'boolValue': value}}
+    if isinstance(value, int):
+        return {'key': key, 'value': {'intValue': str(value)}}
+    if isinstance(value, float):
+        return {'key': key, 'value': {'doubleValue': value}}
+    return {'key': key, 'value': {'stringValue': str(value)}}
+
+
+class Span:
+    """
+    One timed operation; use as a context manager.
+
+    It becomes the current span inside the block, so spans started there
+    are its children.
+    """
+
+    def __init__(self, name: str, context: SpanContext, parent_id: Optional[str], kind: int,
+                 attributes: Dict[str, Any]):
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = attributes
+        self.status = STATUS_OK
+        self.status_message = ''
+        self._token = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        self.status = STATUS_ERROR
+        self.status_message = message
+
+    def __enter__(self):
+        self._start_ns = time.time_ns()
+        self._perf_start = time.perf_counter_ns()
+        self._token = current_span.set(self.context)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration_ns = time.perf_counter_ns() - self._perf_start
+        current_span.reset(self._token)
+        if exc_type is not None:
+            self.set_error(f'{exc_type.__name__}: {exc}')
+        _exporter.add(self._to_otlp(duration_ns))
+        return False
+
+    def _to_otlp(self, duration_ns: int) -> Dict[str, Any]:
+        span = {
+            'traceId': self.context.trace_id,
+            'spanId': self.context.span_id,
+            'name': self.name,
+            'kind': self.kind,
+            'startTimeUnixNano': str(self._start_ns),
+            'endTimeUnixNano': str(self._start_ns + duration_ns),
+            'attributes': [_attribute(key, value) for key, value in self.attributes.items()],
+            'status': {'code': self.status},
+        }
+        if self.parent_id:
+            span['parentSpanId'] = self.parent_id
+        if self.status_message:
+            span['status']['message'] = self.status_message
+        return span
+
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_error(self, message: str) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+def start_trace(name: str, trace_id: Optional[str] = None, parent: Optional[SpanContext] = None,
+                kind: int = SERVER, **attributes):
+    """
+    Return the root span of a trace, or a no-op span if it is not sampled.
+
+    Args:
+        name: Span name
+        trace_id: Trace ID for a new trace (random if omitted)
+        parent: Remote parent to continue (from ``traceparent`` or task headers);
+            its sampling decision is kept
+    """
+    if not enabled():
+        return NOOP_SPAN
+    if parent is not None:
+        if not parent.sampled:
+            return NOOP_SPAN
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    else:
+        if random.random() >= getattr(settings, 'TRACE_SAMPLE_RATE', 1.0):
+            return NOOP_SPAN
+        trace_id, parent_id = trace_id or secrets.token_hex(16), None
+    return Span(name, SpanContext(trace_id, secrets.token_hex(8), True), parent_id, kind, attributes)
+
+
+def span(name: str, kind: int = INTERNAL, **attributes):
+    """Return a child of the current span, or a no-op span outside a sampled trace."""
+    parent = current_span.get()
+    if parent is None or not parent.sampled:
+        return NOOP_SPAN
+    return Span(name, SpanContext(parent.trace_id, secrets.token_hex(8), True), parent.span_id, kind, attributes)
+
+
+def db_wrapper(execute, sql, params, many, context):
+    """``connection.execute_wrapper`` hook recording a span per query."""
+    connection = context['connection']
+    with span('db.query', kind=CLIENT, **{
+        'db.system': connection.vendor,
+        'db.name': connection.alias,
+        'db.statement': sql[:MAX_STATEMENT_LENGTH],
+    }):
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def traced_queries():
+    """Record a span for every query on every database inside the block."""
+    from django.db import connections
+
+    if current_span.get() is None:
+        yield
+        return
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(db_wrapper))
+        yield
+
+
+class _Exporter:
+    """Batch finished spans and write them from a background thread."""
+
+    BATCH_SIZE = 512
+
+    def __init__(self):
+        self.queue: Optional[queue.Queue] = None
+        self.pid: Optional[int] = None
+        self.lock = threading.Lock()
+        self.dropped = 0
+
+    def add(self, span: Dict[str, Any]) -> None:
+        self._ensure_thread()
+        try:
+            self.queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_thread(self) -> None:
+        if self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            # Forked: spans queued in the parent are the parent's to export
+            self.queue = queue.Queue(maxsize=getattr(settings, 'TRACE_QUEUE_SIZE', 10000))
+            self.pid = os.getpid()
+            threading.Thread(target=self._export_forever, name='trace-exporter', daemon=True).start()
+            atexit.register(self.flush)
+
+    def _export_forever(self) -> None:
+        interval = getattr(settings, 'TRACE_EXPORT_INTERVAL', 1.0)
+        while True:
+            time.sleep(interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning('Trace export failed: %s', e)
+
+    def flush(self) -> None:
+        """Export every queued span."""
+        if self.queue is None or self.pid != os.getpid():
+            return
+        while True:
+            batch = []
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not batch:
+                return
+            self._export(batch)
+
+    def _export(self, spans) -> None:
+        resource = {'attributes': [
+            _attribute('service.name', SERVICE_NAME),
+            _attribute('process.pid', os.getpid()),
+        ]}
+
+        path = getattr(settings, 'TRACE_EXPORT_FILE', '')
+        if path:
+            with open(path, 'ab') as f:
+                f.write(b''.join(
+                    orjson.dumps({'resource': resource, 'span': span}) + b'\n' for span in spans
+                ))
+
+        endpoint = getattr(settings, 'TRACE_OTLP_ENDPOINT', '')
+        if endpoint:
+            import requests
+
+            payload = {'resourceSpans': [{
+                'resource': resource,
+                'scopeSpans': [{'scope': {'name': SERVICE_NAME}, 'spans': spans}],
+            }]}
+            try:
+                requests.post(
+                    endpoint,
+                    data=orjson.dumps(payload),
+                    headers={'Content-Type': 'application/json'},
+                    timeout=getattr(settings, 'TRACE_OTLP_TIMEOUT', 2.0),
+                ).raise_for_status()
+            except requests.RequestException as e:
+                logger.warning('Could not send %d spans to %s: %s', len(spans), endpoint, e)
+
+
+_exporter = _Exporter()
+
+
+def flush() -> None:
+    """Export the spans finished so far in this process."""
+    _exporter.flush()
+
+
+# Celery propagation: connected when this module is imported, which the
+# tracing middleware does for web processes and project.celery for workers
+
+_task_spans: Dict[str, tuple] = {}
+
+
+@before_task_publish.connect(weak=False, dispatch_uid='tracing.publish')
+def _on_before_task_publish(sender=None, headers=None, **kwargs):
+    if headers is None:
+        return
+    with span(f'celery.publish {sender}', kind=PRODUCER, **{'celery.task': sender}) as publish:
+        if isinstance(publish, Span):
+            headers['traceparent'] = f'00-{publish.context.trace_id}-{publish.context.span_id}-01'
+
+
+@task_prerun.connect(weak=False, dispatch_uid='tracing.prerun')
+def _on_task_prerun(task_id=None, task=None, **kwargs):
+    parent = parse_traceparent(getattr(task.request, 'traceparent', None) or '')
+    task_span = start_trace(
+        f'celery.task {task.name}', parent=parent, kind=CONSUMER,
+        **{'celery.task': task.name, 'celery.task_id': task_id},
+    )
+    stack = ExitStack()
+    stack.enter_context(task_span)
+    stack.enter_context(traced_queries())
+    _task_spans[task_id] = (task_span, stack)
+
+
+@task_postrun.connect(weak=False, dispatch_uid='tracing.postrun')
+def _on_task_postrun(task_id=None, state=None, **kwargs):
+    entry = _task_spans.pop(task_id, None)
+    if entry is None:
+        return
+    task_span, stack = entry
+    task_span.set_attribute('celery.state', state or '')
+    if state == 'FAILURE':
+        task_span.set_error('Task failed')
+    stack.close()
+
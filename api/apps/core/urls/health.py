@@ -4,50 +4,34 @@ Health check URLs for MyAddressHub.
 
 from django.urls import path
 from django.http import JsonResponse
-from django.db import connections
-from django.db.utils import OperationalError
-from redis.exceptions import RedisError
-import redis
-import os
-import datetime
+
+from apps.core.health import UNHEALTHY, basic_health, deep_health
+
+
+def _response(report):
+    status_code = 503 if report['status'] == UNHEALTHY else 200
+    return JsonResponse(report, status=status_code)
 
 
 def health_check(request):
     """
     Health check endpoint for monitoring and load balancers.
     """
-    # Check database connection
-    db_healthy = True
-    try:
-        connections['default'].cursor()
-    except OperationalError:
-        db_healthy = False
-    
-    # Check Redis connection
-    redis_healthy = True
-    try:
-        redis_url = os.environ.get('REDIS_URL', 'redis://redis:6379/0')
-        redis_client = redis.from_url(redis_url)
-        redis_client.ping()
-    except RedisError:
-        redis_healthy = False
-    
-    # Overall health status
-    status = 'healthy' if db_healthy and redis_healthy else 'unhealthy'
-    status_code = 200 if status == 'healthy' else 503
-    
-    response_data = {
-        'status': status,
-        'timestamp': datetime.datetime.utcnow().isoformat(),
-        'components': {
-            'database': 'healthy' if db_healthy else 'unhealthy',
-            'redis': 'healthy' if redis_healthy else 'unhealthy',
-        }
-    }
-    
-    return JsonResponse(response_data, status=status_code)
+    return _response(basic_health.get())
+
+
+def deep_health_check(request):
+    """
+    Deep health check covering the database, Redis, the RPC node, IPFS and
+    Celery queue depth, with each component's latency.
+
+    Returns 503 only when a required component (database, Redis) is down;
+    optional components being down or slow reports ``degraded``.
+    """
+    return _response(deep_health.get())
 
 
 urlpatterns = [
     path('', health_check, name='health_check'),
-] 
\ No newline at end of file
+    path('deep/', deep_health_check, name='deep_health_check'),
+]
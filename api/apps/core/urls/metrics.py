@@ -0,0 +1,41 @@
+"""
+Metrics URLs for MyAddressHub.
+"""
+
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.urls import path
+from django.views.decorators.http import require_GET
+
+from apps.core.metrics import render_metrics
+
+
+def _authorized(request):
+    """
+    Require the bearer token in ``METRICS_AUTH_TOKEN``; without one configured
+    the endpoint is open only in DEBUG.
+    """
+    token = getattr(settings, 'METRICS_AUTH_TOKEN', '')
+    if not token:
+        return settings.DEBUG
+
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    return hmac.compare_digest(header, f'Bearer {token}')
+
+
+@require_GET
+def metrics(request):
+    """
+    Prometheus scrape endpoint for request, database, blockchain and cache metrics.
+    """
+    if not _authorized(request):
+        return HttpResponseForbidden('Forbidden', content_type='text/plain')
+
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+urlpatterns = [
+    path('', metrics, name='metrics'),
+]
@@ -19,6 +19,9 @@ app.config_from_object("django.conf:settings", namespace="CELERY")
 # Load task modules from all registered Django apps.
 app.autodiscover_tasks()
 
+# Continue request traces in tasks (connects the task signal handlers)
+import apps.core.tracing  # noqa: E402,F401
+
 # Tasks are now properly defined in apps.addresses.tasks and will be auto-discovered
 
 # Explicitly set the beat schedule since settings loading isn't working
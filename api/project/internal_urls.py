@@ -0,0 +1,14 @@
+"""
+Internal URL configuration for MyAddressHub.
+
+Serves the Prometheus metrics endpoint, which is kept out of the public
+URLconf. Run a separate server with ``ROOT_URLCONF=project.internal_urls``
+on a port that is not proxied from the internet; metrics are aggregated in
+Redis, so that process reports the totals of every web and Celery worker.
+"""
+
+from django.urls import path, include
+
+urlpatterns = [
+    path("metrics/", include("apps.core.urls.metrics")),
+]
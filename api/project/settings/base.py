@@ -31,6 +31,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     
     # Third-party apps
     "rest_framework",
@@ -49,6 +50,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "apps.core.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -59,10 +61,12 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "axes.middleware.AxesMiddleware",
     "apps.core.middleware.RequestIDMiddleware",
+    "apps.core.middleware.TracingMiddleware",
     "apps.core.middleware.JSONLoggingMiddleware",
 ]
 
-ROOT_URLCONF = "project.urls"
+# project.internal_urls for the internal metrics server
+ROOT_URLCONF = env("ROOT_URLCONF", default="project.urls")
 
 TEMPLATES = [
     {
@@ -84,22 +88,48 @@ WSGI_APPLICATION = "project.wsgi.application"
 ASGI_APPLICATION = "project.asgi.application"
 
 # Database
+# With DB_POOL_ENABLED each process borrows connections from its own pool
+# and returns them after every request/task (CONN_MAX_AGE 0), holding at most
+# DB_POOL_MAX_SIZE + DB_POOL_MAX_OVERFLOW connections. Size the pool per
+# process type through the environment of the web and worker containers:
+# total connections <= processes x (max size + overflow).
+# Set DB_PGBOUNCER_TRANSACTION_MODE when connecting through pgbouncer in
+# transaction mode, which cannot hold server-side cursors across transactions.
+DB_POOL_ENABLED = env.bool("DB_POOL_ENABLED", default=True)
+
+# check_db_connections emails ADMINS above this share of max_connections
+DB_CONNECTION_WARNING_RATIO = env.float("DB_CONNECTION_WARNING_RATIO", default=0.8)
+
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": "apps.core.db.backends.postgresql_pool" if DB_POOL_ENABLED else "django.db.backends.postgresql",
         "NAME": env("POSTGRES_DB"),
         "USER": env("POSTGRES_USER"),
         "PASSWORD": env("POSTGRES_PASSWORD"),
         "HOST": env("POSTGRES_HOST"),
         "PORT": env("POSTGRES_PORT"),
-        "CONN_MAX_AGE": 600,
+        "CONN_MAX_AGE": 0 if DB_POOL_ENABLED else 600,
+        "DISABLE_SERVER_SIDE_CURSORS": env.bool("DB_PGBOUNCER_TRANSACTION_MODE", default=False),
+        "OPTIONS": {
+            # Shows which process type holds each connection in pg_stat_activity
+            "application_name": env("DB_APPLICATION_NAME", default="myaddresshub"),
+            "connect_timeout": env.int("DB_CONNECT_TIMEOUT", default=5),
+        },
+        "POOL": {
+            "max_size": env.int("DB_POOL_MAX_SIZE", default=2),
+            "max_overflow": env.int("DB_POOL_MAX_OVERFLOW", default=2),
+            "timeout": env.float("DB_POOL_TIMEOUT", default=5.0),
+            "max_lifetime": env.float("DB_POOL_MAX_LIFETIME", default=3600.0),
+            "max_idle": env.float("DB_POOL_MAX_IDLE", default=300.0),
+            "check_interval": env.float("DB_POOL_CHECK_INTERVAL", default=30.0),
+        },
     }
 }
 
 # Cache
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
+        "BACKEND": "apps.core.cache.InstrumentedRedisCache",
         "LOCATION": env("REDIS_URL"),
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
@@ -152,12 +182,21 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # REST Framework
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.accounts.authentication.ProfileJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "apps.core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "apps.core.parsers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
@@ -187,6 +226,10 @@ SIMPLE_JWT = {
     "USER_ID_CLAIM": "user_id",
 }
 
+# Trust role claims in JWTs on read endpoints while they match the user's
+# claims version in Redis
+JWT_CLAIMS_FAST_PATH = env.bool("JWT_CLAIMS_FAST_PATH", default=True)
+
 # CORS settings
 CORS_ALLOW_ALL_ORIGINS = env.bool("CORS_ALLOW_ALL_ORIGINS", default=True)  # For development
 CORS_ALLOWED_ORIGINS = env.list("CSRF_TRUSTED_ORIGINS", default=[
@@ -205,6 +248,31 @@ CSRF_TRUSTED_ORIGINS = env.list("CSRF_TRUSTED_ORIGINS", default=[
     "http://127.0.0.1:8000",
 ])
 
+# Maximum number of UUIDs accepted by the bulk address lookup endpoint
+BULK_LOOKUP_MAX_ADDRESSES = env.int("BULK_LOOKUP_MAX_ADDRESSES", default=100)
+
+# Buffer lookup audit records in Redis and write them in bulk from Celery
+LOOKUP_AUDIT_BUFFERED = env.bool("LOOKUP_AUDIT_BUFFERED", default=True)
+
+# Monthly lookup record partitions (PostgreSQL): months created ahead of time,
+# full months kept before a partition is archived and dropped
+LOOKUP_RECORD_PARTITIONS_AHEAD = env.int("LOOKUP_RECORD_PARTITIONS_AHEAD", default=3)
+LOOKUP_RECORD_RETENTION_MONTHS = env.int("LOOKUP_RECORD_RETENTION_MONTHS", default=24)
+LOOKUP_RECORD_ARCHIVE_PARTITIONS = env.bool("LOOKUP_RECORD_ARCHIVE_PARTITIONS", default=True)
+
+# Where address records are stored: apps.addresses.backends.web3.Web3Backend
+# (the contract and IPFS), .memory.InMemoryBackend (process memory with a
+# fixed latency per call, for tests and benchmarks) or .null.NullBackend
+# (chain disabled); the options are the backend's keyword arguments
+BLOCKCHAIN_BACKEND = env("BLOCKCHAIN_BACKEND", default="apps.addresses.backends.web3.Web3Backend")
+BLOCKCHAIN_BACKEND_OPTIONS = env.json("BLOCKCHAIN_BACKEND_OPTIONS", default={})
+
+# Concurrent blockchain/IPFS reads for multi-address views: parallel calls
+# per request, seconds allowed per call and for the whole fan-out
+BLOCKCHAIN_FANOUT_MAX_WORKERS = env.int("BLOCKCHAIN_FANOUT_MAX_WORKERS", default=8)
+BLOCKCHAIN_FANOUT_CALL_TIMEOUT = env.float("BLOCKCHAIN_FANOUT_CALL_TIMEOUT", default=2.0)
+BLOCKCHAIN_FANOUT_DEADLINE = env.float("BLOCKCHAIN_FANOUT_DEADLINE", default=5.0)
+
 # Celery settings
 CELERY_BROKER_URL = env("CELERY_BROKER_URL")
 CELERY_RESULT_BACKEND = env("CELERY_RESULT_BACKEND", default=env("REDIS_URL"))
@@ -247,13 +315,42 @@ SPECTACULAR_SETTINGS = {
     "SERVE_INCLUDE_SCHEMA": False,
 }
 
+# Fraction of successful (2xx/3xx) requests logged by JSONLoggingMiddleware;
+# errors are always logged
+REQUEST_LOG_SAMPLE_RATE = env.float("REQUEST_LOG_SAMPLE_RATE", default=1.0)
+
+# Health checks: per-process result cache for /api/health/ and
+# /api/health/deep/, per-component timeout, and the Celery queues (and the
+# depth above which they count as degraded) reported by the deep check
+HEALTH_CHECK_CACHE_TTL = env.float("HEALTH_CHECK_CACHE_TTL", default=2.0)
+HEALTH_CHECK_DEEP_CACHE_TTL = env.float("HEALTH_CHECK_DEEP_CACHE_TTL", default=10.0)
+HEALTH_CHECK_TIMEOUT = env.float("HEALTH_CHECK_TIMEOUT", default=2.0)
+HEALTH_CHECK_CELERY_QUEUES = env.list("HEALTH_CHECK_CELERY_QUEUES", default=["celery"])
+HEALTH_CHECK_CELERY_MAX_QUEUE_DEPTH = env.int("HEALTH_CHECK_CELERY_MAX_QUEUE_DEPTH", default=1000)
+
+# Request tracing, off unless spans have somewhere to go: JSON lines in
+# TRACE_EXPORT_FILE and/or an OTLP/HTTP collector (e.g.
+# http://otel-collector:4318/v1/traces). TRACE_SAMPLE_RATE is the share of
+# new traces recorded; traces continued from a parent keep its decision
+TRACE_EXPORT_FILE = env("TRACE_EXPORT_FILE", default="")
+TRACE_OTLP_ENDPOINT = env("TRACE_OTLP_ENDPOINT", default="")
+TRACE_SAMPLE_RATE = env.float("TRACE_SAMPLE_RATE", default=1.0)
+
+# Request metrics served at /metrics/ by project.internal_urls in the
+# Prometheus text format. Processes flush to Redis every
+# METRICS_FLUSH_INTERVAL seconds; scrapers must send METRICS_AUTH_TOKEN as a
+# bearer token, and without one the endpoint only answers when DEBUG is on
+METRICS_ENABLED = env.bool("METRICS_ENABLED", default=True)
+METRICS_FLUSH_INTERVAL = env.float("METRICS_FLUSH_INTERVAL", default=5.0)
+METRICS_AUTH_TOKEN = env("METRICS_AUTH_TOKEN", default="")
+
 # Logging
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
     "formatters": {
         "json": {
-            "()": "apps.core.logging.JSONFormatter",
+            "()": "apps.core.logging.ORJSONFormatter",
         },
     },
     "handlers": {
@@ -261,24 +358,30 @@ LOGGING = {
             "class": "logging.StreamHandler",
             "formatter": "json",
         },
+        # Writes to the console from a background thread
+        "queue": {
+            "()": "apps.core.logging.QueueListenerHandler",
+            "handlers": ["cfg://handlers.console"],
+            "queue_size": env.int("LOG_QUEUE_SIZE", default=10000),
+        },
     },
     "root": {
-        "handlers": ["console"],
+        "handlers": ["queue"],
         "level": "INFO",
     },
     "loggers": {
         "django": {
-            "handlers": ["console"],
+            "handlers": ["queue"],
             "level": env("DJANGO_LOG_LEVEL", default="INFO"),
             "propagate": False,
         },
         "django.server": {
-            "handlers": ["console"],
+            "handlers": ["queue"],
             "level": env("DJANGO_LOG_LEVEL", default="INFO"),
             "propagate": False,
         },
         "django.request": {
-            "handlers": ["console"],
+            "handlers": ["queue"],
             "level": "ERROR",
             "propagate": False,
         },
@@ -2,6 +2,8 @@
 Development settings for MyAddressHub.
 """
 
+import copy
+
 from .base import *
 
 # Debug settings
@@ -16,22 +18,13 @@ PROJECT_NAME = env("PROJECT_NAME", default="MyAddressHub")
 # Development apps
 INSTALLED_APPS += ["debug_toolbar"]
 
-# Development middleware - ensure no duplicates
-MIDDLEWARE = [
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
-    "apps.core.middleware.RequestIDMiddleware",
-    "apps.core.middleware.JSONLoggingMiddleware",
-    "apps.core.middleware.ExceptionLoggingMiddleware",
-    "django.middleware.security.SecurityMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
-    "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "corsheaders.middleware.CorsMiddleware",
-    "axes.middleware.AxesMiddleware",
-]
+# Development middleware: the debug toolbar first, and detailed logging of
+# unhandled exceptions once the request ID is set
+MIDDLEWARE = (
+    ["debug_toolbar.middleware.DebugToolbarMiddleware"]
+    + MIDDLEWARE
+    + ["apps.core.middleware.ExceptionLoggingMiddleware"]
+)
 
 # Debug toolbar settings
 INTERNAL_IPS = ["127.0.0.1", "0.0.0.0"]
@@ -47,66 +40,36 @@ DEBUG_TOOLBAR_CONFIG = {
 # Email settings - use custom backend for development that stores emails in database
 EMAIL_BACKEND = "apps.core.email.DevEmailBackend"
 
-# Development-specific Logging
-LOGGING = {
-    'version': 1,
-    'disable_existing_loggers': False,
-    'formatters': {
-        'verbose': {
-            'format': '{levelname} {asctime} {module} {process:d} {thread:d} {message}',
-            'style': '{',
-        },
-        'simple': {
-            'format': '{levelname} {message}',
-            'style': '{',
-        },
-        'django.server': {
-            '()': 'django.utils.log.ServerFormatter',
-            'format': '[{server_time}] {message}',
-            'style': '{',
-        }
+# Development logging: the base pipeline, plus runserver's request lines
+# and debug output from the apps and the database layer
+LOGGING = copy.deepcopy(LOGGING)
+LOGGING["formatters"]["django.server"] = {
+    "()": "django.utils.log.ServerFormatter",
+    "format": "[{server_time}] {message}",
+    "style": "{",
+}
+LOGGING["handlers"]["django.server"] = {
+    "level": "INFO",
+    "class": "logging.StreamHandler",
+    "formatter": "django.server",
+}
+LOGGING["loggers"].update({
+    "django.server": {
+        "handlers": ["django.server"],
+        "level": "INFO",
+        "propagate": False,
     },
-    'filters': {
-        'require_debug_true': {
-            '()': 'django.utils.log.RequireDebugTrue',
-        },
+    "django.db.backends": {
+        "handlers": ["queue"],
+        "level": "DEBUG",
+        "propagate": False,
     },
-    'handlers': {
-        'console': {
-            'level': 'DEBUG',
-            'filters': ['require_debug_true'],
-            'class': 'logging.StreamHandler',
-            'formatter': 'verbose'
-        },
-        'django.server': {
-            'level': 'INFO',
-            'class': 'logging.StreamHandler',
-            'formatter': 'django.server',
-        }
+    "apps": {
+        "handlers": ["queue"],
+        "level": "DEBUG",
+        "propagate": False,
     },
-    'loggers': {
-        'django': {
-            'handlers': ['console'],
-            'level': 'INFO',
-            'propagate': True,
-        },
-        'django.server': {
-            'handlers': ['django.server'],
-            'level': 'INFO',
-            'propagate': False,
-        },
-        'django.db.backends': {
-            'handlers': ['console'],
-            'level': 'DEBUG',
-            'propagate': False,
-        },
-        'apps': {
-            'handlers': ['console'],
-            'level': 'DEBUG',
-            'propagate': True,
-        }
-    }
-}
+})
 
 # Disable security features in development
 SECURE_SSL_REDIRECT = False